@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from appHelpers import database
+from appHelpers.athletes import DEFAULT_ATHLETE_ID
+from appHelpers.exercises import exercise_ids
+
+# Years shown by the dashboard calendar, newest first.
+CALENDAR_YEARS = 3
+# One slot per day of the year, including 29 February; slot 365 stays empty in
+# common years. Stored little-endian so a copied database reads the same.
+DAY_SLOTS = 366
+DAY_DTYPE = np.dtype("<i4")
+
+calendar_trackers = {"workout": "Workouts", "walk": "Walking", "piano": "Piano"}
+# The tracker the dashboard calendar opens on.
+DEFAULT_TRACKER = "workout"
+
+sql_create_activity_years_table = """CREATE TABLE IF NOT EXISTS ACTIVITY_YEARS (
+    ATHLETE_ID  INTEGER NOT NULL REFERENCES ATHLETES (ID),
+    TRACKER TEXT NOT NULL,
+    YEAR    INTEGER NOT NULL,
+    DAYS    BLOB NOT NULL,
+    PRIMARY KEY (ATHLETE_ID, TRACKER, YEAR)
+) WITHOUT ROWID"""
+# How much was done per athlete, tracker and day: reps (sets × reps, or one
+# for exercises only marked done) for workouts, the distance for walks (one
+# if only marked done) and the practices for piano.
+sql_day_amounts = """SELECT ATHLETE_ID,
+    CASE WHEN EXERCISE_ID = :walk THEN 'walk' ELSE 'workout' END AS TRACKER,
+    DATE,
+    SUM(CASE
+        WHEN EXERCISE_ID = :walk THEN MAX(COALESCE(DISTANCE, 0), 1)
+        WHEN REPS IS NOT NULL THEN REPS * MAX(COALESCE(SETS, 1), 1)
+        ELSE 1
+    END) AS AMOUNT
+    FROM (
+        SELECT ATHLETE_ID, DATE, EXERCISE_ID,
+        MAX(CASE WHEN METRIC = 'SETS' THEN VALUE END) AS SETS,
+        MAX(CASE WHEN METRIC = 'REPS' THEN VALUE END) AS REPS,
+        MAX(CASE WHEN METRIC = 'DISTANCE' THEN VALUE END) AS DISTANCE
+        FROM WORKOUT_ENTRIES
+        WHERE METRIC != 'WEIGHT' AND {where}
+        GROUP BY SESSION_ID, EXERCISE_ID
+    )
+    GROUP BY ATHLETE_ID, TRACKER, DATE"""
+sql_piano_amounts = """SELECT ATHLETE_ID, 'piano' AS TRACKER, DATE, SUM(PIANO) AS AMOUNT
+    FROM PIANO WHERE PIANO > 0 AND {where}
+    GROUP BY ATHLETE_ID, DATE"""
+sql_upsert_year = """INSERT INTO ACTIVITY_YEARS (ATHLETE_ID, TRACKER, YEAR, DAYS)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (ATHLETE_ID, TRACKER, YEAR) DO UPDATE SET DAYS = excluded.DAYS"""
+
+
+def create_schema(conn) -> None:
+    """
+    Create ACTIVITY_YEARS and fill it from the existing logs.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     create_schema(conn)
+    """
+    conn.execute(sql_create_activity_years_table)
+    rebuild_activity_years(conn)
+
+
+def rebuild_activity_years(conn, athlete_id: int = None) -> None:
+    """
+    Recompute every ACTIVITY_YEARS array from the workout and piano logs.
+
+    The daily amounts are totalled in SQL, then every row is given the slot
+    (athlete, tracker, year) × 366 + day of year and `numpy.bincount` fills
+    all the arrays in one pass.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    athlete_id : int, optional
+        Only rebuild this athlete's arrays; every athlete when omitted.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     rebuild_activity_years(conn)
+    """
+    where = "ATHLETE_ID = :athlete" if athlete_id is not None else "1"
+    params = {"athlete": athlete_id, "walk": exercise_ids["WALK"]}
+    conn.execute(f"DELETE FROM ACTIVITY_YEARS WHERE {where}", params)
+    amounts = pd.read_sql(
+        sql_day_amounts.format(where=where) + " UNION ALL " + sql_piano_amounts.format(where=where),
+        conn,
+        params=params,
+    )
+    if len(amounts) == 0:
+        return
+    day_codes, dates = pd.factorize(amounts["DATE"])
+    dates = pd.DatetimeIndex(pd.to_datetime(dates, format="ISO8601"))
+    amounts["YEAR"] = dates.year.to_numpy()[day_codes]
+    keys = ["ATHLETE_ID", "TRACKER", "YEAR"]
+    group_codes, groups = pd.MultiIndex.from_frame(amounts[keys]).factorize()
+    slots = group_codes * DAY_SLOTS + dates.dayofyear.to_numpy()[day_codes] - 1
+    days = np.bincount(
+        slots, weights=amounts["AMOUNT"].to_numpy(dtype=float), minlength=len(groups) * DAY_SLOTS
+    )
+    days = days.astype(DAY_DTYPE).reshape(len(groups), DAY_SLOTS)
+    conn.executemany(
+        sql_upsert_year,
+        [(int(athlete), tracker, int(year), row.tobytes()) for (athlete, tracker, year), row in zip(groups, days)],
+    )
+
+
+def add_day(conn, athlete_id: int, tracker: str, date: str, amount: int) -> None:
+    """
+    Add an amount to one day of an ACTIVITY_YEARS array.
+
+    Only the 1.5 KB array of that year is read and written back, whatever
+    the length of the logs.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection, inside the transaction of the save.
+    athlete_id : int
+        The athlete who was active.
+    tracker : str
+        A key of `calendar_trackers`.
+    date : str
+        The day, as 'YYYY-MM-DD'.
+    amount : int
+        What was done, in the tracker's unit.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     add_day(conn, 1, "piano", "2023-01-05", 1)
+    """
+    day = datetime.date.fromisoformat(date)
+    stored = conn.execute(
+        "SELECT DAYS FROM ACTIVITY_YEARS WHERE ATHLETE_ID = ? AND TRACKER = ? AND YEAR = ?",
+        (athlete_id, tracker, day.year),
+    ).fetchone()
+    days = np.zeros(DAY_SLOTS, dtype=DAY_DTYPE) if stored is None else np.frombuffer(stored[0], DAY_DTYPE).copy()
+    days[day.timetuple().tm_yday - 1] += amount
+    conn.execute(sql_upsert_year, (athlete_id, tracker, day.year, days.tobytes()))
+
+
+def record_session(conn, session_id: int) -> None:
+    """
+    Add a saved workout session to the ACTIVITY_YEARS arrays.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection, inside the transaction of the save.
+    session_id : int
+        The WORKOUT_SESSIONS.ID of the session just inserted.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     record_session(conn, insert_workout(conn, "2023-01-05", {"WALK_DISTANCE": 3}))
+    """
+    amounts = conn.execute(
+        sql_day_amounts.format(where="SESSION_ID = :session"),
+        {"session": session_id, "walk": exercise_ids["WALK"]},
+    ).fetchall()
+    for athlete_id, tracker, date, amount in amounts:
+        add_day(conn, athlete_id, tracker, date, amount)
+
+
+def read_calendar(
+    tracker: str, athlete_id: int = DEFAULT_ATHLETE_ID, years: int = CALENDAR_YEARS
+) -> dict:
+    """
+    Read the day arrays behind the "Activity Calendar" of the dashboard.
+
+    Parameters
+    ----------
+    tracker : str
+        A key of `calendar_trackers`.
+    athlete_id : int, optional
+        The athlete whose calendar is shown.
+    years : int, optional
+        How many years to show, ending with the current one.
+
+    Returns
+    -------
+    dict
+        {year: numpy.ndarray of 366 daily amounts}, newest year first, with
+        an empty array for years without activity.
+
+    Examples
+    --------
+    >>> read_calendar("piano", 1, 2).keys()
+    dict_keys([2024, 2023])
+    """
+    this_year = datetime.date.today().year
+    stored = database.read_sql(
+        """SELECT YEAR, DAYS FROM ACTIVITY_YEARS
+        WHERE ATHLETE_ID = :athlete AND TRACKER = :tracker AND YEAR > :since""",
+        {"athlete": athlete_id, "tracker": tracker, "since": this_year - years},
+    )
+    arrays = {year: np.frombuffer(days, DAY_DTYPE) for year, days in zip(stored["YEAR"], stored["DAYS"])}
+    return {
+        year: arrays.get(year, np.zeros(DAY_SLOTS, dtype=DAY_DTYPE))
+        for year in range(this_year, this_year - years, -1)
+    }
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import numpy as np
+import pandas as pd
+
+from appHelpers import workouts
+from appHelpers.athletes import DEFAULT_ATHLETE_ID
+from appHelpers.exercises import exercise_ids, exercises, workout_columns
+
+# Look-up arrays indexed by EXERCISE_ID (slot 0 is unused), so a whole column of
+# IDs is mapped with one fancy-indexing step.
+exercise_names = np.array([""] + [name for _, name, _ in exercises], dtype=object)
+exercise_regions = np.array([""] + [region for _, _, region in exercises], dtype=object)
+# Sideline Sculpt and Abdominals are logged as done plus a weight, with no sets
+# or reps; they count as one set of one rep so their weight still adds load.
+counts_reps = np.zeros(len(exercises) + 1, dtype=bool)
+counts_reps[[exercise_ids[key] for _, key, metric in workout_columns if metric == "REPS"]] = True
+
+load_periods = {"week": "W-SUN", "month": "M"}
+
+
+def volume(loads: pd.DataFrame) -> np.ndarray:
+    """
+    Compute sets × reps × weight for every row of `workouts.read_loads`.
+
+    Parameters
+    ----------
+    loads : pandas.DataFrame
+        The EXERCISE_ID, SETS, REPS and WEIGHT columns of `workouts.read_loads`.
+
+    Returns
+    -------
+    numpy.ndarray
+        The volume of each row; 0 for bodyweight work logged without a weight.
+
+    Examples
+    --------
+    >>> volume(workouts.read_loads(1)).sum()
+    """
+    tracked = counts_reps[loads["EXERCISE_ID"].to_numpy(dtype=int)]
+    sets = np.where(tracked, loads["SETS"].to_numpy(dtype=float), 1.0)
+    reps = np.where(tracked, loads["REPS"].to_numpy(dtype=float), 1.0)
+    return sets * reps * loads["WEIGHT"].to_numpy(dtype=float)
+
+
+def _day_codes(loads: pd.DataFrame):
+    # Parse each distinct ISO date once instead of once per exercise row.
+    codes, dates = pd.factorize(loads["DATE"], sort=True)
+    return codes, pd.DatetimeIndex(pd.to_datetime(dates, format="ISO8601"))
+
+
+def tonnage(loads: pd.DataFrame, period: str = "week", by: str = "region") -> pd.DataFrame:
+    """
+    Total the volume per athlete and calendar week or month.
+
+    Every row is given an integer key from its athlete, period and region or
+    exercise, and `numpy.bincount` sums the volumes of all keys in one pass.
+
+    Parameters
+    ----------
+    loads : pandas.DataFrame
+        The output of `workouts.read_loads`, for one athlete or many.
+    period : str, optional
+        "week" (Monday to Sunday) or "month".
+    by : str, optional
+        "region" for one column per body region ("upper", "lower", "abs") or
+        "exercise" for one column per exercise display name.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexed by ATHLETE_ID and PERIOD (the first day of the week or month),
+        one column per region or exercise that carried load. Periods with no
+        load are left out.
+
+    Raises
+    ------
+    KeyError
+        If `period` or `by` is not one of the values above.
+
+    Examples
+    --------
+    >>> tonnage(workouts.read_loads(1), "month", "exercise")
+    """
+    groups = {"region": exercise_regions, "exercise": exercise_names}[by]
+    day_codes, days = _day_codes(loads)
+    period_of_day, periods = pd.factorize(
+        days.to_period(load_periods[period]).start_time, sort=True
+    )
+    athlete_codes, athlete_ids = pd.factorize(loads["ATHLETE_ID"], sort=True)
+    group_of_exercise, names = pd.factorize(groups[1:])
+    group_codes = group_of_exercise[loads["EXERCISE_ID"].to_numpy(dtype=int) - 1]
+    keys = (athlete_codes * len(periods) + period_of_day[day_codes]) * len(names) + group_codes
+    totals = np.bincount(
+        keys, weights=volume(loads), minlength=len(athlete_ids) * len(periods) * len(names)
+    ).reshape(-1, len(names))
+    table = pd.DataFrame(
+        totals,
+        index=pd.MultiIndex.from_product([athlete_ids, periods], names=["ATHLETE_ID", "PERIOD"]),
+        columns=names,
+    )
+    return table.loc[totals.any(axis=1), totals.any(axis=0)]
+
+
+def workload_ratio(loads: pd.DataFrame, acute: int = 7, chronic: int = 28) -> pd.DataFrame:
+    """
+    Compute the acute:chronic workload ratio of every athlete for every day.
+
+    Daily volume is laid out as a days × athletes grid over a continuous
+    calendar, so rest days count as zero load, and both rolling means come
+    from one cumulative sum down the grid. The ratio is the mean daily load
+    of the last `acute` days divided by that of the last `chronic` days,
+    counting only days since the athlete's first session; it is empty while
+    the chronic mean is zero.
+
+    Parameters
+    ----------
+    loads : pandas.DataFrame
+        The output of `workouts.read_loads`, for one athlete or many.
+    acute : int, optional
+        The length of the acute window in days.
+    chronic : int, optional
+        The length of the chronic window in days.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexed by ATHLETE_ID and DATE, with the columns LOAD, ACUTE, CHRONIC
+        and ACWR, from each athlete's first logged day to the last day in
+        `loads`.
+
+    Examples
+    --------
+    >>> workload_ratio(workouts.read_loads(1)).tail(1)
+    """
+    if len(loads) == 0:
+        index = pd.MultiIndex.from_arrays(
+            [np.array([], dtype=int), pd.DatetimeIndex([])], names=["ATHLETE_ID", "DATE"]
+        )
+        return pd.DataFrame(columns=["LOAD", "ACUTE", "CHRONIC", "ACWR"], index=index, dtype=float)
+    day_codes, days = _day_codes(loads)
+    offsets = (days - days[0]).days.to_numpy()
+    calendar = offsets[-1] + 1
+    athlete_codes, athlete_ids = pd.factorize(loads["ATHLETE_ID"], sort=True)
+    athlete_count = len(athlete_ids)
+    load = np.bincount(
+        offsets[day_codes] * athlete_count + athlete_codes,
+        weights=volume(loads),
+        minlength=calendar * athlete_count,
+    ).reshape(calendar, athlete_count)
+    first = np.full(athlete_count, calendar)
+    np.minimum.at(first, athlete_codes, offsets[day_codes])
+    # Days logged so far, capped at the window, so an athlete's first weeks
+    # are averaged over the days since they started rather than padded.
+    elapsed = np.arange(calendar)[:, None] - first[None, :] + 1
+    total = np.vstack([np.zeros((1, athlete_count)), np.cumsum(load, axis=0)])
+
+    def rolling_mean(window):
+        start = np.maximum(np.arange(calendar) + 1 - window, 0)
+        summed = total[1:] - total[start]
+        return summed / np.clip(np.minimum(elapsed, window), 1, None)
+
+    acute_mean = rolling_mean(acute)
+    chronic_mean = rolling_mean(chronic)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(chronic_mean > 0, acute_mean / chronic_mean, np.nan)
+    athlete, day = np.nonzero((elapsed > 0).T)
+    return pd.DataFrame(
+        {
+            "LOAD": load[day, athlete],
+            "ACUTE": acute_mean[day, athlete],
+            "CHRONIC": chronic_mean[day, athlete],
+            "ACWR": ratio[day, athlete],
+        },
+        index=pd.MultiIndex.from_arrays(
+            [athlete_ids[athlete], days[0] + pd.to_timedelta(day, unit="D")],
+            names=["ATHLETE_ID", "DATE"],
+        ),
+    )
+
+
+def training_load(athlete_id: int = DEFAULT_ATHLETE_ID, weeks: int = 8) -> pd.DataFrame:
+    """
+    Build the "Training Load" card of the WORKOUT DATA tab.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        The athlete whose log is summarised.
+    weeks : int, optional
+        How many of the latest weeks with load to show.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per week, newest first, with 'Week' (its Monday), the tonnage
+        of each body region and 'ACWR' (the ratio at the end of the week, or
+        on the latest logged day for the current week, to two places).
+
+    Examples
+    --------
+    >>> training_load(1, weeks=4)
+    """
+    loads = workouts.read_loads(athlete_id)
+    weekly = tonnage(loads, "week", "region")
+    if weekly.empty:
+        return pd.DataFrame(columns=["Week", "ACWR"])
+    weekly = weekly.droplevel("ATHLETE_ID").tail(weeks)
+    ratio = workload_ratio(loads).droplevel("ATHLETE_ID")["ACWR"]
+    ratio = ratio.groupby(ratio.index.to_period(load_periods["week"]).start_time).last()
+    weekly["ACWR"] = ratio.reindex(weekly.index).round(2).to_numpy()
+    weekly = weekly.iloc[::-1].reset_index(names="Week")
+    weekly["Week"] = weekly["Week"].dt.strftime("%Y-%m-%d")
+    return weekly[["Week"] + [c for c in ("upper", "lower", "abs") if c in weekly] + ["ACWR"]]
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+from appHelpers import database
+from appHelpers.roster import students
+
+# Logs recorded before athletes existed belong to this athlete; it is also the
+# one shown when a page is opened without ?athlete=.
+DEFAULT_ATHLETE_ID = 1
+DEFAULT_ATHLETE_NAME = "Default"
+
+sql_create_athletes_table = """CREATE TABLE IF NOT EXISTS ATHLETES (
+    ID  INTEGER PRIMARY KEY,
+    NAME    TEXT NOT NULL UNIQUE
+)"""
+
+
+def create_schema(conn) -> None:
+    """
+    Create the ATHLETES table and seed it with the default athlete and the roster.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     create_schema(conn)
+    """
+    conn.execute(sql_create_athletes_table)
+    conn.execute(
+        "INSERT OR IGNORE INTO ATHLETES (ID, NAME) VALUES (?, ?)",
+        (DEFAULT_ATHLETE_ID, DEFAULT_ATHLETE_NAME),
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO ATHLETES (NAME) VALUES (?)",
+        [(name,) for name in students],
+    )
+
+
+def add_athlete(conn, name: str) -> int:
+    """
+    Return the ID of the athlete called `name`, adding the athlete if needed.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    name : str
+        The athlete's name.
+
+    Returns
+    -------
+    int
+        The athlete's ID.
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     add_athlete(conn, "AvaWilson")
+    4
+    """
+    conn.execute("INSERT OR IGNORE INTO ATHLETES (NAME) VALUES (?)", (name,))
+    return conn.execute("SELECT ID FROM ATHLETES WHERE NAME = ?", (name,)).fetchone()[0]
+
+
+def list_athletes() -> dict:
+    """
+    Read every athlete for the athlete selector.
+
+    Returns
+    -------
+    dict
+        Athlete IDs mapped to names, default athlete first and then by name.
+
+    Examples
+    --------
+    >>> list_athletes()[DEFAULT_ATHLETE_ID]
+    'Default'
+    """
+    with database.reader() as conn:
+        return dict(
+            conn.execute(
+                "SELECT ID, NAME FROM ATHLETES ORDER BY ID != ?, NAME",
+                (DEFAULT_ATHLETE_ID,),
+            ).fetchall()
+        )
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import datetime
+import threading
+from collections import OrderedDict
+
+from appHelpers import database
+
+CACHE_SIZE = 256
+
+_entries = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def version() -> tuple:
+    """
+    Return the stamp cached results are checked against.
+
+    The day is part of the version because the "days since" cards count up
+    to today without any write happening.
+
+    Returns
+    -------
+    tuple
+        `database.data_version()` and today's date; equal stamps mean every
+        cached read would return the same result.
+
+    Examples
+    --------
+    >>> before = version()
+    >>> version() == before
+    True
+    """
+    return database.data_version(), datetime.date.today()
+
+
+def _lookup(key, version):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == version:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            return True, entry[1]
+        _stats["misses"] += 1
+        return False, None
+
+
+def _store(key, version, value) -> None:
+    with _lock:
+        _entries[key] = (version, value)
+        _entries.move_to_end(key)
+        while len(_entries) > CACHE_SIZE:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+
+
+def cached(func, *args):
+    """
+    Return `func(*args)`, reusing the last result if the database is unchanged.
+
+    Results are keyed on the function and its arguments and stamped with
+    `database.data_version()` and the date, read before `func` runs, so a
+    save that commits while the result is being computed makes the next call
+    recompute it. The least recently used result is dropped once
+    `CACHE_SIZE` are held.
+
+    Cached results are shared by every page and browser tab; treat them as
+    read-only.
+
+    Parameters
+    ----------
+    func : callable
+        A function that only reads the database, e.g. `workouts.read_workouts`.
+    *args
+        Hashable positional arguments for `func`.
+
+    Returns
+    -------
+    object
+        Whatever `func` returns.
+
+    Examples
+    --------
+    >>> upper_df = cached(workouts.days_since_last, "upper", 1)
+    """
+    key = (func, args)
+    stamp = version()
+    hit, value = _lookup(key, stamp)
+    if hit:
+        return value
+    value = func(*args)
+    _store(key, stamp, value)
+    return value
+
+
+async def get(func, *args):
+    """
+    Awaitable `cached`: a hit costs only the version check, on the event loop.
+
+    Misses run `func` on the database thread pool like `database.run`.
+
+    Parameters
+    ----------
+    func : callable
+        A function that only reads the database.
+    *args
+        Hashable positional arguments for `func`.
+
+    Returns
+    -------
+    object
+        Whatever `func` returns.
+
+    Examples
+    --------
+    >>> upper_df = await get(workouts.days_since_last, "upper", athlete)
+    """
+    key = (func, args)
+    stamp = version()
+    hit, value = _lookup(key, stamp)
+    if hit:
+        return value
+    value = await database.run(func, *args)
+    _store(key, stamp, value)
+    return value
+
+
+def warm(calls: list) -> None:
+    """
+    Fill the cache ahead of the first page load.
+
+    Parameters
+    ----------
+    calls : list
+        (func, args) pairs, with `args` exactly as the pages pass them.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> warm([(practice.days_since_practice, (1,))])
+    """
+    for func, args in calls:
+        cached(func, *args)
+
+
+def stats() -> dict:
+    """
+    Report how well the cache is doing.
+
+    Returns
+    -------
+    dict
+        'hits', 'misses', 'evictions' (since start) and 'size' (entries held).
+
+    Examples
+    --------
+    >>> stats()["hits"]
+    0
+    """
+    with _lock:
+        return {**_stats, "size": len(_entries)}
+
+
+def clear() -> None:
+    """
+    Drop every cached result; the counters are kept.
+
+    Returns
+    -------
+    None
+    """
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+from nicegui import Client, app, background_tasks, context
+
+from appHelpers.exercises import exercise_ids, region_exercises
+
+# (athlete, client, callback) of every open page showing an athlete's data.
+_subscribers = []
+# Body region of each EXERCISES.ID.
+exercise_regions = {
+    exercise_ids[exercise.key]: region for region, members in region_exercises.items() for exercise in members
+}
+
+
+def subscribe(athlete_id: int, callback) -> None:
+    """
+    Have the current page patched when an athlete's data is saved.
+
+    The subscription belongs to the client (browser tab) building the page,
+    so it must be made while the page is being built. It is dropped when the
+    client disconnects for good; `publish` also drops those of clients that
+    were deleted without ever connecting.
+
+    Parameters
+    ----------
+    athlete_id : int
+        The athlete the page shows.
+    callback : callable
+        Awaited with the change, as built by `publish`, after every save for
+        the athlete. It should only update elements that show what changed.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> subscribe(athlete, patch_cards)
+    """
+    subscriber = (athlete_id, context.client, callback)
+    _subscribers.append(subscriber)
+    context.client.on_disconnect(lambda: _unsubscribe(subscriber))
+
+
+def _unsubscribe(subscriber: tuple) -> None:
+    if subscriber in _subscribers:
+        _subscribers.remove(subscriber)
+
+
+def publish(athlete_id: int, tracker: str, date: str, exercise_list=()) -> dict:
+    """
+    Tell every page showing an athlete that a save has been committed.
+
+    The subscribers are called one after the other in a single background
+    task, so only the first one reads what changed from the database and the
+    rest are served by `cache.get`. Call it on the event loop once the write
+    has returned.
+
+    Parameters
+    ----------
+    athlete_id : int
+        The athlete whose data was saved.
+    tracker : str
+        "workout" or "piano".
+    date : str
+        The day of the session, as 'YYYY-MM-DD'.
+    exercise_list : iterable, optional
+        The EXERCISES.ID of every exercise logged in a workout.
+
+    Returns
+    -------
+    dict
+        The change passed to the callbacks: 'athlete', 'tracker', 'date',
+        'exercises' and 'regions' (the body regions of those exercises).
+
+    Examples
+    --------
+    >>> publish(1, "workout", "2023-01-05", [1, 19])["regions"]
+    frozenset({'upper', 'walk'})
+    """
+    change = {
+        "athlete": athlete_id,
+        "tracker": tracker,
+        "date": date,
+        "exercises": frozenset(exercise_list),
+        "regions": frozenset(exercise_regions[exercise_id] for exercise_id in exercise_list),
+    }
+    # Clients deleted before their socket connected never run their disconnect handlers
+    _subscribers[:] = [subscriber for subscriber in _subscribers if subscriber[1].id in Client.instances]
+    callbacks = [callback for athlete, _, callback in _subscribers if athlete == athlete_id]
+    if callbacks:
+        background_tasks.create(_deliver(callbacks, change), name="publish change")
+    return change
+
+
+async def _deliver(callbacks: list, change: dict) -> None:
+    for callback in callbacks:
+        try:
+            await callback(change)
+        except Exception as e:  # one broken page must not stop the others being patched
+            app.handle_exception(e)
+
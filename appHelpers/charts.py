@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import numpy as np
+import pandas as pd
+
+from appHelpers import database
+from appHelpers.athletes import DEFAULT_ATHLETE_ID
+
+# Points sent to the browser per trace, whatever the length of the log; the
+# visible part of the series is downsampled to this again after every zoom.
+MAX_POINTS = 300
+# The EXERCISES.ID charted when the WORKOUT DATA tab opens.
+DEFAULT_EXERCISE = 1
+
+# (trace label, y axis) of every series that is charted, in legend order.
+# Weights are on their own axis so they do not flatten the rep counts.
+chart_traces = {
+    "REPS": ("Reps", "y"),
+    "WEIGHT": ("Weight", "y2"),
+    "DISTANCE": ("Distance", "y"),
+    "PIANO": ("Practice", "y"),
+}
+
+
+def exercise_series(exercise_id: int, athlete_id: int = DEFAULT_ATHLETE_ID) -> pd.DataFrame:
+    """
+    Read the charted values of one exercise, one row per day it was logged.
+
+    Parameters
+    ----------
+    exercise_id : int
+        The EXERCISES.ID to chart.
+    athlete_id : int, optional
+        The athlete whose log is read.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DATE (datetime64) in ascending order and one column per metric of
+        `chart_traces` the exercise has, NaN on days it was not logged.
+
+    Examples
+    --------
+    >>> exercise_series(19).columns.tolist()
+    ['DATE', 'DISTANCE']
+    """
+    entries = database.read_sql(
+        """SELECT DATE, METRIC, MAX(VALUE) AS VALUE
+        FROM WORKOUT_ENTRIES INDEXED BY IDX_ENTRIES_ATHLETE_EXERCISE_DATE
+        WHERE ATHLETE_ID = :athlete AND EXERCISE_ID = :exercise
+        AND METRIC IN ('REPS', 'WEIGHT', 'DISTANCE')
+        GROUP BY METRIC, DATE""",
+        {"athlete": athlete_id, "exercise": exercise_id},
+    )
+    series = entries.pivot(index="DATE", columns="METRIC", values="VALUE")
+    series = series[[metric for metric in chart_traces if metric in series.columns]].reset_index()
+    series["DATE"] = pd.to_datetime(series["DATE"], format="ISO8601")
+    return series
+
+
+def practice_series(athlete_id: int = DEFAULT_ATHLETE_ID) -> pd.DataFrame:
+    """
+    Read the number of practices per day from the PIANO log.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        The athlete whose log is read.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DATE (datetime64) in ascending order and PIANO, the day's total.
+
+    Examples
+    --------
+    >>> practice_series().tail(1)
+    """
+    series = database.read_sql(
+        """SELECT DATE, SUM(PIANO) AS PIANO FROM PIANO
+        WHERE ATHLETE_ID = :athlete
+        GROUP BY DATE ORDER BY DATE""",
+        {"athlete": athlete_id},
+    )
+    series["DATE"] = pd.to_datetime(series["DATE"], format="ISO8601")
+    return series
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int = MAX_POINTS) -> np.ndarray:
+    """
+    Pick the points of a line that keep its shape (Largest Triangle Three Buckets).
+
+    The first and last points are always kept. The points between them are
+    split into `threshold - 2` buckets, and from each bucket the point forming
+    the largest triangle with the point kept before it and the mean of the
+    next bucket is kept, so peaks and dips survive where a plain stride or
+    average would drop them. The bucket means come from one cumulative sum;
+    only the choice within each bucket, which depends on the previous one,
+    loops.
+
+    Parameters
+    ----------
+    x, y : numpy.ndarray
+        The coordinates, with `x` ascending and no NaN values.
+    threshold : int, optional
+        The number of points to keep.
+
+    Returns
+    -------
+    numpy.ndarray
+        The ascending positions of the points kept; every position when the
+        line already has no more than `threshold` points.
+
+    Examples
+    --------
+    >>> lttb(np.arange(10.0), np.arange(10.0) % 3, 4)
+    array([0, 2, 8, 9])
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = x.astype(float)
+    y = y.astype(float)
+    edges = (np.arange(threshold - 1) * ((n - 2) / (threshold - 2))).astype(int) + 1
+    # The bucket after the last one is the final point on its own.
+    next_edges = np.append(edges[1:], n)
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    counts = next_edges[1:] - edges[1:]
+    mean_x = (cum_x[next_edges[1:]] - cum_x[edges[1:]]) / counts
+    mean_y = (cum_y[next_edges[1:]] - cum_y[edges[1:]]) / counts
+    keep = np.empty(threshold, dtype=int)
+    keep[0] = 0
+    keep[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs(
+            (x[a] - mean_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y[i] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def zoom_range(args: dict):
+    """
+    Read the x range requested by a `plotly_relayout` event.
+
+    Parameters
+    ----------
+    args : dict
+        The event arguments sent by the browser.
+
+    Returns
+    -------
+    tuple or None
+        (start, end) as the date strings Plotly sent, (None, None) when the
+        chart was reset to the whole series, or None when the event did not
+        change the x axis (e.g. a resize or a y-only zoom).
+
+    Examples
+    --------
+    >>> zoom_range({"xaxis.range[0]": "2023-01-01", "xaxis.range[1]": "2023-03-01"})
+    ('2023-01-01', '2023-03-01')
+    """
+    if args.get("xaxis.autorange"):
+        return None, None
+    if "xaxis.range[0]" in args:
+        return args["xaxis.range[0]"], args["xaxis.range[1]"]
+    if "xaxis.range" in args:
+        return tuple(args["xaxis.range"])
+    return None
+
+
+def figure(
+    series: pd.DataFrame,
+    start=None,
+    end=None,
+    max_points: int = MAX_POINTS,
+    revision=None,
+) -> dict:
+    """
+    Build a Plotly line chart of a series, downsampled to what is on screen.
+
+    Only the rows between `start` and `end`, plus one on either side so the
+    lines run to the edges, are considered, and each trace is reduced to at
+    most `max_points` with `lttb`. Zooming in therefore shows more detail
+    while every update stays a few kilobytes.
+
+    Parameters
+    ----------
+    series : pandas.DataFrame
+        DATE and one column per metric of `chart_traces`, as returned by
+        `exercise_series` or `practice_series`.
+    start, end : str, optional
+        The visible range; the whole series when omitted.
+    max_points : int, optional
+        The most points sent per trace.
+    revision : optional
+        Plotly's uirevision; the zoom the user chose is kept across updates
+        with the same value.
+
+    Returns
+    -------
+    dict
+        The `data` and `layout` of the figure, for `ui.plotly`.
+
+    Examples
+    --------
+    >>> chart = ui.plotly(figure(exercise_series(1)))
+    """
+    dates = series["DATE"].to_numpy(dtype="datetime64[D]")
+    lo, hi = 0, len(dates)
+    if start is not None:
+        lo = max(np.searchsorted(dates, np.datetime64(pd.Timestamp(start), "D")) - 1, 0)
+        hi = min(np.searchsorted(dates, np.datetime64(pd.Timestamp(end), "D"), side="right") + 1, hi)
+    days = dates[lo:hi].astype(np.int64)
+    data = []
+    for metric in series.columns.drop("DATE"):
+        label, axis = chart_traces[metric]
+        values = series[metric].to_numpy(dtype=float)[lo:hi]
+        logged = np.flatnonzero(~np.isnan(values))
+        kept = logged[lttb(days[logged], values[logged], max_points)]
+        data.append(
+            {
+                "type": "scatter",
+                "mode": "lines+markers",
+                "name": label,
+                "x": np.datetime_as_string(dates[lo:hi][kept], unit="D").tolist(),
+                "y": values[kept].tolist(),
+                "yaxis": axis,
+            }
+        )
+    layout = {
+        "uirevision": revision,
+        "margin": {"l": 50, "r": 50, "t": 20, "b": 40},
+        "legend": {"orientation": "h"},
+        "xaxis": {"type": "date"},
+        "yaxis": {"rangemode": "tozero"},
+    }
+    if start is not None:
+        layout["xaxis"]["range"] = [start, end]
+    if any(trace["yaxis"] == "y2" for trace in data):
+        layout["yaxis2"] = {"overlaying": "y", "side": "right", "rangemode": "tozero", "title": "Weight"}
+    return {"data": data, "layout": layout}
+
+
+def calendar_figure(years: dict) -> dict:
+    """
+    Build a week-by-weekday heatmap of each year, like a contribution calendar.
+
+    Each 366-day array is laid on a 7 × 54 grid in one reshape: the year is
+    shifted by the weekday of 1 January, so columns are weeks and rows run
+    Monday to Sunday. Cells outside the year are left blank. All years share
+    one colour scale, capped at the 95th percentile of the active days so a
+    single long session does not wash out the rest.
+
+    Parameters
+    ----------
+    years : dict
+        {year: array of 366 daily amounts}, as returned by
+        `activity.read_calendar`; drawn top to bottom in that order.
+
+    Returns
+    -------
+    dict
+        The `data` and `layout` of the figure, for `ui.plotly`.
+
+    Examples
+    --------
+    >>> chart = ui.plotly(calendar_figure(activity.read_calendar("piano")))
+    """
+    active = np.concatenate([days[days > 0] for days in years.values()] + [np.ones(1)])
+    data = []
+    layout = {
+        "margin": {"l": 50, "r": 20, "t": 10, "b": 20},
+        "height": 60 + 130 * len(years),
+        "coloraxis": {
+            "colorscale": [[0, "#ebedf0"], [0.01, "#9be9a8"], [0.4, "#40c463"], [0.7, "#30a14e"], [1, "#216e39"]],
+            "cmin": 0,
+            "cmax": float(np.percentile(active, 95)),
+            "showscale": False,
+        },
+        "xaxis": {"showticklabels": False, "showgrid": False, "zeroline": False},
+    }
+    for i, (year, days) in enumerate(years.items()):
+        first = np.datetime64(f"{year}-01-01")
+        length = (np.datetime64(f"{year + 1}-01-01") - first).astype(int)
+        offset = (first.astype(int) + 3) % 7  # 1970-01-01 was a Thursday
+        grid = np.full(7 * 54, np.nan)
+        grid[offset : offset + length] = days[:length]
+        dates = np.full(7 * 54, "", dtype=object)
+        dates[offset : offset + length] = np.datetime_as_string(first + np.arange(length), unit="D")
+        axis = "y" if i == 0 else f"y{i + 1}"
+        data.append(
+            {
+                "type": "heatmap",
+                "z": np.where(np.isnan(grid), None, grid).reshape(54, 7).T.tolist(),
+                "text": dates.reshape(54, 7).T.tolist(),
+                "hovertemplate": "%{text}: %{z}<extra></extra>",
+                "hoverongaps": False,
+                "xgap": 2,
+                "ygap": 2,
+                "coloraxis": "coloraxis",
+                "yaxis": axis,
+            }
+        )
+        top = 1 - i / len(years)
+        layout["yaxis" if i == 0 else f"yaxis{i + 1}"] = {
+            "domain": [top - 1 / len(years) + 0.04, top],
+            "title": str(year),
+            "tickvals": [0, 2, 4],
+            "ticktext": ["Mon", "Wed", "Fri"],
+            "autorange": "reversed",
+            "showgrid": False,
+            "zeroline": False,
+        }
+    return {"data": data, "layout": layout, "config": {"displayModeBar": False}}
@@ -0,0 +1,714 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import asyncio
+import functools
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from appHelpers.helpers import dataBasePath, iso_date
+
+READ_POOL_SIZE = 4
+STATEMENT_CACHE_SIZE = 256
+BUSY_TIMEOUT = 30.0
+GROUP_COMMIT_WINDOW = 0.0
+GROUP_COMMIT_MAX = 100
+# The most rows one page of a log table may ask for.
+MAX_PAGE_ROWS = 100
+# What a log table shows first, as passed to the read_*_page functions: page
+# 1 of LOG_PAGE_ROWS rows, newest first by DATE, unfiltered.
+LOG_PAGE_ROWS = 10
+FIRST_PAGE = (1, LOG_PAGE_ROWS, "DATE", True, "")
+# Seconds between the writer thread's checks for commits made by other
+# processes, such as the bulk importer.
+WATCH_INTERVAL = 1.0
+
+_db_file = Path(dataBasePath)
+_writer_conn = None
+_writer_lock = threading.RLock()
+_pool_lock = threading.Lock()
+_readers = queue.LifoQueue()
+_reader_count = 0
+_executor = None
+_write_queue = queue.Queue()
+_write_thread = None
+_write_stats = {"batches": 0, "writes": 0, "last_batch": 0, "max_batch": 0}
+_write_version = 0
+_watch_conn = None
+_watch_lock = threading.Lock()
+_external_version = None
+
+
+def configure(db_file, pool_size: int = READ_POOL_SIZE) -> None:
+    """
+    Point the shared connections at a different SQLite database file.
+
+    Any open connections are closed first so that the next call to `writer`
+    or `reader` reconnects to the new file.
+
+    Parameters
+    ----------
+    db_file : str or Path
+        The path to the SQLite database file.
+    pool_size : int, optional
+        The maximum number of read-only connections kept in the pool.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> configure("example.db")
+    """
+    global _db_file, READ_POOL_SIZE
+    close_all()
+    _db_file = Path(db_file)
+    READ_POOL_SIZE = pool_size
+
+
+def db_path() -> Path:
+    """
+    Return the path of the database file the shared connections point at.
+
+    Returns
+    -------
+    Path
+        The configured SQLite database file.
+    """
+    return _db_file
+
+
+def _connect(read_only: bool = False) -> sqlite3.Connection:
+    """
+    Open and configure a new SQLite connection.
+
+    Every connection gets the same settings once, when it is opened: WAL
+    journaling, NORMAL synchronous mode, a busy timeout and a large prepared
+    statement cache. Read-only connections are opened through a `mode=ro`
+    URI so they can never take the write lock.
+
+    Parameters
+    ----------
+    read_only : bool, optional
+        Whether to open the database in read-only mode.
+
+    Returns
+    -------
+    sqlite3.Connection
+        The configured connection.
+
+    Raises
+    ------
+    sqlite3.Error
+        If the database file cannot be opened.
+    """
+    if read_only:
+        conn = sqlite3.connect(
+            f"{_db_file.resolve().as_uri()}?mode=ro",
+            uri=True,
+            timeout=BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+    else:
+        Path.mkdir(_db_file.parent, parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            _db_file,
+            timeout=BUSY_TIMEOUT,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-16000")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+def get_writer() -> sqlite3.Connection:
+    """
+    Return the long-lived writer connection, opening it on first use.
+
+    Returns
+    -------
+    sqlite3.Connection
+        The single connection used for every write in the application.
+
+    Examples
+    --------
+    >>> conn = get_writer()
+    """
+    global _writer_conn
+    with _writer_lock:
+        if _writer_conn is None:
+            _writer_conn = _connect()
+        return _writer_conn
+
+
+@contextmanager
+def writer():
+    """
+    Hold the writer connection for the duration of one transaction.
+
+    The transaction is committed when the block exits normally and rolled
+    back if it raises. Writers are serialized on a lock, so callers never
+    compete for the SQLite write lock inside this process.
+
+    Yields
+    ------
+    sqlite3.Connection
+        The writer connection.
+
+    Examples
+    --------
+    >>> with writer() as conn:
+    ...     conn.execute("INSERT INTO PIANO (DATE, PIANO) VALUES (?, ?)", ("2023-01-05", 1))
+    """
+    global _write_version
+    with _writer_lock:
+        conn = get_writer()
+        try:
+            yield conn
+            conn.commit()
+            _write_version += 1
+        except BaseException:
+            conn.rollback()
+            raise
+
+
+@contextmanager
+def reader():
+    """
+    Borrow a read-only connection from the pool.
+
+    Connections are created lazily up to `READ_POOL_SIZE`; when the pool is
+    exhausted the caller waits for one to be returned.
+
+    Yields
+    ------
+    sqlite3.Connection
+        A read-only connection.
+
+    Examples
+    --------
+    >>> with reader() as conn:
+    ...     conn.execute("SELECT COUNT(*) FROM PIANO").fetchone()
+    """
+    global _reader_count
+    try:
+        conn = _readers.get_nowait()
+    except queue.Empty:
+        with _pool_lock:
+            create = _reader_count < READ_POOL_SIZE
+            if create:
+                _reader_count += 1
+        if create:
+            try:
+                get_writer()
+                conn = _connect(read_only=True)
+            except sqlite3.Error:
+                with _pool_lock:
+                    _reader_count -= 1
+                raise
+        else:
+            conn = _readers.get()
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        _readers.put(conn)
+
+
+@contextmanager
+def dedicated_reader():
+    """
+    Open a read-only connection of its own, outside the pool.
+
+    For long reads such as streamed exports, which would otherwise hold a
+    pooled connection for as long as the download lasts and leave the
+    pages waiting in `reader`.
+
+    Yields
+    ------
+    sqlite3.Connection
+        A read-only connection, closed when the block exits.
+
+    Examples
+    --------
+    >>> with dedicated_reader() as conn:
+    ...     cursor = conn.execute("SELECT * FROM PIANO")
+    """
+    get_writer()
+    conn = _connect(read_only=True)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _poll_data_version() -> None:
+    global _watch_conn, _external_version
+    with _watch_lock:
+        if _watch_conn is None:
+            get_writer()
+            _watch_conn = _connect(read_only=True)
+        _external_version = _watch_conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def data_version() -> tuple:
+    """
+    Return a token that changes whenever the database content may have changed.
+
+    Commits made through `writer` bump an in-process counter. Commits from
+    other processes, such as the bulk importer, change `PRAGMA data_version`,
+    which the writer thread reads on a dedicated connection at least every
+    `WATCH_INTERVAL` seconds. The call itself only reads those two values, so
+    it is safe on the event loop; only the very first call, normally made
+    while the cache is warmed at startup, runs the PRAGMA itself.
+
+    Returns
+    -------
+    tuple
+        The database file, the write counter and the data version.
+
+    Examples
+    --------
+    >>> before = data_version()
+    >>> with writer() as conn:
+    ...     conn.execute("DELETE FROM PIANO WHERE ID = 0")
+    >>> data_version() != before
+    True
+    """
+    _start_writer()
+    if _external_version is None:
+        _poll_data_version()
+    return (str(_db_file), _write_version, _external_version)
+
+
+def read_sql(sql: str, params=None) -> pd.DataFrame:
+    """
+    Run a SELECT statement on a pooled reader and return the result.
+
+    Parameters
+    ----------
+    sql : str
+        The SELECT statement to execute.
+    params : sequence or dict, optional
+        Parameters bound to the statement's placeholders.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The query result.
+
+    Examples
+    --------
+    >>> df = read_sql("SELECT * FROM PIANO")
+    """
+    with reader() as conn:
+        return pd.read_sql_query(sql, conn, params=params)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _pool_lock:
+        if _executor is None:
+            # Saves go through the writer thread, so one thread per pooled
+            # reader is enough and a save waiting on fsync never holds up the
+            # page queries behind it.
+            _executor = ThreadPoolExecutor(
+                max_workers=READ_POOL_SIZE, thread_name_prefix="sqlite"
+            )
+        return _executor
+
+
+async def run(func, *args):
+    """
+    Run a blocking database function on the database threads and await it.
+
+    Page builders and event handlers use this so that no SQLite call ever runs
+    on NiceGUI's event loop.
+
+    Parameters
+    ----------
+    func : callable
+        The blocking function to call, e.g. `workouts.days_since_last`.
+    *args
+        Positional arguments passed to `func`.
+
+    Returns
+    -------
+    object
+        Whatever `func` returns.
+
+    Examples
+    --------
+    >>> upper_df = await run(workouts.days_since_last, "upper")
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(func, *args))
+
+
+async def query(sql: str, params=None) -> pd.DataFrame:
+    """
+    Awaitable form of `read_sql`.
+
+    Parameters
+    ----------
+    sql : str
+        The SELECT statement to execute.
+    params : sequence or dict, optional
+        Parameters bound to the statement's placeholders.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The query result.
+
+    Examples
+    --------
+    >>> df = await query("SELECT * FROM PIANO")
+    """
+    return await run(read_sql, sql, params)
+
+
+def _write_loop() -> None:
+    """
+    Drain the write queue, committing each batch in a single transaction.
+
+    The thread blocks for the first request, then takes everything that queued
+    up while the previous batch was committing, up to `GROUP_COMMIT_MAX`
+    requests, waiting at most `GROUP_COMMIT_WINDOW` seconds for more. A save
+    therefore waits for at most one commit plus the window. Every request runs in its own savepoint, so one
+    failing insert is rolled back and reported without losing the rest of the
+    batch. Futures are resolved only after the commit has returned.
+
+    Requests whose caller has already given up (e.g. a client that
+    disconnected mid-save cancels its awaitable) are skipped, and the others
+    are marked running first so they can no longer be cancelled; resolving a
+    future can then never raise and end the thread.
+
+    Between batches, and at least every `WATCH_INTERVAL` seconds while idle,
+    the thread also refreshes the version `data_version` reports for commits
+    made by other processes.
+    """
+    polled = time.monotonic()
+    while True:
+        try:
+            item = _write_queue.get(timeout=WATCH_INTERVAL)
+        except queue.Empty:
+            item = False
+        if time.monotonic() - polled >= WATCH_INTERVAL:
+            try:
+                _poll_data_version()
+            except sqlite3.Error:
+                pass  # checked again on the next pass
+            polled = time.monotonic()
+        if item is None:
+            return
+        if item is False:
+            continue
+        batch = [item]
+        deadline = time.monotonic() + GROUP_COMMIT_WINDOW
+        stop = False
+        while len(batch) < GROUP_COMMIT_MAX:
+            try:
+                item = _write_queue.get_nowait()
+            except queue.Empty:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = _write_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+        batch = [(func, args, future) for func, args, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            if stop:
+                return
+            continue
+        results = []
+        try:
+            with writer() as conn:
+                conn.execute("BEGIN")
+                for func, args, future in batch:
+                    conn.execute("SAVEPOINT queued_write")
+                    try:
+                        results.append((future, func(conn, *args), None))
+                        conn.execute("RELEASE queued_write")
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO queued_write")
+                        conn.execute("RELEASE queued_write")
+                        results.append((future, None, e))
+        except Exception as e:
+            results = [(future, None, e) for _, _, future in batch]
+        with _pool_lock:
+            _write_stats["batches"] += 1
+            _write_stats["writes"] += len(batch)
+            _write_stats["last_batch"] = len(batch)
+            _write_stats["max_batch"] = max(_write_stats["max_batch"], len(batch))
+        for future, result, error in results:
+            try:
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+            except InvalidStateError:
+                pass
+        if stop:
+            return
+
+
+def submit(func, *args) -> Future:
+    """
+    Queue `func(conn, *args)` for the writer thread.
+
+    Writes from every page are funnelled through one thread that owns the
+    writer connection and commits them in small batches, so concurrent saves
+    share an fsync instead of competing for the SQLite write lock.
+
+    Parameters
+    ----------
+    func : callable
+        A function taking the writer connection as its first argument, e.g.
+        `workouts.insert_workout`.
+    *args
+        The remaining arguments passed to `func`.
+
+    Returns
+    -------
+    concurrent.futures.Future
+        Resolves to the return value of `func` once its batch has committed,
+        or to the exception it raised.
+
+    Examples
+    --------
+    >>> submit(practice.insert_practice, "2023-01-05", 1, "Minuet", "").result()
+    """
+    future = Future()
+    _start_writer()
+    _write_queue.put((func, args, future))
+    return future
+
+
+def _start_writer() -> None:
+    global _write_thread
+    with _pool_lock:
+        if _write_thread is None:
+            _write_thread = threading.Thread(
+                target=_write_loop, name="sqlite-writer", daemon=True
+            )
+            _write_thread.start()
+
+
+async def write(func, *args):
+    """
+    Queue `func(conn, *args)` for the writer thread and await its commit.
+
+    Parameters
+    ----------
+    func : callable
+        A function taking the writer connection as its first argument, e.g.
+        `workouts.insert_workout`.
+    *args
+        The remaining arguments passed to `func`.
+
+    Returns
+    -------
+    object
+        Whatever `func` returns, once its batch has committed.
+
+    Raises
+    ------
+    sqlite3.Error
+        If the write fails; only that write is rolled back.
+
+    Examples
+    --------
+    >>> await write(practice.insert_practice, "2023-01-05", 1, "Minuet", "")
+    """
+    return await asyncio.wrap_future(submit(func, *args))
+
+
+def write_stats() -> dict:
+    """
+    Return the writer thread's counters.
+
+    Returns
+    -------
+    dict
+        'queue_depth' (requests waiting now), 'batches' and 'writes' (totals
+        since start), 'last_batch' and 'max_batch' (requests per commit).
+
+    Examples
+    --------
+    >>> write_stats()["queue_depth"]
+    0
+    """
+    with _pool_lock:
+        return {"queue_depth": _write_queue.qsize(), **_write_stats}
+
+
+def date_range(column: str, start=None, end=None) -> tuple:
+    """
+    Build an index-friendly WHERE clause for an inclusive date range.
+
+    Parameters
+    ----------
+    column : str
+        The DATE column to filter, e.g. "s.DATE".
+    start, end : date or str, optional
+        The first and last day to include; either bound may be omitted.
+
+    Returns
+    -------
+    tuple of (str, dict)
+        The condition (just "1" when both bounds are omitted) and its named
+        parameters.
+
+    Examples
+    --------
+    >>> date_range("DATE", start="2023-01-01")
+    ('DATE >= :start', {'start': '2023-01-01'})
+    """
+    clauses = []
+    params = {}
+    if start is not None:
+        clauses.append(f"{column} >= :start")
+        params["start"] = iso_date(start)
+    if end is not None:
+        clauses.append(f"{column} <= :end")
+        params["end"] = iso_date(end)
+    return " AND ".join(clauses) or "1", params
+
+
+def page_window(page: int, rows_per_page: int) -> dict:
+    """
+    Turn a table page number into LIMIT and OFFSET parameters.
+
+    Parameters
+    ----------
+    page : int
+        The 1-based page, as sent by the table.
+    rows_per_page : int
+        The rows per page; clamped to 1..MAX_PAGE_ROWS so a client cannot
+        ask for the whole log.
+
+    Returns
+    -------
+    dict
+        The named parameters :limit and :offset.
+
+    Examples
+    --------
+    >>> page_window(3, 10)
+    {'limit': 10, 'offset': 20}
+    """
+    limit = min(max(int(rows_per_page), 1), MAX_PAGE_ROWS)
+    return {"limit": limit, "offset": (max(int(page), 1) - 1) * limit}
+
+
+def date_prefix(column: str, text: str = None) -> tuple:
+    """
+    Build an index-friendly WHERE clause matching dates that start with `text`.
+
+    "2023" keeps that year and "2023-05" that month. GLOB is case sensitive,
+    so SQLite turns a literal prefix into a range seek on the date index;
+    GLOB wildcards typed into the filter are dropped.
+
+    Parameters
+    ----------
+    column : str
+        The DATE column to filter, e.g. "s.DATE".
+    text : str, optional
+        What the user typed in the table filter; no filter when empty.
+
+    Returns
+    -------
+    tuple of (str, dict)
+        The condition (just "1" without a filter) and its named parameters.
+
+    Examples
+    --------
+    >>> date_prefix("DATE", " 2023-05")
+    ('DATE GLOB :prefix', {'prefix': '2023-05*'})
+    """
+    prefix = "".join(char for char in (text or "").strip() if char not in "*?[]")
+    if not prefix:
+        return "1", {}
+    return f"{column} GLOB :prefix", {"prefix": prefix + "*"}
+
+
+def close_all() -> None:
+    """
+    Stop the writer thread and close the writer connection and every reader.
+
+    Writes already queued are committed before the thread exits.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> close_all()
+    """
+    global _writer_conn, _reader_count, _executor, _write_thread, _watch_conn, _external_version
+    if _write_thread is not None:
+        _write_queue.put(None)
+        _write_thread.join()
+        _write_thread = None
+    with _writer_lock:
+        if _writer_conn is not None:
+            _writer_conn.close()
+            _writer_conn = None
+    with _watch_lock:
+        if _watch_conn is not None:
+            _watch_conn.close()
+            _watch_conn = None
+        _external_version = None
+    with _pool_lock:
+        while True:
+            try:
+                _readers.get_nowait().close()
+            except queue.Empty:
+                break
+        _reader_count = 0
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
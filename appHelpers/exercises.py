@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Exercise:
+    """
+    One exercise of the workout log, as listed in `registry`.
+
+    Attributes
+    ----------
+    key : str
+        The EXERCISES.NAME and the prefix of its wide WORKOUTS columns.
+    name : str
+        The display name used by the data tab, cards, charts and exports.
+    region : str
+        The body region: "upper", "lower", "abs" or "walk".
+    form_label : str
+        The label of its row on the WORKOUT INPUT form.
+    metrics : tuple
+        What is logged for it, in column order: "REPS", "SETS", "WEIGHT",
+        "STAIR", "DISTANCE" or "DONE".
+
+    Examples
+    --------
+    >>> Exercise("PLANK", "Plank", "abs", "Plank", ("DONE",)).columns
+    ('PLANK',)
+    """
+
+    key: str
+    name: str
+    region: str
+    form_label: str
+    metrics: tuple
+
+    @property
+    def columns(self) -> tuple:
+        """The wide WORKOUTS column of each metric; DONE is the bare key."""
+        return tuple(self.key if metric == "DONE" else f"{self.key}_{metric}" for metric in self.metrics)
+
+
+##############################################################################
+# Exercises tracked in the workout log
+##############################################################################
+# Everything else in this module, the EXERCISES rows, the WORKOUT INPUT form
+# and the region cards is derived from this list, so adding an exercise is one
+# entry. The position in the list + 1 is the EXERCISES.ID used by
+# WORKOUT_ENTRIES, so new exercises go at the end.
+LIFT = ("REPS", "SETS", "WEIGHT")
+registry = [
+    Exercise("FRONTLINE", "Frontline POW Raise", "upper", "Frontline Raise", LIFT),
+    Exercise("SHOULDERZPRESS", "Arnold Press", "upper", "Arnold Presses", LIFT),
+    Exercise("ELBOWOUTROW", "Elbow Out Row", "upper", "Elbow Out Row", LIFT),
+    Exercise("SUPINEBICEPCURL", "Supinating Bicep Curl", "upper", "Supinating Bicep Curl", LIFT),
+    Exercise("CLOSEGRIPPUSHUP", "Close Grip Pushup", "upper", "Close Grip Pushup", ("REPS", "SETS", "STAIR")),
+    Exercise("REARDELTFLY", "Rear Delt Fly", "upper", "Seated Rear Delt Fly", LIFT),
+    Exercise("SIDEBEND", "Side Bend", "upper", "Standing Side Bend", LIFT),
+    Exercise("LATERALRAISE", "Lateral Raise", "upper", "Lateral Raise", LIFT),
+    Exercise("STIFFLEGRDL", "Stiff Legged RDL", "lower", "Stiff Leg RDL", LIFT),
+    Exercise("SLIDERHAMSTRINGCURL", "Hamstring Curls", "lower", "Hamstring Curl", LIFT),
+    Exercise("HIPTHRUSTER", "Hip Thrusters", "lower", "Hip Thruster", LIFT),
+    Exercise("FORWARDSQUAT", "Forward Squat", "lower", "Front Squat", LIFT),
+    Exercise("SUMOSQUAT", "Sumo Squat", "lower", "Sumo Squat", LIFT),
+    Exercise("CYCLISTSQUAT", "Cyclist Squat", "lower", "Cyclist Squat", LIFT),
+    Exercise("SINGLELEGCALFRAISE", "Single Leg Calf Raise", "lower", "Calf Raise", LIFT),
+    Exercise("LONGLEVERCRUNCHES", "Long Lever Crunches", "lower", "Long Lever Crunches", LIFT),
+    Exercise("SIDELINESCULPT", "Sideline Sculpt", "abs", "Sideline Sculpt", ("DONE", "WEIGHT")),
+    Exercise("ABDOMINALS", "Abdominals", "abs", "Abdominals", ("DONE", "WEIGHT")),
+    Exercise("WALK", "Walk", "walk", "Walking", ("DISTANCE", "DONE")),
+]
+
+# Body regions in form order, with the heading of their WORKOUT INPUT section
+# and the title of their "Most Recent Exercises" card.
+region_titles = {
+    "upper": ("UPPER BODY", "Upper Body Exercises"),
+    "lower": ("LOWER BODY WORK", "Lower Body Exercises"),
+    "abs": ("CORE WORK", "Abdominal Exercises"),
+    "walk": ("WALKING", "Walking"),
+}
+# How each metric is named in a column label ("Side Bend sets") and above its
+# input on the form.
+metric_labels = {
+    "REPS": ("reps", "REPS"),
+    "SETS": ("sets", "SETS"),
+    "WEIGHT": ("Weight", "WEIGHT"),
+    "STAIR": ("Stair", "STAIR"),
+    "DISTANCE": ("Distance", "DISTANCE"),
+    "DONE": ("", "DONE"),
+}
+
+##############################################################################
+# Lookups derived from the registry
+##############################################################################
+# (exercise key, display name, body region)
+exercises = [(exercise.key, exercise.name, exercise.region) for exercise in registry]
+exercise_ids = {exercise.key: i + 1 for i, exercise in enumerate(registry)}
+exercise_names = {i + 1: exercise.name for i, exercise in enumerate(registry)}
+region_exercises = {
+    region: [exercise for exercise in registry if exercise.region == region] for region in region_titles
+}
+# Columns of the wide WORKOUTS layout, in table order: (column name, exercise
+# key, metric)
+workout_columns = [
+    (column, exercise.key, metric)
+    for exercise in registry
+    for column, metric in zip(exercise.columns, exercise.metrics)
+]
+column_index = {
+    column: (exercise_ids[key], metric) for column, key, metric in workout_columns
+}
+# Human-readable column names used by the data tab and the exports
+column_labels = {
+    "DATE": "Date",
+    **{
+        column: f"{exercise.name} {metric_labels[metric][0]}".strip()
+        for exercise in registry
+        for column, metric in zip(exercise.columns, exercise.metrics)
+    },
+    "ATHLETE_ID": "Athlete",
+}
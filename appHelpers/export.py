@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import csv
+import importlib.util
+import io
+import json
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from nicegui import app
+
+from appHelpers import database, practice, workouts
+from appHelpers.exercises import column_labels
+
+EXPORT_BATCH_SIZE = 2000
+# pyarrow is optional; without it the pages offer no Parquet download.
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+# (query builder, human-readable column names, columns holding text)
+tables = {
+    "workouts": (workouts.select_workouts, column_labels, {"DATE"}),
+    "piano": (practice.select_practice, practice.column_labels, {"DATE", "LESSON", "RECITAL"}),
+}
+media_types = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+# The format each file suffix is read and written as by importer.py and exporter.py.
+file_formats = {
+    ".csv": "csv",
+    ".json": "jsonl",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+
+
+def iter_batches(table: str, batch_size: int = EXPORT_BATCH_SIZE, athlete_id: int = None):
+    """
+    Read a table in batches of `batch_size` rows with `fetchmany`.
+
+    The whole log comes back in the order it was logged, and one athlete's log
+    in date order. Both orders are index orders and need no sort, so SQLite
+    never holds more than one batch either. The read has a connection of its
+    own, so slow downloads never take the pages' pooled readers.
+
+    Parameters
+    ----------
+    table : str
+        "workouts" or "piano".
+    batch_size : int, optional
+        The number of rows per batch.
+    athlete_id : int, optional
+        Only export this athlete's rows; every athlete when omitted.
+
+    Yields
+    ------
+    list of str
+        The human-readable column names, once, before the first batch.
+    list of tuple
+        The rows of each batch, without the ID column.
+
+    Examples
+    --------
+    >>> batches = iter_batches("piano")
+    >>> columns = next(batches)
+    """
+    select, labels, _ = tables[table]
+    with database.dedicated_reader() as conn:
+        cursor = conn.execute(*select(athlete_id, newest_first=False))
+        columns = [column[0] for column in cursor.description][1:]
+        yield [labels.get(column, column) for column in columns]
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [row[1:] for row in rows]
+
+
+class _Drain(io.RawIOBase):
+    """Write-only sink that hands back whatever was written since last asked."""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def stream(
+    table: str,
+    file_format: str,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    athlete_id: int = None,
+):
+    """
+    Encode a table as CSV, JSON Lines or Parquet, one chunk of bytes per batch.
+
+    The same generator backs the download endpoints and the command-line
+    exporter, so memory use is bounded by `batch_size` however long the log is.
+
+    Parameters
+    ----------
+    table : str
+        "workouts" or "piano".
+    file_format : str
+        "csv", "jsonl" or "parquet".
+    batch_size : int, optional
+        The number of rows encoded per chunk (and per Parquet row group).
+    athlete_id : int, optional
+        Only export this athlete's rows; every athlete when omitted.
+
+    Yields
+    ------
+    bytes
+        The next part of the file.
+
+    Raises
+    ------
+    ImportError
+        If Parquet is requested and pyarrow is not installed.
+
+    Examples
+    --------
+    >>> with open("piano.csv", "wb") as f:
+    ...     for part in stream("piano", "csv"):
+    ...         f.write(part)
+    """
+    if file_format == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Writing Parquet files requires pyarrow") from e
+    _, labels, text_columns = tables[table]
+    text_labels = {labels.get(column, column) for column in text_columns}
+    batches = iter_batches(table, batch_size, athlete_id)
+    columns = next(batches)
+    if file_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(columns)
+        for rows in batches:
+            writer.writerows(rows)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+    elif file_format == "jsonl":
+        for rows in batches:
+            yield "".join(
+                json.dumps(dict(zip(columns, row))) + "\n" for row in rows
+            ).encode("utf-8")
+    else:
+        schema = pa.schema(
+            [
+                (column, pa.string() if column in text_labels else pa.int64())
+                for column in columns
+            ]
+        )
+        sink = _Drain()
+        with pq.ParquetWriter(sink, schema) as writer:
+            for rows in batches:
+                arrays = [
+                    pa.array(values, type=field.type)
+                    for values, field in zip(zip(*rows), schema)
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                yield sink.take()
+        yield sink.take()
+
+
+def create() -> None:
+    """
+    Register the download endpoints `/export/{table}.{file_format}`.
+
+    An `?athlete=<id>` query parameter limits the download to one athlete.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> create()
+    """
+
+    @app.get("/export/{table}.{file_format}")
+    def export(table: str, file_format: str, athlete: int = None) -> StreamingResponse:
+        if table not in tables or file_format not in media_types:
+            raise HTTPException(status_code=404, detail="Unknown export")
+        if file_format == "parquet" and not PARQUET_AVAILABLE:
+            raise HTTPException(
+                status_code=501, detail="Writing Parquet files requires pyarrow"
+            )
+        return StreamingResponse(
+            stream(table, file_format, athlete_id=athlete),
+            media_type=media_types[file_format],
+            headers={
+                "Content-Disposition": f'attachment; filename="{table}.{file_format}"'
+            },
+        )
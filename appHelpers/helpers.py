@@ -24,6 +24,9 @@ date_fmt = "%Y-%m-%d %H:%M:%S"
 
 datenow = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+# Canonical form of every DATE column in the database; it sorts as text.
+iso_date_fmt = "%Y-%m-%d"
+
 os.chdir(os.path.dirname(os.path.abspath(__file__)))
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 USER_DIR = ""
@@ -84,3 +87,32 @@ USER_DIR = set_start_dir()
 os.chdir(USER_DIR)
 
 dataBasePath = Path(USER_DIR).joinpath("Fitness", "workoutLog.db")
+
+
+def iso_date(value) -> str:
+    """
+    Convert a date, datetime or date string to the canonical 'YYYY-MM-DD' form.
+
+    Parameters
+    ----------
+    value : datetime.date, datetime.datetime or str
+        The date to convert. Strings may carry a time part, which is dropped.
+
+    Returns
+    -------
+    str
+        The date as 'YYYY-MM-DD'.
+
+    Raises
+    ------
+    ValueError
+        If `value` is not a valid date.
+
+    Examples
+    --------
+    >>> iso_date("2023-01-05 00:00:00")
+    '2023-01-05'
+    """
+    if isinstance(value, datetime.date):
+        return value.strftime(iso_date_fmt)
+    return datetime.date.fromisoformat(str(value).strip()[:10]).strftime(iso_date_fmt)
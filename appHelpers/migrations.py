@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+from appHelpers import activity, athletes, database, practice, progression, records, streaks, workouts
+
+
+def _create_piano(conn) -> None:
+    conn.execute(practice.sql_create_piano_table)
+
+
+def _create_workout_tables(conn) -> None:
+    workouts.create_schema(conn)
+
+
+def _move_wide_workouts(conn) -> None:
+    # Commits once per chunk on its own so an interrupted copy resumes; the
+    # version is only bumped after the WORKOUTS view exists.
+    workouts.migrate_wide_table()
+
+
+# What migrations 4 and 5 created when they shipped: the single-athlete
+# summary tables, their triggers and their backfill. The module functions they
+# called have since been redefined per athlete, so the SQL is kept here
+# verbatim; migration 7 drops these objects and builds the per-athlete ones.
+sql_v4_exercise_state = [
+    """CREATE TABLE IF NOT EXISTS EXERCISE_STATE (
+    EXERCISE_ID INTEGER PRIMARY KEY REFERENCES EXERCISES (ID),
+    LAST_DATE   TEXT,
+    LAST_REPS   INTEGER,
+    LAST_SETS   INTEGER,
+    LAST_LEVEL  INTEGER,
+    LEVEL_DATE  TEXT
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS TRG_STATE_PERFORMED
+    AFTER INSERT ON WORKOUT_ENTRIES
+    WHEN NEW.METRIC IN ('REPS', 'DONE')
+    BEGIN
+        UPDATE EXERCISE_STATE
+        SET LAST_DATE = NEW.DATE, LAST_REPS = NEW.VALUE
+        WHERE EXERCISE_ID = NEW.EXERCISE_ID
+        AND (LAST_DATE IS NULL OR NEW.DATE >= LAST_DATE);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS TRG_STATE_SETS
+    AFTER INSERT ON WORKOUT_ENTRIES
+    WHEN NEW.METRIC = 'SETS'
+    BEGIN
+        UPDATE EXERCISE_STATE
+        SET LAST_SETS = NEW.VALUE
+        WHERE EXERCISE_ID = NEW.EXERCISE_ID
+        AND (LAST_DATE IS NULL OR NEW.DATE >= LAST_DATE);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS TRG_STATE_LEVEL
+    AFTER INSERT ON WORKOUT_ENTRIES
+    WHEN NEW.METRIC IN ('WEIGHT', 'STAIR', 'DISTANCE')
+    BEGIN
+        UPDATE EXERCISE_STATE
+        SET LEVEL_DATE = NEW.DATE, LAST_LEVEL = NEW.VALUE
+        WHERE EXERCISE_ID = NEW.EXERCISE_ID
+        AND (LEVEL_DATE IS NULL OR NEW.DATE >= LEVEL_DATE);
+    END""",
+    "INSERT OR IGNORE INTO EXERCISE_STATE (EXERCISE_ID) SELECT ID FROM EXERCISES",
+    """UPDATE EXERCISE_STATE SET
+    LAST_DATE = (
+        SELECT MAX(e.DATE) FROM WORKOUT_ENTRIES e
+        WHERE e.EXERCISE_ID = EXERCISE_STATE.EXERCISE_ID
+        AND e.METRIC IN ('REPS', 'DONE')
+    ),
+    LAST_REPS = (
+        SELECT e.VALUE FROM WORKOUT_ENTRIES e
+        WHERE e.EXERCISE_ID = EXERCISE_STATE.EXERCISE_ID
+        AND e.METRIC IN ('REPS', 'DONE')
+        ORDER BY e.DATE DESC, e.SESSION_ID DESC LIMIT 1
+    ),
+    LAST_SETS = (
+        SELECT e.VALUE FROM WORKOUT_ENTRIES e
+        WHERE e.EXERCISE_ID = EXERCISE_STATE.EXERCISE_ID
+        AND e.METRIC = 'SETS'
+        ORDER BY e.DATE DESC, e.SESSION_ID DESC LIMIT 1
+    ),
+    LEVEL_DATE = (
+        SELECT MAX(e.DATE) FROM WORKOUT_ENTRIES e
+        WHERE e.EXERCISE_ID = EXERCISE_STATE.EXERCISE_ID
+        AND e.METRIC IN ('WEIGHT', 'STAIR', 'DISTANCE')
+    ),
+    LAST_LEVEL = (
+        SELECT e.VALUE FROM WORKOUT_ENTRIES e
+        WHERE e.EXERCISE_ID = EXERCISE_STATE.EXERCISE_ID
+        AND e.METRIC IN ('WEIGHT', 'STAIR', 'DISTANCE')
+        ORDER BY e.DATE DESC, e.SESSION_ID DESC LIMIT 1
+    )""",
+]
+sql_v5_practice_state = [
+    """CREATE TABLE IF NOT EXISTS PRACTICE_STATE (
+    ID  INTEGER PRIMARY KEY CHECK (ID = 1),
+    LAST_DATE   TEXT,
+    LAST_PIANO  INTEGER
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS TRG_PRACTICE_STATE
+    AFTER INSERT ON PIANO
+    WHEN NEW.PIANO IS NOT NULL AND NEW.PIANO != 0
+    BEGIN
+        UPDATE PRACTICE_STATE
+        SET LAST_DATE = NEW.DATE, LAST_PIANO = NEW.PIANO
+        WHERE ID = 1 AND (LAST_DATE IS NULL OR NEW.DATE >= LAST_DATE);
+    END""",
+    "INSERT OR IGNORE INTO PRACTICE_STATE (ID) VALUES (1)",
+    """UPDATE PRACTICE_STATE SET
+    LAST_DATE = (SELECT MAX(DATE) FROM PIANO WHERE PIANO != 0),
+    LAST_PIANO = (
+        SELECT PIANO FROM PIANO WHERE PIANO != 0
+        ORDER BY DATE DESC, ID DESC LIMIT 1
+    )
+    WHERE ID = 1""",
+]
+
+
+def _create_exercise_state(conn) -> None:
+    for sql in sql_v4_exercise_state:
+        conn.execute(sql)
+
+
+def _create_practice_state(conn) -> None:
+    for sql in sql_v5_practice_state:
+        conn.execute(sql)
+
+
+def _canonical_dates(conn) -> None:
+    # Rows saved through the default datetime adapter carry a time part
+    # ("2023-01-05 00:00:00"); anything date() cannot parse is left alone.
+    for table, columns in [
+        ("PIANO", ["DATE"]),
+        ("WORKOUT_SESSIONS", ["DATE"]),
+        ("WORKOUT_ENTRIES", ["DATE"]),
+        ("EXERCISE_STATE", ["LAST_DATE", "LEVEL_DATE"]),
+        ("PRACTICE_STATE", ["LAST_DATE"]),
+    ]:
+        for column in columns:
+            conn.execute(
+                f"""UPDATE {table} SET {column} = date({column})
+                WHERE {column} != date({column})"""
+            )
+    for sql in practice.sql_create_piano_indexes + workouts.sql_create_sessions_indexes:
+        conn.execute(sql)
+
+
+def _add_athletes(conn) -> None:
+    athletes.create_schema(conn)
+    # SQLite refuses ADD COLUMN with both REFERENCES and a non-NULL default
+    # while foreign keys are on, so these columns carry no REFERENCES clause.
+    for table in ["WORKOUT_SESSIONS", "WORKOUT_ENTRIES", "PIANO"]:
+        conn.execute(
+            f"""ALTER TABLE {table} ADD COLUMN
+            ATHLETE_ID INTEGER NOT NULL DEFAULT {athletes.DEFAULT_ATHLETE_ID:d}"""
+        )
+    for name in [
+        "IDX_SESSIONS_DATE",
+        "IDX_ENTRIES_DATE",
+        "IDX_ENTRIES_EXERCISE_DATE",
+        "IDX_PIANO_DATE",
+    ]:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    for sql in workouts.sql_create_athlete_indexes + practice.sql_create_athlete_indexes:
+        conn.execute(sql)
+    for name in [
+        "TRG_STATE_PERFORMED",
+        "TRG_STATE_SETS",
+        "TRG_STATE_LEVEL",
+        "TRG_PRACTICE_STATE",
+    ]:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    conn.execute("DROP TABLE IF EXISTS EXERCISE_STATE")
+    conn.execute("DROP TABLE IF EXISTS PRACTICE_STATE")
+    workouts.create_state_schema(conn)
+    practice.create_schema(conn)
+
+
+def _create_progression_state(conn) -> None:
+    progression.create_schema(conn)
+
+
+def _create_personal_records(conn) -> None:
+    records.create_schema(conn)
+
+
+def _create_streaks(conn) -> None:
+    streaks.create_schema(conn)
+
+
+def _create_activity_years(conn) -> None:
+    activity.create_schema(conn)
+
+
+##############################################################################
+# Schema migrations, oldest first
+##############################################################################
+# (version, description, step); each step is applied once, in order, and the
+# version is stored in PRAGMA user_version in the same transaction, except for
+# the steps in `resumable_migrations`. Append new
+# migrations at the end and never renumber or edit one that has shipped. Every
+# step must also be safe on a database created before versioning existed,
+# which reports version 0 but may already hold some of these objects.
+migrations = [
+    (1, "Create the PIANO practice log", _create_piano),
+    (2, "Create the normalized workout tables", _create_workout_tables),
+    (3, "Move the wide WORKOUTS table into WORKOUT_ENTRIES", _move_wide_workouts),
+    (4, "Add the EXERCISE_STATE summary table", _create_exercise_state),
+    (5, "Add the PRACTICE_STATE summary row", _create_practice_state),
+    (6, "Store dates as YYYY-MM-DD and index them", _canonical_dates),
+    (7, "Add athletes and key every log by athlete", _add_athletes),
+    (8, "Add the PROGRESSION_STATE estimated 1RM summary", _create_progression_state),
+    (9, "Add the PERSONAL_RECORDS index and backfill it", _create_personal_records),
+    (10, "Add the ACTIVITY_DAYS log and STREAK_STATE summary", _create_streaks),
+    (11, "Add the ACTIVITY_YEARS calendar day arrays", _create_activity_years),
+]
+
+# Steps that commit in chunks of their own, so an interrupted run resumes where
+# it stopped; they run outside migrate()'s transaction, and the version is
+# bumped in a transaction of its own once they return.
+resumable_migrations = {3}
+
+SCHEMA_VERSION = migrations[-1][0]
+
+
+def schema_version(conn) -> int:
+    """
+    Read the schema version recorded in the database header.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Any connection to the database.
+
+    Returns
+    -------
+    int
+        The value of PRAGMA user_version; 0 for a new or unversioned database.
+
+    Examples
+    --------
+    >>> schema_version(database.get_writer())
+    11
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate() -> list:
+    """
+    Bring the database schema up to `SCHEMA_VERSION`.
+
+    When the schema is current this is a single PRAGMA read and no DDL runs.
+    Otherwise every pending migration is applied in order, each in its own
+    transaction together with the version bump, so a failed step leaves the
+    database at the last version that completed. Steps listed in
+    `resumable_migrations` commit their own chunks instead; if one is
+    interrupted the version is not bumped and the next run resumes it.
+
+    Returns
+    -------
+    list
+        The descriptions of the migrations that were applied.
+
+    Raises
+    ------
+    sqlite3.Error
+        If a migration fails; later migrations are not attempted.
+
+    Examples
+    --------
+    >>> migrate()
+    []
+    """
+    current = schema_version(database.get_writer())
+    if current >= SCHEMA_VERSION:
+        return []
+    applied = []
+    for version, description, step in migrations:
+        if version <= current:
+            continue
+        if version in resumable_migrations:
+            step(database.get_writer())
+        with database.writer() as conn:
+            conn.execute("BEGIN")
+            if version not in resumable_migrations:
+                step(conn)
+            conn.execute(f"PRAGMA user_version = {version:d}")
+        applied.append(description)
+    return applied
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import pandas as pd
+
+from appHelpers import activity, database, streaks
+from appHelpers.athletes import DEFAULT_ATHLETE_ID
+from appHelpers.helpers import iso_date
+
+# Human-readable column names used by the data tab and the exports
+column_labels = {
+    "DATE": "Date",
+    "PIANO": "Practiced",
+    "LESSON": "Lesson",
+    "RECITAL": "Recital",
+    "ATHLETE_ID": "Athlete",
+}
+
+sql_create_piano_table = """CREATE TABLE IF NOT EXISTS PIANO (
+    ID    INTEGER PRIMARY KEY AUTOINCREMENT,
+    DATE    TEXT,
+    PIANO   INTEGER,
+    LESSON  TEXT,
+    RECITAL TEXT
+)"""
+sql_create_piano_indexes = [
+    """CREATE INDEX IF NOT EXISTS IDX_PIANO_DATE
+    ON PIANO (DATE)""",
+]
+# IDX_PIANO_DATE is replaced by this index in the athlete migration.
+sql_create_athlete_indexes = [
+    """CREATE INDEX IF NOT EXISTS IDX_PIANO_ATHLETE_DATE
+    ON PIANO (ATHLETE_ID, DATE)""",
+]
+sql_create_practice_state_table = """CREATE TABLE IF NOT EXISTS PRACTICE_STATE (
+    ATHLETE_ID  INTEGER PRIMARY KEY REFERENCES ATHLETES (ID),
+    LAST_DATE   TEXT,
+    LAST_PIANO  INTEGER
+)"""
+sql_create_practice_state_trigger = """CREATE TRIGGER IF NOT EXISTS TRG_PRACTICE_STATE
+    AFTER INSERT ON PIANO
+    WHEN NEW.PIANO IS NOT NULL AND NEW.PIANO != 0
+    BEGIN
+        INSERT INTO PRACTICE_STATE (ATHLETE_ID, LAST_DATE, LAST_PIANO)
+        VALUES (NEW.ATHLETE_ID, NEW.DATE, NEW.PIANO)
+        ON CONFLICT (ATHLETE_ID) DO UPDATE
+        SET LAST_DATE = excluded.LAST_DATE, LAST_PIANO = excluded.LAST_PIANO
+        WHERE LAST_DATE IS NULL OR excluded.LAST_DATE >= LAST_DATE;
+    END"""
+
+
+def create_schema(conn) -> None:
+    """
+    Create the per-athlete PRACTICE_STATE summary and the trigger that maintains it.
+
+    The summary rows are filled from the existing PIANO log.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction. The PIANO table
+        must already exist.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     create_schema(conn)
+    """
+    conn.execute(sql_create_practice_state_table)
+    conn.execute(sql_create_practice_state_trigger)
+    rebuild_practice_state(conn)
+
+
+def rebuild_practice_state(conn, athlete_id: int = None) -> None:
+    """
+    Recompute the PRACTICE_STATE rows from the PIANO log.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    athlete_id : int, optional
+        Only rebuild this athlete's row; every athlete when omitted.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     rebuild_practice_state(conn)
+    """
+    where = "ATHLETE_ID = :athlete" if athlete_id is not None else "1"
+    params = {"athlete": athlete_id}
+    conn.execute(f"DELETE FROM PRACTICE_STATE WHERE {where}", params)
+    conn.execute(
+        f"""INSERT INTO PRACTICE_STATE (ATHLETE_ID, LAST_DATE, LAST_PIANO)
+        SELECT
+        k.ATHLETE_ID,
+        (
+            SELECT MAX(p.DATE) FROM PIANO p
+            WHERE p.ATHLETE_ID = k.ATHLETE_ID AND p.PIANO != 0
+        ),
+        (
+            SELECT p.PIANO FROM PIANO p
+            WHERE p.ATHLETE_ID = k.ATHLETE_ID AND p.PIANO != 0
+            ORDER BY p.DATE DESC, p.ID DESC LIMIT 1
+        )
+        FROM (
+            SELECT DISTINCT ATHLETE_ID FROM PIANO WHERE {where} AND PIANO != 0
+        ) k""",
+        params,
+    )
+
+
+def insert_practice(
+    conn,
+    date,
+    piano: int,
+    lesson: str,
+    recital: str,
+    athlete_id: int = DEFAULT_ATHLETE_ID,
+) -> None:
+    """
+    Insert one practice session into the PIANO table.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    date : str, datetime.date or datetime.datetime
+        The practice date; it is stored as 'YYYY-MM-DD'.
+    piano : int
+        1 if the piano was practiced, 0 otherwise; a practice also extends
+        the streaks and the activity calendar.
+    lesson : str
+        The song being learned for lessons.
+    recital : str
+        The song being prepared for a recital.
+    athlete_id : int, optional
+        The athlete the session belongs to.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     insert_practice(conn, "2023-01-05", 1, "Minuet", "")
+    """
+    date = iso_date(date)
+    conn.execute(
+        "INSERT INTO PIANO (ATHLETE_ID, DATE, PIANO, LESSON, RECITAL) VALUES (?, ?, ?, ?, ?)",
+        (athlete_id, date, piano, lesson, recital),
+    )
+    if piano:
+        streaks.record_activity(conn, athlete_id, date, [streaks.piano_subject])
+        activity.add_day(conn, athlete_id, "piano", date, piano)
+
+
+def select_practice(
+    athlete_id: int = None, start=None, end=None, newest_first: bool = True
+) -> tuple:
+    """
+    Build the query for PIANO rows, optionally for one athlete and date range.
+
+    For one athlete the rows are read through IDX_PIANO_ATHLETE_DATE in date
+    order. Without an athlete the whole log is read in ID order.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        Only read this athlete's rows; every athlete when omitted.
+    start, end : date or str, optional
+        The first and last day to include; the whole log when omitted.
+    newest_first : bool, optional
+        Whether to return the latest session first.
+
+    Returns
+    -------
+    tuple
+        The SQL text and its named parameters.
+
+    Examples
+    --------
+    >>> sql, params = select_practice(4, start="2023-01-01")
+    """
+    where, params = database.date_range("DATE", start, end)
+    direction = " DESC" if newest_first else ""
+    if athlete_id is None:
+        order = f"ID{direction}"
+    else:
+        where = f"ATHLETE_ID = :athlete AND {where}"
+        params["athlete"] = athlete_id
+        order = f"DATE{direction}, ID{direction}"
+    return f"SELECT * FROM PIANO WHERE {where} ORDER BY {order}", params
+
+
+def read_practice(start=None, end=None, athlete_id: int = DEFAULT_ATHLETE_ID) -> pd.DataFrame:
+    """
+    Read an athlete's PIANO log, newest first, optionally limited to a date range.
+
+    Parameters
+    ----------
+    start, end : date or str, optional
+        The first and last day to include; the whole log when omitted.
+    athlete_id : int, optional
+        The athlete whose log is read.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The PIANO columns, one row per practice session.
+
+    Examples
+    --------
+    >>> recent = read_practice(start="2023-01-01")
+    """
+    return database.read_sql(*select_practice(athlete_id, start, end))
+
+
+# What one page of the "Cumulative Practice Log" may be sorted by.
+page_sort_columns = {column: column for column in ["DATE", "PIANO", "LESSON", "RECITAL"]}
+
+
+def read_practice_page(
+    athlete_id: int = DEFAULT_ATHLETE_ID,
+    page: int = 1,
+    rows_per_page: int = 10,
+    sort_by: str = "DATE",
+    descending: bool = True,
+    date_filter: str = None,
+) -> tuple:
+    """
+    Read one page of an athlete's PIANO log.
+
+    The page is cut with ORDER BY, LIMIT and OFFSET in SQL, through
+    IDX_PIANO_ATHLETE_DATE when sorted by date, so the rows read and sent to
+    the table do not grow with the log.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        The athlete whose log is read.
+    page : int, optional
+        The 1-based page.
+    rows_per_page : int, optional
+        Rows per page, at most `database.MAX_PAGE_ROWS`.
+    sort_by : str, optional
+        A key of `page_sort_columns`; anything else sorts by date.
+    descending : bool, optional
+        Whether to sort from the largest value.
+    date_filter : str, optional
+        Only count and read rows whose date starts with this, e.g. "2023-05".
+
+    Returns
+    -------
+    tuple of (pandas.DataFrame, int)
+        The page, with the PIANO columns, and the number of rows matching
+        the filter.
+
+    Examples
+    --------
+    >>> rows, total = read_practice_page(1, date_filter="2023")
+    """
+    where, params = database.date_prefix("DATE", date_filter)
+    params.update(database.page_window(page, rows_per_page), athlete=athlete_id)
+    where = f"ATHLETE_ID = :athlete AND {where}"
+    direction = " DESC" if descending else ""
+    sort = page_sort_columns.get(sort_by, "DATE")
+    # Sorted by date the index already gives the order, ties included.
+    ties = f"ID{direction}" if sort == "DATE" else "DATE DESC, ID DESC"
+    total = database.read_sql(f"SELECT COUNT(*) AS TOTAL FROM PIANO WHERE {where}", params)["TOTAL"].iloc[0]
+    rows = database.read_sql(
+        f"""SELECT * FROM PIANO WHERE {where}
+        ORDER BY {sort}{direction}, {ties}
+        LIMIT :limit OFFSET :offset""",
+        params,
+    )
+    return rows, int(total)
+
+
+def days_since_practice(athlete_id: int = DEFAULT_ATHLETE_ID) -> pd.DataFrame:
+    """
+    Read the "Time Since Last Practice" card from PRACTICE_STATE.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        The athlete whose card is read.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A single 'Practiced' row with the columns 'Exercises' and
+        'Days_Since_Last', or an empty frame if nothing has been logged.
+
+    Examples
+    --------
+    >>> piano_df = days_since_practice()
+    """
+    return database.read_sql(
+        """SELECT
+        'Practiced' AS Exercises,
+        CAST(julianday('now', 'localtime') - julianday(LAST_DATE) AS INTEGER) AS Days_Since_Last
+        FROM PRACTICE_STATE
+        WHERE ATHLETE_ID = ? AND LAST_DATE IS NOT NULL""",
+        (athlete_id,),
+    )
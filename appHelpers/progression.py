@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import numpy as np
+import pandas as pd
+
+from appHelpers import database
+from appHelpers.athletes import DEFAULT_ATHLETE_ID
+from appHelpers.exercises import exercise_ids, exercise_names, workout_columns
+
+# Estimated one-rep maxes are only meaningful for exercises logged with both
+# reps and a weight.
+weighted_exercises = sorted(
+    {exercise_ids[key] for _, key, metric in workout_columns if metric == "WEIGHT"}
+    & {exercise_ids[key] for _, key, metric in workout_columns if metric == "REPS"}
+)
+
+# Rolling windows, in weeks, counted back from the latest session of each
+# exercise; the trend is fitted over the long window.
+SHORT_WINDOW_WEEKS = 4
+LONG_WINDOW_WEEKS = 12
+# A trend within this fraction of the 12-week best per week counts as a stall.
+STALL_RATE = 0.005
+# Fewer sessions than this in the long window give no trend.
+TREND_MIN_SESSIONS = 3
+
+sql_create_progression_state_table = """CREATE TABLE IF NOT EXISTS PROGRESSION_STATE (
+    ATHLETE_ID  INTEGER NOT NULL REFERENCES ATHLETES (ID),
+    EXERCISE_ID INTEGER NOT NULL REFERENCES EXERCISES (ID),
+    LAST_DATE   TEXT,
+    LAST_WEIGHT INTEGER,
+    LAST_REPS   INTEGER,
+    LAST_EPLEY  REAL,
+    LAST_BRZYCKI    REAL,
+    BEST_4W REAL,
+    BEST_12W    REAL,
+    SLOPE_12W   REAL,
+    SESSIONS_12W    INTEGER,
+    PRIMARY KEY (ATHLETE_ID, EXERCISE_ID)
+) WITHOUT ROWID"""
+state_columns = [
+    "ATHLETE_ID",
+    "EXERCISE_ID",
+    "LAST_DATE",
+    "LAST_WEIGHT",
+    "LAST_REPS",
+    "LAST_EPLEY",
+    "LAST_BRZYCKI",
+    "BEST_4W",
+    "BEST_12W",
+    "SLOPE_12W",
+    "SESSIONS_12W",
+]
+sql_upsert_state = f"""INSERT INTO PROGRESSION_STATE ({", ".join(state_columns)})
+    VALUES ({", ".join("?" * len(state_columns))})
+    ON CONFLICT (ATHLETE_ID, EXERCISE_ID) DO UPDATE SET
+    {", ".join(f"{column} = excluded.{column}" for column in state_columns[2:])}"""
+# One row per session in which an exercise was logged with reps and a weight.
+sql_lifts = """SELECT r.ATHLETE_ID, r.EXERCISE_ID, r.DATE, w.VALUE AS WEIGHT, r.VALUE AS REPS
+    FROM WORKOUT_ENTRIES r
+    JOIN WORKOUT_ENTRIES w
+    ON w.SESSION_ID = r.SESSION_ID AND w.EXERCISE_ID = r.EXERCISE_ID AND w.METRIC = 'WEIGHT'
+    WHERE r.METRIC = 'REPS' AND {where}
+    ORDER BY r.ATHLETE_ID, r.EXERCISE_ID, r.DATE, r.SESSION_ID"""
+# The date of an athlete's latest lift of one exercise, found by walking
+# IDX_ENTRIES_ATHLETE_EXERCISE_DATE backwards.
+sql_latest_lift = """SELECT r.DATE
+    FROM WORKOUT_ENTRIES r
+    JOIN WORKOUT_ENTRIES w
+    ON w.SESSION_ID = r.SESSION_ID AND w.EXERCISE_ID = r.EXERCISE_ID AND w.METRIC = 'WEIGHT'
+    WHERE r.ATHLETE_ID = :athlete AND r.EXERCISE_ID = :exercise AND r.METRIC = 'REPS'
+    ORDER BY r.DATE DESC LIMIT 1"""
+
+
+def epley(weight, reps):
+    """
+    Estimate a one-rep max with the Epley formula, weight × (1 + reps / 30).
+
+    Parameters
+    ----------
+    weight, reps : float or numpy.ndarray
+        The weight lifted and the reps completed with it.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        The estimate; a single rep is its own one-rep max.
+
+    Examples
+    --------
+    >>> epley(20, 10)
+    26.666666666666668
+    """
+    weight = np.asarray(weight, dtype=float)
+    reps = np.asarray(reps, dtype=float)
+    return np.where(reps == 1, weight, weight * (1 + reps / 30))
+
+
+def brzycki(weight, reps):
+    """
+    Estimate a one-rep max with the Brzycki formula, weight × 36 / (37 − reps).
+
+    Parameters
+    ----------
+    weight, reps : float or numpy.ndarray
+        The weight lifted and the reps completed with it.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        The estimate; NaN from 37 reps on, where the formula breaks down.
+
+    Examples
+    --------
+    >>> brzycki(20, 10)
+    26.666666666666668
+    """
+    weight = np.asarray(weight, dtype=float)
+    reps = np.asarray(reps, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(reps < 37, weight * 36 / (37 - reps), np.nan)
+
+
+def summarise(lifts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce logged lifts to one PROGRESSION_STATE row per athlete and exercise.
+
+    The windows end at each exercise's latest session. The trend is the least
+    squares slope of the Epley estimates against time over the long window,
+    computed from per-group sums so every exercise is fitted at once.
+
+    Parameters
+    ----------
+    lifts : pandas.DataFrame
+        ATHLETE_ID, EXERCISE_ID, DATE, WEIGHT and REPS, sorted by athlete,
+        exercise and date as `sql_lifts` returns them. Rows older than the
+        long window are allowed and ignored.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The `state_columns`; SLOPE_12W is in estimate units per week and NaN
+        when all sessions in the window fall on one day.
+
+    Examples
+    --------
+    >>> summarise(pd.DataFrame({"ATHLETE_ID": [1], "EXERCISE_ID": [1],
+    ...     "DATE": ["2023-01-05"], "WEIGHT": [20], "REPS": [10]}))
+    """
+    keys = ["ATHLETE_ID", "EXERCISE_ID"]
+    day_codes, days = pd.factorize(lifts["DATE"])
+    day = pd.to_datetime(days, format="ISO8601").to_numpy()[day_codes]
+    frame = lifts[keys].copy()
+    frame["EPLEY"] = epley(lifts["WEIGHT"], lifts["REPS"])
+    anchor = pd.Series(day, index=lifts.index).groupby([lifts[k] for k in keys]).transform("max")
+    # Weeks before the latest session; 0 for the latest session itself.
+    weeks = (anchor.to_numpy() - day) / np.timedelta64(7, "D")
+    short = weeks < SHORT_WINDOW_WEEKS
+    long = weeks < LONG_WINDOW_WEEKS
+    frame["SHORT"] = np.where(short, frame["EPLEY"], np.nan)
+    frame["LONG"] = np.where(long, frame["EPLEY"], np.nan)
+    x = np.where(long, -weeks, 0.0)
+    y = np.where(long, frame["EPLEY"], 0.0)
+    frame["N"] = long.astype(int)
+    frame["X"], frame["Y"], frame["XY"], frame["XX"] = x, y, x * y, x * x
+    grouped = frame.groupby(keys, sort=False)
+    sums = grouped[["N", "X", "Y", "XY", "XX"]].sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (sums["N"] * sums["XY"] - sums["X"] * sums["Y"]) / (
+            sums["N"] * sums["XX"] - sums["X"] ** 2
+        )
+    last = lifts.groupby(keys, sort=False).tail(1).set_index(keys)
+    state = pd.DataFrame(
+        {
+            "LAST_DATE": last["DATE"],
+            "LAST_WEIGHT": last["WEIGHT"],
+            "LAST_REPS": last["REPS"],
+            "LAST_EPLEY": pd.Series(epley(last["WEIGHT"], last["REPS"]), index=last.index),
+            "LAST_BRZYCKI": pd.Series(brzycki(last["WEIGHT"], last["REPS"]), index=last.index),
+            "BEST_4W": grouped["SHORT"].max(),
+            "BEST_12W": grouped["LONG"].max(),
+            "SLOPE_12W": slope.where(np.isfinite(slope)),
+            "SESSIONS_12W": sums["N"],
+        }
+    )
+    return state.reset_index()[state_columns]
+
+
+def _store(conn, state: pd.DataFrame) -> None:
+    conn.executemany(
+        sql_upsert_state,
+        state.astype(object).where(state.notna(), None).itertuples(index=False, name=None),
+    )
+
+
+def create_schema(conn) -> None:
+    """
+    Create the PROGRESSION_STATE summary and fill it from the existing log.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     create_schema(conn)
+    """
+    conn.execute(sql_create_progression_state_table)
+    rebuild_progression_state(conn)
+
+
+def rebuild_progression_state(conn, athlete_id: int = None) -> None:
+    """
+    Recompute the PROGRESSION_STATE rows from the whole of WORKOUT_ENTRIES.
+
+    The lifts are read in one query and summarised in one vectorized pass.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    athlete_id : int, optional
+        Only rebuild this athlete's rows; every athlete when omitted.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     rebuild_progression_state(conn)
+    """
+    where = "ATHLETE_ID = :athlete" if athlete_id is not None else "1"
+    params = {"athlete": athlete_id}
+    conn.execute(f"DELETE FROM PROGRESSION_STATE WHERE {where}", params)
+    lifts = pd.read_sql(
+        sql_lifts.format(where=where.replace("ATHLETE_ID", "r.ATHLETE_ID")), conn, params=params
+    )
+    _store(conn, summarise(lifts))
+
+
+def update_progression_state(conn, athlete_id: int, exercises_logged) -> None:
+    """
+    Refresh the PROGRESSION_STATE rows of the exercises a save touched.
+
+    Only the long window before each exercise's latest session is read, two
+    seeks on IDX_ENTRIES_ATHLETE_EXERCISE_DATE per exercise, so the cost does
+    not grow with the length of the log.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection, inside the transaction of the save.
+    athlete_id : int
+        The athlete who logged the session.
+    exercises_logged : iterable of int
+        The EXERCISE_IDs saved; those without an estimate are skipped.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     update_progression_state(conn, 1, [1, 9])
+    """
+    rows = []
+    for exercise_id in sorted(set(exercises_logged) & set(weighted_exercises)):
+        params = {"athlete": athlete_id, "exercise": exercise_id}
+        latest = conn.execute(sql_latest_lift, params).fetchone()
+        if latest is None:
+            continue
+        params["since"] = str(
+            (pd.Timestamp(latest[0]) - pd.Timedelta(weeks=LONG_WINDOW_WEEKS)).date()
+        )
+        rows += conn.execute(
+            sql_lifts.format(
+                where="r.ATHLETE_ID = :athlete AND r.EXERCISE_ID = :exercise AND r.DATE > :since"
+            ),
+            params,
+        ).fetchall()
+    if rows:
+        lifts = pd.DataFrame(rows, columns=["ATHLETE_ID", "EXERCISE_ID", "DATE", "WEIGHT", "REPS"])
+        _store(conn, summarise(lifts))
+
+
+def read_progression(athlete_id: int = DEFAULT_ATHLETE_ID) -> pd.DataFrame:
+    """
+    Build the "Progression" card of the WORKOUT DATA tab.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        The athlete whose estimates are shown.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per weighted exercise the athlete has lifted, in exercise
+        order, with 'Exercise', 'e1RM' (Epley) and 'Brzycki' for the latest
+        session, 'Best_4wk', 'Best_12wk', 'Trend_per_wk' and 'Status'
+        ("progressing", "stalling", "regressing" or "too few sessions").
+
+    Examples
+    --------
+    >>> read_progression(1)
+    """
+    state = database.read_sql(
+        """SELECT * FROM PROGRESSION_STATE
+        WHERE ATHLETE_ID = :athlete ORDER BY EXERCISE_ID""",
+        {"athlete": athlete_id},
+    )
+    slope = state["SLOPE_12W"].astype(float)
+    stall = STALL_RATE * state["BEST_12W"].astype(float)
+    status = np.select(
+        [
+            (state["SESSIONS_12W"] < TREND_MIN_SESSIONS) | slope.isna(),
+            slope > stall,
+            slope < -stall,
+        ],
+        ["too few sessions", "progressing", "regressing"],
+        "stalling",
+    )
+    return pd.DataFrame(
+        {
+            "Exercise": state["EXERCISE_ID"].map(exercise_names),
+            "e1RM": state["LAST_EPLEY"].astype(float).round(1),
+            "Brzycki": state["LAST_BRZYCKI"].astype(float).round(1),
+            "Best_4wk": state["BEST_4W"].astype(float).round(1),
+            "Best_12wk": state["BEST_12W"].astype(float).round(1),
+            "Trend_per_wk": slope.round(2),
+            "Status": status,
+        }
+    )
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import numpy as np
+import pandas as pd
+
+from appHelpers import database, progression
+from appHelpers.athletes import DEFAULT_ATHLETE_ID
+from appHelpers.exercises import exercise_ids, exercises, workout_columns
+
+# Sessions of each exercise the suggestions look back over.
+RECENT_SESSIONS = 3
+# The rule used by the WORKOUT INPUT placeholders; a key of `progression_rules`.
+PROGRESSION_RULE = "double"
+# Double progression: add reps within the range, then add WEIGHT_STEP and drop
+# back to the bottom of the range once the top has been reached in each of the
+# last PROGRESS_AFTER sessions at the same weight.
+REP_RANGE = (8, 12)
+PROGRESS_AFTER = 2
+WEIGHT_STEP = 5
+# Percentage based: work at this share of the best estimated 1RM of the recent
+# sessions, for the reps Epley gives at that share (10 at 75 %).
+TRAINING_PERCENT = 0.75
+
+EXERCISE_COUNT = len(exercises)
+# Wide column of each exercise's reps, sets and level (weight, stair or
+# distance), by EXERCISE_ID; exercises without one are left out.
+metric_columns = {
+    kind: {exercise_ids[key]: column for column, key, metric in workout_columns if metric in metrics}
+    for kind, metrics in [
+        ("REPS", ("REPS",)),
+        ("SETS", ("SETS",)),
+        ("LEVEL", ("WEIGHT", "STAIR", "DISTANCE")),
+    ]
+}
+# The metric whose sessions the suggestions follow: reps, else the walk's
+# distance, else done.
+performed_metrics = {
+    exercise_ids[key]: metric
+    for metric in ("DONE", "DISTANCE", "REPS")
+    for _, key, logged in workout_columns
+    if logged == metric
+}
+is_weighted = np.zeros(EXERCISE_COUNT + 1, dtype=bool)
+is_weighted[progression.weighted_exercises] = True
+counts_reps = np.zeros(EXERCISE_COUNT + 1, dtype=bool)
+counts_reps[list(metric_columns["REPS"])] = True
+
+# The last RECENT_SESSIONS sessions of every exercise, each found with one
+# seek on IDX_ENTRIES_ATHLETE_EXERCISE_DATE, then folded to one row per session.
+sql_recent_window = f"""SELECT r.EXERCISE_ID, r.DATE,
+    MAX(CASE WHEN e.METRIC = 'SETS' THEN e.VALUE END) AS SETS,
+    MAX(CASE WHEN e.METRIC = 'REPS' THEN e.VALUE END) AS REPS,
+    MAX(CASE WHEN e.METRIC IN ('WEIGHT', 'STAIR', 'DISTANCE') THEN e.VALUE END) AS LEVEL
+    FROM ({" UNION ALL ".join(
+        f'''SELECT * FROM (
+        SELECT SESSION_ID, EXERCISE_ID, DATE
+        FROM WORKOUT_ENTRIES INDEXED BY IDX_ENTRIES_ATHLETE_EXERCISE_DATE
+        WHERE ATHLETE_ID = :athlete AND EXERCISE_ID = {exercise_id} AND METRIC = '{metric}'
+        ORDER BY DATE DESC, SESSION_ID DESC LIMIT :sessions)'''
+        for exercise_id, metric in sorted(performed_metrics.items())
+    )}) r
+    JOIN WORKOUT_ENTRIES e ON e.SESSION_ID = r.SESSION_ID AND e.EXERCISE_ID = r.EXERCISE_ID
+    GROUP BY r.SESSION_ID, r.EXERCISE_ID
+    ORDER BY r.EXERCISE_ID, r.DATE DESC, r.SESSION_ID DESC"""
+
+
+def recent_window(athlete_id: int = DEFAULT_ATHLETE_ID, sessions: int = RECENT_SESSIONS) -> pd.DataFrame:
+    """
+    Read the last few sessions of every exercise, the input of `next_session`.
+
+    The read costs a fixed number of index seeks, so it does not slow down as
+    the log grows; pages read it through `cache.get`.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        The athlete whose sessions are read.
+    sessions : int, optional
+        How many sessions of each exercise to read.
+
+    Returns
+    -------
+    pandas.DataFrame
+        EXERCISE_ID, DATE, SETS, REPS and LEVEL (the weight, stair or
+        distance), newest session first within each exercise.
+
+    Examples
+    --------
+    >>> recent_window(1).head()
+    """
+    return database.read_sql(sql_recent_window, {"athlete": athlete_id, "sessions": sessions})
+
+
+def _history(window: pd.DataFrame, column: str) -> np.ndarray:
+    # Lay a window column out as exercises × sessions, newest session first,
+    # NaN where an exercise has fewer sessions. The window is sorted by
+    # exercise, so a row's session is its distance from the exercise's first.
+    exercise = window["EXERCISE_ID"].to_numpy(dtype=int)
+    session = np.arange(len(exercise)) - np.searchsorted(exercise, exercise)
+    grid = np.full((EXERCISE_COUNT + 1, max(RECENT_SESSIONS, session.max(initial=-1) + 1)), np.nan)
+    grid[exercise, session] = window[column].to_numpy(dtype=float)
+    return grid
+
+
+def _latest(grid: np.ndarray) -> np.ndarray:
+    # The newest value of each row that is not NaN, e.g. the last weight used
+    # even if the last session was logged without one.
+    return grid[np.arange(len(grid)), (~np.isnan(grid)).argmax(axis=1)]
+
+
+def _double_progression(sets, reps, level):
+    last_reps = reps[:, 0]
+    last_level = _latest(level)
+    recent = slice(0, PROGRESS_AFTER)
+    ready = (
+        is_weighted
+        & (reps[:, recent] >= REP_RANGE[1]).all(axis=1)
+        & (level[:, recent] == last_level[:, None]).all(axis=1)
+    )
+    # Reps that fell in every session of the window are held, not pushed.
+    declining = (np.diff(reps, axis=1) > 0).all(axis=1)
+    more_reps = np.where(declining, last_reps, last_reps + 1)
+    next_reps = np.where(is_weighted, np.minimum(more_reps, REP_RANGE[1]), more_reps)
+    return (
+        sets[:, 0],
+        np.where(ready, REP_RANGE[0], next_reps),
+        np.where(ready, last_level + WEIGHT_STEP, last_level),
+    )
+
+
+def _percentage_based(sets, reps, level):
+    next_sets, next_reps, next_level = _double_progression(sets, reps, level)
+    estimates = progression.epley(level, reps)
+    best = np.where(np.isnan(estimates), -np.inf, estimates).max(axis=1)
+    has_lift = is_weighted & np.isfinite(best)
+    target = np.round(TRAINING_PERCENT * np.where(has_lift, best, 0) / WEIGHT_STEP) * WEIGHT_STEP
+    return (
+        next_sets,
+        np.where(has_lift, round(30 * (1 / TRAINING_PERCENT - 1)), next_reps),
+        np.where(has_lift, target, next_level),
+    )
+
+
+progression_rules = {
+    "double": _double_progression,
+    "percentage": _percentage_based,
+}
+
+
+def next_session(window: pd.DataFrame, rule: str = PROGRESSION_RULE) -> dict:
+    """
+    Suggest the sets, reps and level of every exercise's next session.
+
+    All exercises are handled together: the window is laid out as one
+    exercises × sessions array per measure and the rule works on whole
+    columns, so there is no per-exercise Python loop.
+
+    Parameters
+    ----------
+    window : pandas.DataFrame
+        As returned by `recent_window`.
+    rule : str, optional
+        "double" (double progression within REP_RANGE) or "percentage"
+        (TRAINING_PERCENT of the best recent estimated 1RM).
+
+    Returns
+    -------
+    dict
+        Wide column names (e.g. "FRONTLINE_REPS") mapped to the suggested
+        value. Exercises never logged, and measures never logged for an
+        exercise, are left out; exercises without reps keep their last level.
+
+    Examples
+    --------
+    >>> next_session(recent_window(1)).get("FRONTLINE_WEIGHT")
+    20
+    """
+    sets, reps, level = (_history(window, column) for column in ["SETS", "REPS", "LEVEL"])
+    suggested = dict(zip(["SETS", "REPS", "LEVEL"], progression_rules[rule](sets, reps, level)))
+    suggested["LEVEL"] = np.where(counts_reps, suggested["LEVEL"], _latest(level))
+    return {
+        column: int(suggested[kind][exercise_id])
+        for kind, columns in metric_columns.items()
+        for exercise_id, column in columns.items()
+        if not np.isnan(suggested[kind][exercise_id])
+    }
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import pandas as pd
+
+from appHelpers import database
+from appHelpers.athletes import DEFAULT_ATHLETE_ID
+from appHelpers.exercises import exercise_names
+
+
+# Kinds of personal record; reps are ranked separately for every weight they
+# were lifted at (AT_WEIGHT), the other kinds use AT_WEIGHT 0.
+record_labels = {
+    "WEIGHT": "Heaviest weight",
+    "REPS": "Most reps",
+    "DISTANCE": "Longest walk",
+}
+
+# Every entry that can set a record, keyed like PERSONAL_RECORDS. The reps of a
+# session are paired with the weight logged for the same exercise, if any.
+sql_candidates = """SELECT ATHLETE_ID, EXERCISE_ID, METRIC AS KIND, 0 AS AT_WEIGHT, VALUE, DATE, SESSION_ID
+    FROM WORKOUT_ENTRIES
+    WHERE METRIC IN ('WEIGHT', 'DISTANCE') AND {where}
+    UNION ALL
+    SELECT r.ATHLETE_ID, r.EXERCISE_ID, 'REPS', COALESCE(w.VALUE, 0), r.VALUE, r.DATE, r.SESSION_ID
+    FROM WORKOUT_ENTRIES r
+    LEFT JOIN WORKOUT_ENTRIES w
+    ON w.SESSION_ID = r.SESSION_ID AND w.EXERCISE_ID = r.EXERCISE_ID AND w.METRIC = 'WEIGHT'
+    WHERE r.METRIC = 'REPS' AND {where_reps}"""
+sql_create_records_table = """CREATE TABLE IF NOT EXISTS PERSONAL_RECORDS (
+    ID  INTEGER PRIMARY KEY,
+    ATHLETE_ID  INTEGER NOT NULL REFERENCES ATHLETES (ID),
+    EXERCISE_ID INTEGER NOT NULL REFERENCES EXERCISES (ID),
+    KIND    TEXT NOT NULL,
+    AT_WEIGHT   INTEGER NOT NULL DEFAULT 0,
+    VALUE   INTEGER NOT NULL,
+    PREVIOUS    INTEGER,
+    DATE    TEXT NOT NULL,
+    SESSION_ID  INTEGER NOT NULL REFERENCES WORKOUT_SESSIONS (ID)
+)"""
+# The current record of a key is the MAX(VALUE) at the end of IDX_RECORDS_BEST,
+# so checking a save costs one seek per entry in it.
+sql_create_records_indexes = [
+    """CREATE INDEX IF NOT EXISTS IDX_RECORDS_BEST
+    ON PERSONAL_RECORDS (ATHLETE_ID, EXERCISE_ID, KIND, AT_WEIGHT, VALUE)""",
+    """CREATE INDEX IF NOT EXISTS IDX_RECORDS_SESSION
+    ON PERSONAL_RECORDS (SESSION_ID)""",
+]
+record_columns = ["ATHLETE_ID", "EXERCISE_ID", "KIND", "AT_WEIGHT", "VALUE", "PREVIOUS", "DATE", "SESSION_ID"]
+
+
+def create_schema(conn) -> None:
+    """
+    Create the PERSONAL_RECORDS index and backfill it from the existing log.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     create_schema(conn)
+    """
+    conn.execute(sql_create_records_table)
+    for sql in sql_create_records_indexes:
+        conn.execute(sql)
+    rebuild_records(conn)
+
+
+def _id_list(name: str, ids: list) -> tuple:
+    placeholders = ", ".join(f":{name}{i}" for i in range(len(ids)))
+    return f"({placeholders})", {f"{name}{i}": value for i, value in enumerate(ids)}
+
+
+def rebuild_records(conn, athlete_id: int = None, exercise_list=None) -> None:
+    """
+    Rebuild the PERSONAL_RECORDS history from WORKOUT_ENTRIES in one pass.
+
+    The entries that can set a record are read once, in date order, and a
+    running maximum per record key marks every entry that beat everything
+    before it. The first entry of each key is stored with no PREVIOUS value.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    athlete_id : int, optional
+        Only rebuild this athlete's records; every athlete when omitted.
+    exercise_list : iterable, optional
+        Only rebuild the records of these EXERCISES.ID.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     rebuild_records(conn)
+    """
+    where = "ATHLETE_ID = :athlete" if athlete_id is not None else "1"
+    params = {"athlete": athlete_id}
+    if exercise_list is not None:
+        ids, id_params = _id_list("exercise", sorted(exercise_list))
+        where += f" AND EXERCISE_ID IN {ids}"
+        params.update(id_params)
+    conn.execute(f"DELETE FROM PERSONAL_RECORDS WHERE {where}", params)
+    keys = ["ATHLETE_ID", "EXERCISE_ID", "KIND", "AT_WEIGHT"]
+    where_reps = where.replace("ATHLETE_ID", "r.ATHLETE_ID").replace("EXERCISE_ID", "r.EXERCISE_ID")
+    entries = pd.read_sql(
+        sql_candidates.format(where=where, where_reps=where_reps) + " ORDER BY DATE, SESSION_ID",
+        conn,
+        params=params,
+    )
+    groups = [entries[key] for key in keys]
+    best = entries["VALUE"].astype(float).groupby(groups, sort=False).cummax()
+    best_before = best.groupby(groups, sort=False).shift()
+    entries["PREVIOUS"] = best_before
+    records = entries[best_before.isna() | (entries["VALUE"] > best_before)]
+    conn.executemany(
+        f"""INSERT INTO PERSONAL_RECORDS ({", ".join(record_columns)})
+        VALUES ({", ".join("?" * len(record_columns))})""",
+        records[record_columns]
+        .astype(object)
+        .where(records[record_columns].notna(), None)
+        .itertuples(index=False, name=None),
+    )
+
+
+def update_records(conn, session_id: int) -> None:
+    """
+    Add the records set by one saved session to PERSONAL_RECORDS.
+
+    Each entry of the session is compared with the best value stored for its
+    key up to the session's date, so the check costs O(entries in the
+    session) index seeks and never reads the rest of the log. Only values
+    strictly above that best are records; the first value logged for a key
+    starts its history. An exercise that already has records dated after a
+    back-dated session is passed to `rebuild_records` instead, since the new
+    entry can change which of those later values beat everything before them.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection, inside the transaction of the save.
+    session_id : int
+        The WORKOUT_SESSIONS.ID of the session just inserted.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     update_records(conn, insert_workout(conn, "2023-01-05", {"WALK_DISTANCE": 3}))
+    """
+    athlete_id, date = conn.execute(
+        "SELECT ATHLETE_ID, DATE FROM WORKOUT_SESSIONS WHERE ID = ?", (session_id,)
+    ).fetchone()
+    back_dated = [
+        exercise_id
+        for (exercise_id,) in conn.execute(
+            """SELECT DISTINCT e.EXERCISE_ID FROM WORKOUT_ENTRIES e
+            WHERE e.SESSION_ID = :session AND EXISTS (
+                SELECT 1 FROM PERSONAL_RECORDS p
+                WHERE p.ATHLETE_ID = :athlete AND p.EXERCISE_ID = e.EXERCISE_ID AND p.DATE > :date
+            )""",
+            {"session": session_id, "athlete": athlete_id, "date": date},
+        )
+    ]
+    if back_dated:
+        rebuild_records(conn, athlete_id, back_dated)
+    ids, id_params = _id_list("rebuilt", back_dated)
+    conn.execute(
+        f"""INSERT INTO PERSONAL_RECORDS ({", ".join(record_columns)})
+        SELECT * FROM (
+            SELECT
+            c.ATHLETE_ID, c.EXERCISE_ID, c.KIND, c.AT_WEIGHT, c.VALUE,
+            (
+                SELECT MAX(p.VALUE) FROM PERSONAL_RECORDS p
+                WHERE p.ATHLETE_ID = c.ATHLETE_ID AND p.EXERCISE_ID = c.EXERCISE_ID
+                AND p.KIND = c.KIND AND p.AT_WEIGHT = c.AT_WEIGHT AND p.DATE <= c.DATE
+            ) AS PREVIOUS,
+            c.DATE, c.SESSION_ID
+            FROM ({sql_candidates.format(where="SESSION_ID = :session", where_reps="r.SESSION_ID = :session")}) c
+            WHERE c.EXERCISE_ID NOT IN {ids}
+        )
+        WHERE PREVIOUS IS NULL OR VALUE > PREVIOUS""",
+        {"session": session_id, **id_params},
+    )
+
+
+def describe(records: pd.DataFrame) -> pd.Series:
+    """
+    Word PERSONAL_RECORDS rows for people, e.g. "Most reps at 20".
+
+    Parameters
+    ----------
+    records : pandas.DataFrame
+        Rows with the KIND and AT_WEIGHT columns.
+
+    Returns
+    -------
+    pandas.Series
+        One label per row.
+
+    Examples
+    --------
+    >>> describe(read_records(1)).head(1)
+    """
+    labels = records["KIND"].map(record_labels)
+    at_weight = (records["KIND"] == "REPS") & (records["AT_WEIGHT"] > 0)
+    return labels.where(~at_weight, labels + " at " + records["AT_WEIGHT"].astype(str))
+
+
+def session_records(session_id: int) -> list:
+    """
+    Read the records a saved session broke, for the message shown after SAVE.
+
+    Parameters
+    ----------
+    session_id : int
+        The WORKOUT_SESSIONS.ID returned by `workouts.insert_workout`.
+
+    Returns
+    -------
+    list
+        One sentence per broken record, e.g. "Walk, longest walk: 4 (was 3)".
+        First values of a new exercise are not reported.
+
+    Examples
+    --------
+    >>> session_records(42)
+    ['Frontline POW Raise, heaviest weight: 15 (was 12)']
+    """
+    records = database.read_sql(
+        """SELECT EXERCISE_ID, KIND, AT_WEIGHT, VALUE, PREVIOUS FROM PERSONAL_RECORDS
+        WHERE SESSION_ID = :session AND PREVIOUS IS NOT NULL ORDER BY EXERCISE_ID, KIND""",
+        {"session": session_id},
+    )
+    return [
+        f"{exercise_names[exercise_id]}, {label.lower()}: {value} (was {previous})"
+        for exercise_id, label, value, previous in zip(
+            records["EXERCISE_ID"], describe(records), records["VALUE"], records["PREVIOUS"]
+        )
+    ]
+
+
+def read_records(athlete_id: int = DEFAULT_ATHLETE_ID) -> pd.DataFrame:
+    """
+    Build the "Records" table of the WORKOUT DATA tab.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        The athlete whose record history is shown.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Every record the athlete set, newest first, with 'Date', 'Exercise',
+        'Record', 'Value' and 'Previous' (empty for the first value logged).
+
+    Examples
+    --------
+    >>> read_records(1).head()
+    """
+    records = database.read_sql(
+        """SELECT DATE, EXERCISE_ID, KIND, AT_WEIGHT, VALUE, PREVIOUS
+        FROM PERSONAL_RECORDS INDEXED BY IDX_RECORDS_BEST
+        WHERE ATHLETE_ID = :athlete
+        ORDER BY DATE DESC, ID DESC""",
+        {"athlete": athlete_id},
+    )
+    return pd.DataFrame(
+        {
+            "Date": records["DATE"],
+            "Exercise": records["EXERCISE_ID"].map(exercise_names),
+            "Record": describe(records),
+            "Value": records["VALUE"],
+            "Previous": records["PREVIOUS"].astype("Int64").astype(object).where(
+                records["PREVIOUS"].notna(), ""
+            ),
+        }
+    )
@@ -23,16 +23,16 @@ teachers of students with Visual Impairments
 """
 
 import sqlite3
-from sqlite3 import Error
+from pathlib import Path
 
 from nicegui import ui
 
-from appHelpers.helpers import dataBasePath
+from appHelpers import database, migrations
 
 
 def create_connection(db_file):
     """
-    Create a SQLite database connection.
+    Open the shared SQLite writer connection.
     
     Parameters
     ----------
@@ -41,11 +41,12 @@ def create_connection(db_file):
         
     Returns
     -------
-    None
+    sqlite3.Connection
+        The long-lived writer connection managed by `appHelpers.database`.
     
     Raises
     ------
-    Error
+    sqlite3.Error
         If an error occurs while connecting to the database.
         
     Examples
@@ -56,12 +57,13 @@ def create_connection(db_file):
     
     Note
     ----
-    It is recommended to close the database connection after usage by calling the `close` method
-    on the returned connection object.
+    The connection is shared by the whole application and must not be closed by
+    the caller; `appHelpers.database.close_all` closes it at shutdown.
     """
-    conn = None
+    if Path(db_file) != database.db_path():
+        database.configure(db_file)
     try:
-        conn = sqlite3.connect(db_file)
+        conn = database.get_writer()
     except sqlite3.Error as e:
         ui.notify(
             f"SQLite error: {e}",
@@ -70,64 +72,17 @@ def create_connection(db_file):
             close_button="OK",
         )
         raise
-    finally:
-        conn.close()
     return conn
 
-create_connection(dataBasePath)
-
 
-def create_table(conn, sql_create_sql_table):
-    """
-    Create a table in the SQLite database using the provided SQL statement.
-    
-    Parameters
-    ----------
-    conn : sqlite3.Connection
-        The SQLite database connection.
-    sql_create_sql_table : str
-        The SQL statement for creating the table
-        
-    Returns
-    -------
-    None
-    
-    Raises
-    ------
-    Error
-        If an error occurs while executing the SQL statement.
-        
-    Examples
-    --------
-    >>> conn = sqlite3.connect("example.db")
-    >>> create_table(conn, "CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, name TEXT, age INTEGER)")
-    """
-    try:
-        c = conn.cursor()
-        c.execute(sql_create_sql_table)
-        ui.notify(
-            f"Successful Database Connection",
-            position="center",
-            type="positive",
-            close_button="OK",
-            )
-    except sqlite3.Error as e:
-        ui.notify(
-            f"SQLite error: {e}",
-            position="center",
-            type="negative",
-            close_button="OK",
-        )
-    finally:
-        conn.close()
-        
-        
 def implement_tables():
     """
-    Create or initialize the WORKOUTS table in the SQLite database.
+    Create or upgrade the workout and piano tables in the SQLite database.
     
-    This function establishes a connection to the SQLite database, creates a table
-    named WORKOUTS with specified columns, and closes the connection.
+    The schema version stored in the database is compared with the newest entry
+    in `appHelpers.migrations`; when they match nothing else is executed. An
+    older database, including one still holding the original wide WORKOUTS
+    table, is upgraded by running only the migrations it is missing.
     
     Parameters
     ----------
@@ -141,78 +96,8 @@ def implement_tables():
     --------
     >>> implement_tables()
     """
-    sql_create_piano_table = """CREATE TABLE IF NOT EXISTS PIANO ( 
-        ID    INTEGER PRIMARY KEY AUTOINCREMENT,
-        DATE    TEXT,
-        PIANO   INTEGER,
-        LESSON  TEXT,
-        RECITAL TEXT
-    )"""
-    sql_create_workout_table = """CREATE TABLE IF NOT EXISTS WORKOUTS (
-                    "ID"	INTEGER PRIMARY KEY AUTOINCREMENT,
-                    "DATE"	TEXT,
-                    "FRONTLINE_REPS"	INTEGER,
-                    "FRONTLINE_SETS"	INTEGER,
-                    "FRONTLINE_WEIGHT"	INTEGER,
-                    "SHOULDERZPRESS_REPS"	INTEGER,
-                    "SHOULDERZPRESS_SETS"	INTEGER,
-                    "SHOULDERZPRESS_WEIGHT"	INTEGER,
-                    "ELBOWOUTROW_REPS"	INTEGER,
-                    "ELBOWOUTROW_SETS"	INTEGER,
-                    "ELBOWOUTROW_WEIGHT"	INTEGER,
-                    "SUPINEBICEPCURL_REPS"	INTEGER,
-                    "SUPINEBICEPCURL_SETS"	INTEGER,
-                    "SUPINEBICEPCURL_WEIGHT"	INTEGER,
-                    "CLOSEGRIPPUSHUP_REPS"	INTEGER,
-                    "CLOSEGRIPPUSHUP_SETS"	INTEGER,
-                    "CLOSEGRIPPUSHUP_STAIR"	INTEGER,
-                    "REARDELTFLY_REPS"	INTEGER,
-                    "REARDELTFLY_SETS"	INTEGER,
-                    "REARDELTFLY_WEIGHT"	INTEGER,
-                    "SIDEBEND_REPS"	INTEGER,
-                    "SIDEBEND_SETS"	INTEGER,
-                    "SIDEBEND_WEIGHT"	INTEGER,
-                    "LATERALRAISE_REPS"	INTEGER,
-                    "LATERALRAISE_SETS"	INTEGER,
-                    "LATERALRAISE_WEIGHT"	INTEGER,
-                    "STIFFLEGRDL_REPS"	INTEGER,
-                    "STIFFLEGRDL_SETS"	INTEGER,
-                    "STIFFLEGRDL_WEIGHT"	INTEGER,
-                    "SLIDERHAMSTRINGCURL_REPS"	INTEGER,
-                    "SLIDERHAMSTRINGCURL_SETS"	INTEGER,
-                    "SLIDERHAMSTRINGCURL_WEIGHT"	INTEGER,
-                    "HIPTHRUSTER_REPS"	INTEGER,
-                    "HIPTHRUSTER_SETS"	INTEGER,
-                    "HIPTHRUSTER_WEIGHT"	INTEGER,
-                    "FORWARDSQUAT_REPS"	INTEGER,
-                    "FORWARDSQUAT_SETS"	INTEGER,
-                    "FORWARDSQUAT_WEIGHT"	INTEGER,
-                    "SUMOSQUAT_REPS"	INTEGER,
-                    "SUMOSQUAT_SETS"	INTEGER,
-                    "SUMOSQUAT_WEIGHT"	INTEGER,
-                    "CYCLISTSQUAT_REPS"	INTEGER,
-                    "CYCLISTSQUAT_SETS"	INTEGER,
-                    "CYCLISTSQUAT_WEIGHT"	INTEGER,
-                    "SINGLELEGCALFRAISE_REPS"	INTEGER,
-                    "SINGLELEGCALFRAISE_SETS"	INTEGER,
-                    "SINGLELEGCALFRAISE_WEIGHT"	INTEGER,
-                    "LONGLEVERCRUNCHES_REPS"	INTEGER,
-                    "LONGLEVERCRUNCHES_SETS"	INTEGER,
-                    "LONGLEVERCRUNCHES_WEIGHT"	INTEGER,
-                    "SIDELINESCULPT"	INTEGER,
-                    "SIDELINESCULPT_WEIGHT"	INTEGER,
-                    "ABDOMINALS"	INTEGER,
-                    "ABDOMINALS_WEIGHT"	INTEGER,
-                    "WALK_DISTANCE"	INTEGER,
-                    "WALK"	INTEGER,
-                )"""
-                
-    conn = sqlite3.connect(dataBasePath)
     try:
-        if conn is not None:
-            create_table(conn, sql_create_workout_table)
-        else:
-            print("Error! cannot create the database connection.")
+        applied = migrations.migrate()
     except sqlite3.Error as e:
         ui.notify(
             f"SQLite error: {e}",
@@ -220,24 +105,12 @@ def implement_tables():
             type="negative",
             close_button="OK",
         )
-        
-    try:
-        if conn is not None:
-            create_table(conn, sql_create_piano_table)
-        else:
-            print('Error! cannot create the database connection.')
-    except sqlite3.Error as e:
+        return
+
+    if applied:
         ui.notify(
-            f"SQLite error: {e}",
+            "SQL Tables Successfully Created",
             position="center",
-            type="negative",
+            type="positive",
             close_button="OK",
         )
-        
-    conn.close()
-    ui.notify(
-        "SQL Tables Successfully Created",
-        position="center",
-        type="positive",
-        close_button="OK",
-    )
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from appHelpers import database
+from appHelpers.athletes import DEFAULT_ATHLETE_ID
+from appHelpers.exercises import exercises
+
+# Activities are tracked per exercise, per body region (walking is already an
+# exercise of its own) and for piano practice.
+exercise_subjects = {
+    i + 1: [("exercise", key), ("region", region)] if region != "walk" else [("exercise", key)]
+    for i, (key, _, region) in enumerate(exercises)
+}
+piano_subject = ("piano", "PIANO")
+# Labels in the order the dashboard lists the activities.
+subject_labels = {
+    piano_subject: "Piano",
+    ("region", "upper"): "Upper body",
+    ("region", "lower"): "Lower body",
+    ("region", "abs"): "Core",
+    **{("exercise", key): name for key, name, _ in exercises},
+    ("exercise", "WALK"): "Walking",
+}
+subject_order = {subject: i for i, subject in enumerate(subject_labels)}
+# Rest days allowed between two active days before a streak breaks; matches
+# the cadence of the Days_Since_Last badges (weekly exercises, daily piano).
+streak_rest_days = {"exercise": 7, "region": 3, "piano": 1}
+# Adherence is the share of days with activity over each of these windows.
+adherence_windows = (7, 28, 90)
+
+sql_create_activity_table = """CREATE TABLE IF NOT EXISTS ACTIVITY_DAYS (
+    ATHLETE_ID  INTEGER NOT NULL REFERENCES ATHLETES (ID),
+    KIND    TEXT NOT NULL,
+    NAME    TEXT NOT NULL,
+    DATE    TEXT NOT NULL,
+    PRIMARY KEY (ATHLETE_ID, KIND, NAME, DATE)
+) WITHOUT ROWID"""
+sql_create_activity_indexes = [
+    """CREATE INDEX IF NOT EXISTS IDX_ACTIVITY_ATHLETE_DATE
+    ON ACTIVITY_DAYS (ATHLETE_ID, DATE)""",
+]
+sql_create_streak_table = """CREATE TABLE IF NOT EXISTS STREAK_STATE (
+    ATHLETE_ID  INTEGER NOT NULL REFERENCES ATHLETES (ID),
+    KIND    TEXT NOT NULL,
+    NAME    TEXT NOT NULL,
+    LAST_DATE   TEXT NOT NULL,
+    CURRENT_STREAK  INTEGER NOT NULL,
+    LONGEST_STREAK  INTEGER NOT NULL,
+    PRIMARY KEY (ATHLETE_ID, KIND, NAME)
+) WITHOUT ROWID"""
+# Every day on which an athlete did something, from the logs themselves.
+sql_activity_sources = """SELECT DISTINCT e.ATHLETE_ID, 'exercise', x.NAME, e.DATE
+    FROM WORKOUT_ENTRIES e JOIN EXERCISES x ON x.ID = e.EXERCISE_ID
+    WHERE e.METRIC != 'WEIGHT' AND {where}
+    UNION
+    SELECT DISTINCT e.ATHLETE_ID, 'region', x.REGION, e.DATE
+    FROM WORKOUT_ENTRIES e JOIN EXERCISES x ON x.ID = e.EXERCISE_ID
+    WHERE e.METRIC != 'WEIGHT' AND x.REGION != 'walk' AND {where}
+    UNION
+    SELECT DISTINCT ATHLETE_ID, 'piano', 'PIANO', DATE
+    FROM PIANO WHERE PIANO IS NOT NULL AND PIANO != 0 AND {where_piano}"""
+sql_upsert_streak = """INSERT INTO STREAK_STATE
+    (ATHLETE_ID, KIND, NAME, LAST_DATE, CURRENT_STREAK, LONGEST_STREAK)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (ATHLETE_ID, KIND, NAME) DO UPDATE SET
+    LAST_DATE = excluded.LAST_DATE,
+    CURRENT_STREAK = excluded.CURRENT_STREAK,
+    LONGEST_STREAK = excluded.LONGEST_STREAK"""
+
+
+def streaks(days: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduce activity days to one STREAK_STATE row per athlete and activity.
+
+    A new streak starts at an activity's first day and after every gap longer
+    than its `streak_rest_days`. Runs are numbered with one cumulative sum
+    over the whole frame, so all activities are handled in a single pass.
+
+    Parameters
+    ----------
+    days : pandas.DataFrame
+        ATHLETE_ID, KIND, NAME and DATE, one row per active day, sorted by
+        athlete, activity and date.
+
+    Returns
+    -------
+    pandas.DataFrame
+        ATHLETE_ID, KIND, NAME, LAST_DATE, CURRENT_STREAK (active days in the
+        streak that ends on LAST_DATE) and LONGEST_STREAK.
+
+    Examples
+    --------
+    >>> streaks(pd.DataFrame({"ATHLETE_ID": [1, 1], "KIND": ["piano"] * 2,
+    ...     "NAME": ["PIANO"] * 2, "DATE": ["2023-01-05", "2023-01-06"]}))
+    """
+    keys = ["ATHLETE_ID", "KIND", "NAME"]
+    if len(days) == 0:
+        return pd.DataFrame(columns=keys + ["LAST_DATE", "CURRENT_STREAK", "LONGEST_STREAK"])
+    day_codes, dates = pd.factorize(days["DATE"])
+    day = (pd.to_datetime(dates, format="ISO8601") - pd.Timestamp(0)).days.to_numpy()[day_codes]
+    subject = days[keys]
+    new_subject = np.ones(len(days), dtype=bool)
+    new_subject[1:] = (subject.iloc[1:].to_numpy() != subject.iloc[:-1].to_numpy()).any(axis=1)
+    allowed = days["KIND"].map(streak_rest_days).to_numpy() + 1
+    new_run = new_subject.copy()
+    new_run[1:] |= np.diff(day) > allowed[1:]
+    run = np.cumsum(new_run) - 1
+    run_length = np.bincount(run)
+    starts = np.flatnonzero(new_subject)
+    ends = np.append(starts[1:], len(days)) - 1
+    return pd.DataFrame(
+        {
+            "ATHLETE_ID": days["ATHLETE_ID"].to_numpy()[starts],
+            "KIND": days["KIND"].to_numpy()[starts],
+            "NAME": days["NAME"].to_numpy()[starts],
+            "LAST_DATE": days["DATE"].to_numpy()[ends],
+            "CURRENT_STREAK": run_length[run[ends]],
+            "LONGEST_STREAK": np.maximum.reduceat(run_length[run], starts),
+        }
+    )
+
+
+def create_schema(conn) -> None:
+    """
+    Create ACTIVITY_DAYS and STREAK_STATE and fill them from the existing logs.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     create_schema(conn)
+    """
+    conn.execute(sql_create_activity_table)
+    for sql in sql_create_activity_indexes:
+        conn.execute(sql)
+    conn.execute(sql_create_streak_table)
+    rebuild_streaks(conn)
+
+
+def rebuild_streaks(conn, athlete_id: int = None) -> None:
+    """
+    Recompute ACTIVITY_DAYS and STREAK_STATE from the workout and piano logs.
+
+    The active days are collected in one INSERT ... SELECT, read back once in
+    order and summarised in one vectorized pass by `streaks`.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    athlete_id : int, optional
+        Only rebuild this athlete's rows; every athlete when omitted.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     rebuild_streaks(conn)
+    """
+    where = "ATHLETE_ID = :athlete" if athlete_id is not None else "1"
+    params = {"athlete": athlete_id}
+    conn.execute(f"DELETE FROM ACTIVITY_DAYS WHERE {where}", params)
+    conn.execute(f"DELETE FROM STREAK_STATE WHERE {where}", params)
+    conn.execute(
+        "INSERT INTO ACTIVITY_DAYS (ATHLETE_ID, KIND, NAME, DATE) "
+        + sql_activity_sources.format(
+            where=where.replace("ATHLETE_ID", "e.ATHLETE_ID"), where_piano=where
+        ),
+        params,
+    )
+    days = pd.read_sql(
+        f"""SELECT ATHLETE_ID, KIND, NAME, DATE FROM ACTIVITY_DAYS
+        WHERE {where} ORDER BY ATHLETE_ID, KIND, NAME, DATE""",
+        conn,
+        params=params,
+    )
+    conn.executemany(
+        sql_upsert_streak, streaks(days).astype(object).itertuples(index=False, name=None)
+    )
+
+
+def record_activity(conn, athlete_id: int, date: str, subjects) -> None:
+    """
+    Add one day of activity and extend the affected streaks.
+
+    A day later than an activity's last one only needs its stored state: the
+    streak grows by one, or restarts after too long a rest. A back-dated day
+    can join two streaks, so that activity alone is recomputed from its days.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection, inside the transaction of the save.
+    athlete_id : int
+        The athlete who was active.
+    date : str
+        The day, as 'YYYY-MM-DD'.
+    subjects : iterable of tuple
+        (KIND, NAME) pairs, e.g. ("exercise", "WALK") or `piano_subject`.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     record_activity(conn, 1, "2023-01-05", [piano_subject])
+    """
+    for kind, name in subjects:
+        added = conn.execute(
+            "INSERT OR IGNORE INTO ACTIVITY_DAYS (ATHLETE_ID, KIND, NAME, DATE) VALUES (?, ?, ?, ?)",
+            (athlete_id, kind, name, date),
+        ).rowcount
+        if not added:
+            continue
+        state = conn.execute(
+            """SELECT LAST_DATE, CURRENT_STREAK, LONGEST_STREAK FROM STREAK_STATE
+            WHERE ATHLETE_ID = ? AND KIND = ? AND NAME = ?""",
+            (athlete_id, kind, name),
+        ).fetchone()
+        if state is None:
+            row = (athlete_id, kind, name, date, 1, 1)
+        elif date > state[0]:
+            rest = (datetime.date.fromisoformat(date) - datetime.date.fromisoformat(state[0])).days
+            current = state[1] + 1 if rest <= streak_rest_days[kind] + 1 else 1
+            row = (athlete_id, kind, name, date, current, max(current, state[2]))
+        else:
+            days = pd.read_sql(
+                """SELECT ATHLETE_ID, KIND, NAME, DATE FROM ACTIVITY_DAYS
+                WHERE ATHLETE_ID = ? AND KIND = ? AND NAME = ? ORDER BY DATE""",
+                conn,
+                params=(athlete_id, kind, name),
+            )
+            row = next(streaks(days).astype(object).itertuples(index=False, name=None))
+        conn.execute(sql_upsert_streak, row)
+
+
+def read_streaks(
+    athlete_id: int = DEFAULT_ATHLETE_ID, windows: tuple = adherence_windows
+) -> pd.DataFrame:
+    """
+    Build the "Streaks and Adherence" card of the dashboard.
+
+    The streaks are read from STREAK_STATE and the adherence from the last
+    `max(windows)` days of ACTIVITY_DAYS through IDX_ACTIVITY_ATHLETE_DATE, so
+    the cost does not depend on the length of the logs.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        The athlete whose activities are shown.
+    windows : tuple of int, optional
+        The adherence windows in days, ending today.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per activity the athlete has done, piano and body regions
+        first, with 'Activity', 'Current_Streak' (0 once the allowed rest is
+        over), 'Longest_Streak' and an 'Adherence_<n>d' percentage per window.
+
+    Examples
+    --------
+    >>> read_streaks(1, windows=(7, 30))
+    """
+    today = datetime.date.today()
+    since = {n: (today - datetime.timedelta(days=n - 1)).isoformat() for n in windows}
+    state = database.read_sql(
+        """SELECT KIND, NAME, LAST_DATE, CURRENT_STREAK, LONGEST_STREAK
+        FROM STREAK_STATE WHERE ATHLETE_ID = :athlete""",
+        {"athlete": athlete_id},
+    )
+    counts = database.read_sql(
+        f"""SELECT KIND, NAME,
+        {", ".join(f"SUM(DATE >= :since_{n}) AS D{n}" for n in windows)}
+        FROM ACTIVITY_DAYS INDEXED BY IDX_ACTIVITY_ATHLETE_DATE
+        WHERE ATHLETE_ID = :athlete AND DATE >= :since
+        GROUP BY KIND, NAME""",
+        {
+            "athlete": athlete_id,
+            "since": min(since.values()),
+            **{f"since_{n}": day for n, day in since.items()},
+        },
+    )
+    state = state.merge(counts, on=["KIND", "NAME"], how="left")
+    subjects = list(zip(state["KIND"], state["NAME"]))
+    rest = (pd.Timestamp(today) - pd.to_datetime(state["LAST_DATE"], format="ISO8601")).dt.days
+    allowed = state["KIND"].map(streak_rest_days) + 1
+    card = pd.DataFrame(
+        {
+            "Activity": [subject_labels[subject] for subject in subjects],
+            "Current_Streak": state["CURRENT_STREAK"].where(rest <= allowed, 0),
+            "Longest_Streak": state["LONGEST_STREAK"],
+            **{
+                f"Adherence_{n}d": (100 * state[f"D{n}"].astype(float).fillna(0) / n).round().astype(int)
+                for n in windows
+            },
+        }
+    )
+    order = np.argsort([subject_order[subject] for subject in subjects], kind="stable")
+    return card.iloc[order].reset_index(drop=True)
@@ -0,0 +1,831 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import math
+
+import pandas as pd
+
+from appHelpers import activity, database, progression, records, streaks
+from appHelpers.athletes import DEFAULT_ATHLETE_ID
+from appHelpers.exercises import column_index, column_labels, exercise_ids, exercises
+from appHelpers.helpers import iso_date
+
+MIGRATION_CHUNK_SIZE = 5000
+
+# Metrics holding an exercise's working level; each exercise has at most one.
+level_metrics = ("WEIGHT", "STAIR", "DISTANCE")
+level_columns = {
+    exercise_id: column
+    for column, (exercise_id, metric) in column_index.items()
+    if metric in level_metrics
+}
+
+sql_create_exercises_table = """CREATE TABLE IF NOT EXISTS EXERCISES (
+    ID  INTEGER PRIMARY KEY,
+    NAME    TEXT NOT NULL UNIQUE,
+    DISPLAY_NAME    TEXT NOT NULL,
+    REGION  TEXT NOT NULL
+)"""
+sql_create_sessions_table = """CREATE TABLE IF NOT EXISTS WORKOUT_SESSIONS (
+    ID  INTEGER PRIMARY KEY AUTOINCREMENT,
+    DATE    TEXT
+)"""
+sql_create_entries_table = """CREATE TABLE IF NOT EXISTS WORKOUT_ENTRIES (
+    SESSION_ID  INTEGER NOT NULL REFERENCES WORKOUT_SESSIONS (ID),
+    DATE    TEXT,
+    EXERCISE_ID INTEGER NOT NULL REFERENCES EXERCISES (ID),
+    METRIC  TEXT NOT NULL,
+    VALUE   INTEGER NOT NULL,
+    PRIMARY KEY (SESSION_ID, EXERCISE_ID, METRIC)
+) WITHOUT ROWID"""
+sql_create_entries_indexes = [
+    """CREATE INDEX IF NOT EXISTS IDX_ENTRIES_EXERCISE_DATE
+    ON WORKOUT_ENTRIES (EXERCISE_ID, METRIC, DATE)""",
+    """CREATE INDEX IF NOT EXISTS IDX_ENTRIES_DATE
+    ON WORKOUT_ENTRIES (DATE)""",
+]
+sql_create_sessions_indexes = [
+    """CREATE INDEX IF NOT EXISTS IDX_SESSIONS_DATE
+    ON WORKOUT_SESSIONS (DATE)""",
+]
+# The indexes above are dropped again by the athlete migration, which replaces
+# them with these; they stay defined for the migrations that created them.
+sql_create_athlete_indexes = [
+    """CREATE INDEX IF NOT EXISTS IDX_SESSIONS_ATHLETE_DATE
+    ON WORKOUT_SESSIONS (ATHLETE_ID, DATE)""",
+    """CREATE INDEX IF NOT EXISTS IDX_ENTRIES_ATHLETE_EXERCISE_DATE
+    ON WORKOUT_ENTRIES (ATHLETE_ID, EXERCISE_ID, METRIC, DATE)""",
+]
+sql_create_state_table = """CREATE TABLE IF NOT EXISTS EXERCISE_STATE (
+    ATHLETE_ID  INTEGER NOT NULL REFERENCES ATHLETES (ID),
+    EXERCISE_ID INTEGER NOT NULL REFERENCES EXERCISES (ID),
+    LAST_DATE   TEXT,
+    LAST_REPS   INTEGER,
+    LAST_SETS   INTEGER,
+    LAST_LEVEL  INTEGER,
+    LEVEL_DATE  TEXT,
+    PRIMARY KEY (ATHLETE_ID, EXERCISE_ID)
+) WITHOUT ROWID"""
+# EXERCISE_STATE is kept current by these triggers inside the same transaction
+# as every WORKOUT_ENTRIES insert. Rows are only overwritten by entries dated on
+# or after the stored date, so back-dated saves and imports cannot regress it.
+# The first entry of an athlete and exercise creates the row.
+sql_create_state_triggers = [
+    """CREATE TRIGGER IF NOT EXISTS TRG_STATE_PERFORMED
+    AFTER INSERT ON WORKOUT_ENTRIES
+    WHEN NEW.METRIC IN ('REPS', 'DONE')
+    BEGIN
+        INSERT INTO EXERCISE_STATE (ATHLETE_ID, EXERCISE_ID, LAST_DATE, LAST_REPS)
+        VALUES (NEW.ATHLETE_ID, NEW.EXERCISE_ID, NEW.DATE, NEW.VALUE)
+        ON CONFLICT (ATHLETE_ID, EXERCISE_ID) DO UPDATE
+        SET LAST_DATE = excluded.LAST_DATE, LAST_REPS = excluded.LAST_REPS
+        WHERE LAST_DATE IS NULL OR excluded.LAST_DATE >= LAST_DATE;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS TRG_STATE_SETS
+    AFTER INSERT ON WORKOUT_ENTRIES
+    WHEN NEW.METRIC = 'SETS'
+    BEGIN
+        INSERT INTO EXERCISE_STATE (ATHLETE_ID, EXERCISE_ID, LAST_SETS)
+        VALUES (NEW.ATHLETE_ID, NEW.EXERCISE_ID, NEW.VALUE)
+        ON CONFLICT (ATHLETE_ID, EXERCISE_ID) DO UPDATE
+        SET LAST_SETS = excluded.LAST_SETS
+        WHERE LAST_DATE IS NULL OR NEW.DATE >= LAST_DATE;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS TRG_STATE_LEVEL
+    AFTER INSERT ON WORKOUT_ENTRIES
+    WHEN NEW.METRIC IN ('WEIGHT', 'STAIR', 'DISTANCE')
+    BEGIN
+        INSERT INTO EXERCISE_STATE (ATHLETE_ID, EXERCISE_ID, LEVEL_DATE, LAST_LEVEL)
+        VALUES (NEW.ATHLETE_ID, NEW.EXERCISE_ID, NEW.DATE, NEW.VALUE)
+        ON CONFLICT (ATHLETE_ID, EXERCISE_ID) DO UPDATE
+        SET LEVEL_DATE = excluded.LEVEL_DATE, LAST_LEVEL = excluded.LAST_LEVEL
+        WHERE LEVEL_DATE IS NULL OR excluded.LEVEL_DATE >= LEVEL_DATE;
+    END""",
+]
+sql_insert_entry = """INSERT INTO WORKOUT_ENTRIES (
+    SESSION_ID,
+    ATHLETE_ID,
+    DATE,
+    EXERCISE_ID,
+    METRIC,
+    VALUE
+    )
+    VALUES (?, ?, ?, ?, ?, ?)"""
+
+
+def _pivot_columns() -> str:
+    return ",\n".join(
+        f"""    COALESCE(MAX(CASE WHEN e.EXERCISE_ID = {exercise_id} AND e.METRIC = '{metric}'"""
+        f""" THEN e.VALUE END), 0) AS "{column}\""""
+        for column, (exercise_id, metric) in column_index.items()
+    )
+
+
+def workouts_view_sql() -> str:
+    """
+    Build the compatibility view that presents WORKOUT_ENTRIES in the wide layout.
+
+    The view is named WORKOUTS and has exactly the columns of the original
+    55-column table, so `SELECT * FROM WORKOUTS` keeps working for the pages and
+    for old exports. Exercises that were not logged in a session read as 0.
+
+    Returns
+    -------
+    str
+        The CREATE VIEW statement.
+
+    Examples
+    --------
+    >>> conn.execute(workouts_view_sql())
+    """
+    return f"""CREATE VIEW IF NOT EXISTS WORKOUTS AS
+    SELECT
+    s.ID AS "ID",
+    s.DATE AS "DATE",
+{_pivot_columns()}
+    FROM WORKOUT_SESSIONS s
+    LEFT JOIN WORKOUT_ENTRIES e ON e.SESSION_ID = s.ID
+    GROUP BY s.ID"""
+
+
+def create_schema(conn) -> None:
+    """
+    Create the normalized workout tables and seed the exercise dimension.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     create_schema(conn)
+    """
+    conn.execute(sql_create_exercises_table)
+    conn.execute(sql_create_sessions_table)
+    conn.execute(sql_create_entries_table)
+    for sql in sql_create_entries_indexes:
+        conn.execute(sql)
+    conn.executemany(
+        "INSERT OR IGNORE INTO EXERCISES (ID, NAME, DISPLAY_NAME, REGION) VALUES (?, ?, ?, ?)",
+        [
+            (exercise_ids[key], key, display_name, region)
+            for key, display_name, region in exercises
+        ],
+    )
+
+
+def create_state_schema(conn) -> None:
+    """
+    Create the per-athlete EXERCISE_STATE summary table and its triggers.
+
+    The table is filled from the existing entries, so this is safe to run on a
+    log that already holds data.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     create_state_schema(conn)
+    """
+    conn.execute(sql_create_state_table)
+    for sql in sql_create_state_triggers:
+        conn.execute(sql)
+    rebuild_exercise_state(conn)
+
+
+def _object_type(conn, name: str):
+    row = conn.execute(
+        "SELECT type FROM sqlite_master WHERE name = ?", (name,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _copy_chunk(conn, chunk_size: int) -> int:
+    """
+    Copy the next block of wide WORKOUTS rows into the normalized tables.
+
+    Sessions keep the ID of the row they came from, so the highest session ID
+    is the resume point after an interrupted migration. Zero and NULL cells are
+    skipped.
+
+    Returns
+    -------
+    int
+        The number of wide rows copied; 0 once the table is exhausted.
+    """
+    start = conn.execute("SELECT COALESCE(MAX(ID), 0) FROM WORKOUT_SESSIONS").fetchone()[0]
+    stop = conn.execute(
+        "SELECT MAX(ID) FROM (SELECT ID FROM WORKOUTS WHERE ID > ? ORDER BY ID LIMIT ?)",
+        (start, chunk_size),
+    ).fetchone()[0]
+    if stop is None:
+        return 0
+    legacy_columns = {row[1] for row in conn.execute("PRAGMA table_info(WORKOUTS)")}
+    moved = conn.execute(
+        "INSERT INTO WORKOUT_SESSIONS (ID, DATE) SELECT ID, DATE FROM WORKOUTS WHERE ID > ? AND ID <= ?",
+        (start, stop),
+    ).rowcount
+    for column, (exercise_id, metric) in column_index.items():
+        if column not in legacy_columns:
+            continue
+        conn.execute(
+            f"""INSERT INTO WORKOUT_ENTRIES (SESSION_ID, DATE, EXERCISE_ID, METRIC, VALUE)
+            SELECT ID, DATE, ?, ?, "{column}" FROM WORKOUTS
+            WHERE ID > ? AND ID <= ? AND "{column}" IS NOT NULL AND "{column}" != 0""",
+            (exercise_id, metric, start, stop),
+        )
+    return moved
+
+
+def migrate_wide_table(chunk_size: int = MIGRATION_CHUNK_SIZE) -> None:
+    """
+    Move the wide WORKOUTS table into WORKOUT_SESSIONS / WORKOUT_ENTRIES.
+
+    The copy runs in chunks of `chunk_size` rows, each committed in its own
+    transaction, so an interrupted migration picks up where it stopped on the
+    next start. Once every row is copied the old table is renamed to
+    WORKOUTS_LEGACY and the WORKOUTS compatibility view is created in its place.
+    On a database that never had the wide table only the view is created.
+
+    Parameters
+    ----------
+    chunk_size : int, optional
+        The number of wide rows copied per transaction.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> migrate_wide_table()
+    """
+    while True:
+        with database.writer() as conn:
+            if _object_type(conn, "WORKOUTS") != "table":
+                break
+            if _copy_chunk(conn, chunk_size) == 0:
+                conn.execute("ALTER TABLE WORKOUTS RENAME TO WORKOUTS_LEGACY")
+                break
+    with database.writer() as conn:
+        conn.execute(workouts_view_sql())
+
+
+def performed_exercises(values: dict) -> set:
+    """
+    Find the exercises a session actually logged.
+
+    A WEIGHT alone does not count: the form prefills it from the current
+    level, so it is only the load of sets that were done.
+
+    Parameters
+    ----------
+    values : dict
+        Wide WORKOUTS column names mapped to the logged values.
+
+    Returns
+    -------
+    set
+        The EXERCISES.ID of every exercise with a nonzero value other than
+        its weight.
+
+    Examples
+    --------
+    >>> performed_exercises({"FRONTLINE_WEIGHT": 20, "WALK": 1})
+    {19}
+    """
+    return {
+        column_index[column][0]
+        for column, value in values.items()
+        if value and column_index[column][1] != "WEIGHT"
+    }
+
+
+def form_defaults(levels: dict) -> dict:
+    """
+    Return what each input of the workout form saves when it is left empty.
+
+    The WEIGHT inputs show the current level as their placeholder and save it;
+    every other input saves 0.
+
+    Parameters
+    ----------
+    levels : dict
+        As returned by `current_levels`.
+
+    Returns
+    -------
+    dict
+        Every wide WORKOUTS column name mapped to its default value.
+
+    Examples
+    --------
+    >>> form_defaults({"FRONTLINE_WEIGHT": 15})["FRONTLINE_WEIGHT"]
+    15
+    """
+    return {
+        column: levels.get(column, 0) if metric == "WEIGHT" else 0
+        for column, (_, metric) in column_index.items()
+    }
+
+
+def session_values(form: dict, defaults: dict) -> dict:
+    """
+    Turn the workout form state into the values of one session.
+
+    Parameters
+    ----------
+    form : dict
+        Wide WORKOUTS column names mapped to the input values; None for an
+        input that was left empty.
+    defaults : dict
+        As returned by `form_defaults`.
+
+    Returns
+    -------
+    dict
+        Every wide WORKOUTS column name mapped to an int, empty inputs taking
+        their default and fractions rounded up.
+
+    Examples
+    --------
+    >>> session_values({"FRONTLINE_REPS": 11.5}, form_defaults({}))["FRONTLINE_REPS"]
+    12
+    """
+    return {
+        column: int(math.ceil(defaults[column] if form.get(column) is None else form[column]))
+        for column in column_index
+    }
+
+
+def insert_workout(
+    conn, date, values: dict, athlete_id: int = DEFAULT_ATHLETE_ID
+) -> int:
+    """
+    Store one workout session in the normalized tables.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    date : str, datetime.date or datetime.datetime
+        The workout date; it is stored as 'YYYY-MM-DD'.
+    values : dict
+        Wide WORKOUTS column names mapped to the logged values. Zero and empty
+        values are not stored, and neither is a WEIGHT for an exercise with no
+        other value in the session, so a weight prefilled from the current
+        level is only logged with the sets it was lifted for. The
+        PROGRESSION_STATE rows of the exercises logged, the PERSONAL_RECORDS
+        index, the streaks and the calendar are updated in the same
+        transaction.
+    athlete_id : int, optional
+        The athlete the session belongs to.
+
+    Returns
+    -------
+    int
+        The ID of the new session, which is also its WORKOUTS.ID.
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     insert_workout(conn, "2023-01-05", {"FRONTLINE_REPS": 12, "WALK": 1})
+    """
+    date = iso_date(date)
+    performed = performed_exercises(values)
+    session_id = conn.execute(
+        "INSERT INTO WORKOUT_SESSIONS (ATHLETE_ID, DATE) VALUES (?, ?)",
+        (athlete_id, date),
+    ).lastrowid
+    conn.executemany(
+        sql_insert_entry,
+        [
+            (session_id, athlete_id, date, *column_index[column], value)
+            for column, value in values.items()
+            if value
+            and (column_index[column][1] != "WEIGHT" or column_index[column][0] in performed)
+        ],
+    )
+    progression.update_progression_state(conn, athlete_id, performed)
+    records.update_records(conn, session_id)
+    streaks.record_activity(
+        conn,
+        athlete_id,
+        date,
+        {subject for exercise_id in performed for subject in streaks.exercise_subjects[exercise_id]},
+    )
+    activity.record_session(conn, session_id)
+    return session_id
+
+
+def rebuild_exercise_state(conn, athlete_id: int = None) -> None:
+    """
+    Recompute the EXERCISE_STATE rows from WORKOUT_ENTRIES.
+
+    There is one row per athlete and exercise that has entries. Each value is
+    a single lookup on IDX_ENTRIES_ATHLETE_EXERCISE_DATE, so the rebuild costs
+    O(#rows) index seeks rather than a scan of the log per row.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    athlete_id : int, optional
+        Only rebuild this athlete's rows; every athlete when omitted.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> with database.writer() as conn:
+    ...     rebuild_exercise_state(conn)
+    """
+    where = "ATHLETE_ID = :athlete" if athlete_id is not None else "1"
+    params = {"athlete": athlete_id}
+    conn.execute(f"DELETE FROM EXERCISE_STATE WHERE {where}", params)
+    conn.execute(
+        f"""INSERT INTO EXERCISE_STATE (
+            ATHLETE_ID, EXERCISE_ID, LAST_DATE, LAST_REPS, LAST_SETS, LEVEL_DATE, LAST_LEVEL
+        )
+        SELECT
+        k.ATHLETE_ID,
+        k.EXERCISE_ID,
+        (
+            SELECT MAX(e.DATE) FROM WORKOUT_ENTRIES e
+            WHERE e.ATHLETE_ID = k.ATHLETE_ID AND e.EXERCISE_ID = k.EXERCISE_ID
+            AND e.METRIC IN ('REPS', 'DONE')
+        ),
+        (
+            SELECT e.VALUE FROM WORKOUT_ENTRIES e
+            WHERE e.ATHLETE_ID = k.ATHLETE_ID AND e.EXERCISE_ID = k.EXERCISE_ID
+            AND e.METRIC IN ('REPS', 'DONE')
+            ORDER BY e.DATE DESC, e.SESSION_ID DESC LIMIT 1
+        ),
+        (
+            SELECT e.VALUE FROM WORKOUT_ENTRIES e
+            WHERE e.ATHLETE_ID = k.ATHLETE_ID AND e.EXERCISE_ID = k.EXERCISE_ID
+            AND e.METRIC = 'SETS'
+            ORDER BY e.DATE DESC, e.SESSION_ID DESC LIMIT 1
+        ),
+        (
+            SELECT MAX(e.DATE) FROM WORKOUT_ENTRIES e
+            WHERE e.ATHLETE_ID = k.ATHLETE_ID AND e.EXERCISE_ID = k.EXERCISE_ID
+            AND e.METRIC IN ('WEIGHT', 'STAIR', 'DISTANCE')
+        ),
+        (
+            SELECT e.VALUE FROM WORKOUT_ENTRIES e
+            WHERE e.ATHLETE_ID = k.ATHLETE_ID AND e.EXERCISE_ID = k.EXERCISE_ID
+            AND e.METRIC IN ('WEIGHT', 'STAIR', 'DISTANCE')
+            ORDER BY e.DATE DESC, e.SESSION_ID DESC LIMIT 1
+        )
+        FROM (
+            SELECT DISTINCT ATHLETE_ID, EXERCISE_ID FROM WORKOUT_ENTRIES WHERE {where}
+        ) k""",
+        params,
+    )
+
+
+def select_workouts(
+    athlete_id: int = None, start=None, end=None, newest_first: bool = True
+) -> tuple:
+    """
+    Build the query for sessions in the wide WORKOUTS layout.
+
+    For one athlete the sessions are read through IDX_SESSIONS_ATHLETE_DATE in
+    date order, so neither the date range nor the GROUP BY reads or sorts other
+    athletes' sessions. Without an athlete the whole log is read in ID order.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        Only read this athlete's sessions; every athlete when omitted.
+    start, end : date or str, optional
+        The first and last day to include; the whole log when omitted.
+    newest_first : bool, optional
+        Whether to return the latest session first.
+
+    Returns
+    -------
+    tuple
+        The SQL text and its named parameters. The columns are those of the
+        WORKOUTS view followed by ATHLETE_ID.
+
+    Examples
+    --------
+    >>> sql, params = select_workouts(4, start="2023-01-01")
+    """
+    where, params = database.date_range("s.DATE", start, end)
+    direction = " DESC" if newest_first else ""
+    if athlete_id is None:
+        hint = ""
+        group = "s.ID"
+    else:
+        # Without the hint the planner prefers scanning sessions in ID order to
+        # save the GROUP BY sort, which reads the whole log for one athlete.
+        hint = " INDEXED BY IDX_SESSIONS_ATHLETE_DATE"
+        where = f"s.ATHLETE_ID = :athlete AND {where}"
+        params["athlete"] = athlete_id
+        group = "s.DATE, s.ID"
+    sql = f"""SELECT
+    s.ID AS "ID",
+    s.DATE AS "DATE",
+{_pivot_columns()},
+    s.ATHLETE_ID AS "ATHLETE_ID"
+    FROM WORKOUT_SESSIONS s{hint}
+    LEFT JOIN WORKOUT_ENTRIES e ON e.SESSION_ID = s.ID
+    WHERE {where}
+    GROUP BY {group}
+    ORDER BY {", ".join(f"{column}{direction}" for column in group.split(", "))}"""
+    return sql, params
+
+
+def read_workouts(start=None, end=None, athlete_id: int = DEFAULT_ATHLETE_ID) -> pd.DataFrame:
+    """
+    Read an athlete's logged sessions in the wide WORKOUTS layout, newest first.
+
+    Parameters
+    ----------
+    start, end : date or str, optional
+        The first and last day to include; the whole log when omitted.
+    athlete_id : int, optional
+        The athlete whose sessions are read.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The columns of the WORKOUTS view and ATHLETE_ID, one row per session.
+
+    Examples
+    --------
+    >>> recent = read_workouts(start=datetime.date.today() - datetime.timedelta(days=90))
+    """
+    return database.read_sql(*select_workouts(athlete_id, start, end))
+
+
+# What one page of the "Cumulative Exercise Log" may be sorted by: the date or
+# any wide column, read for each session with one primary-key lookup.
+page_sort_columns = {
+    "DATE": "s.DATE",
+    **{
+        column: f"""COALESCE((SELECT VALUE FROM WORKOUT_ENTRIES
+        WHERE SESSION_ID = s.ID AND EXERCISE_ID = {exercise_id} AND METRIC = '{metric}'), 0)"""
+        for column, (exercise_id, metric) in column_index.items()
+    },
+}
+
+
+def read_workout_page(
+    athlete_id: int = DEFAULT_ATHLETE_ID,
+    page: int = 1,
+    rows_per_page: int = 10,
+    sort_by: str = "DATE",
+    descending: bool = True,
+    date_filter: str = None,
+) -> tuple:
+    """
+    Read one page of an athlete's sessions in the wide WORKOUTS layout.
+
+    The page's sessions are picked from WORKOUT_SESSIONS with ORDER BY,
+    LIMIT and OFFSET, and only those are pivoted, so the rows read and sent
+    to the table do not grow with the log. Sorting by date follows
+    IDX_SESSIONS_ATHLETE_DATE; sorting by an exercise column looks the value
+    up per session. Ties are broken by date, newest first.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        The athlete whose sessions are read.
+    page : int, optional
+        The 1-based page.
+    rows_per_page : int, optional
+        Sessions per page, at most `database.MAX_PAGE_ROWS`.
+    sort_by : str, optional
+        "DATE" or a wide column name; anything else sorts by date.
+    descending : bool, optional
+        Whether to sort from the largest value.
+    date_filter : str, optional
+        Only count and read sessions whose date starts with this, e.g. "2023-05".
+
+    Returns
+    -------
+    tuple of (pandas.DataFrame, int)
+        The page, with the columns of `read_workouts`, and the number of
+        sessions matching the filter.
+
+    Examples
+    --------
+    >>> rows, total = read_workout_page(1, page=2, sort_by="FRONTLINE_WEIGHT")
+    """
+    where, params = database.date_prefix("s.DATE", date_filter)
+    params.update(database.page_window(page, rows_per_page), athlete=athlete_id)
+    where = f"s.ATHLETE_ID = :athlete AND {where}"
+    direction = " DESC" if descending else ""
+    sort = page_sort_columns.get(sort_by, page_sort_columns["DATE"])
+    # Sorted by date the index already gives the order, ties included.
+    ties = f"s.ID{direction}" if sort == "s.DATE" else "s.DATE DESC, s.ID DESC"
+    total = database.read_sql(
+        f"SELECT COUNT(*) AS TOTAL FROM WORKOUT_SESSIONS s WHERE {where}", params
+    )["TOTAL"].iloc[0]
+    rows = database.read_sql(
+        f"""SELECT
+    s.ID AS "ID",
+    s.DATE AS "DATE",
+{_pivot_columns()},
+    s.ATHLETE_ID AS "ATHLETE_ID"
+    FROM (
+        SELECT s.ID, s.DATE, s.ATHLETE_ID, {sort} AS SORT_KEY
+        FROM WORKOUT_SESSIONS s INDEXED BY IDX_SESSIONS_ATHLETE_DATE
+        WHERE {where}
+        ORDER BY SORT_KEY{direction}, {ties}
+        LIMIT :limit OFFSET :offset
+    ) s
+    LEFT JOIN WORKOUT_ENTRIES e ON e.SESSION_ID = s.ID
+    GROUP BY s.ID
+    ORDER BY s.SORT_KEY{direction}, {ties}""",
+        params,
+    )
+    return rows, int(total)
+
+
+def read_loads(athlete_id: int = None, start=None, end=None) -> pd.DataFrame:
+    """
+    Read sets, reps and weight per session and exercise, oldest first.
+
+    The metrics are folded into one row per exercise in SQL, so pandas gets a
+    third of the entry rows and no reshaping to do. One athlete's sessions
+    are read through IDX_SESSIONS_ATHLETE_DATE.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        Only read this athlete's sessions; every athlete when omitted.
+    start, end : date or str, optional
+        The first and last day to include; the whole log when omitted.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The columns ATHLETE_ID, DATE, EXERCISE_ID, SETS, REPS and WEIGHT, with
+        0 for a metric that was not logged. Exercises logged only with other
+        metrics (STAIR, DISTANCE, DONE) are left out.
+
+    Examples
+    --------
+    >>> loads = read_loads(1, start="2023-01-01")
+    """
+    where, params = database.date_range("s.DATE", start, end)
+    hint = ""
+    if athlete_id is not None:
+        hint = " INDEXED BY IDX_SESSIONS_ATHLETE_DATE"
+        where = f"s.ATHLETE_ID = :athlete AND {where}"
+        params["athlete"] = athlete_id
+    return database.read_sql(
+        f"""SELECT
+        s.ATHLETE_ID,
+        s.DATE,
+        e.EXERCISE_ID,
+        COALESCE(MAX(CASE WHEN e.METRIC = 'SETS' THEN e.VALUE END), 0) AS SETS,
+        COALESCE(MAX(CASE WHEN e.METRIC = 'REPS' THEN e.VALUE END), 0) AS REPS,
+        COALESCE(MAX(CASE WHEN e.METRIC = 'WEIGHT' THEN e.VALUE END), 0) AS WEIGHT
+        FROM WORKOUT_SESSIONS s{hint}
+        JOIN WORKOUT_ENTRIES e ON e.SESSION_ID = s.ID
+        WHERE {where} AND e.METRIC IN ('SETS', 'REPS', 'WEIGHT')
+        GROUP BY s.DATE, s.ID, e.EXERCISE_ID
+        ORDER BY s.DATE, s.ID, e.EXERCISE_ID""",
+        params,
+    )
+
+
+def current_levels(athlete_id: int = DEFAULT_ATHLETE_ID) -> dict:
+    """
+    Read an athlete's current working levels from EXERCISE_STATE.
+
+    The level of every exercise is the latest WEIGHT, STAIR or DISTANCE
+    logged for it, kept up to date by TRG_STATE_LEVEL on each save, so this is
+    one primary-key range read rather than a scan of the log.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        The athlete whose levels are read.
+
+    Returns
+    -------
+    dict
+        Wide WORKOUTS level column names (e.g. "FRONTLINE_WEIGHT") mapped to
+        the latest nonzero value, in exercise order. Exercises without a
+        logged level are left out.
+
+    Examples
+    --------
+    >>> current_levels().get("FRONTLINE_WEIGHT", 0)
+    15
+    """
+    with database.reader() as conn:
+        rows = conn.execute(
+            """SELECT EXERCISE_ID, LAST_LEVEL FROM EXERCISE_STATE
+            WHERE ATHLETE_ID = ? AND LAST_LEVEL IS NOT NULL
+            ORDER BY EXERCISE_ID""",
+            (athlete_id,),
+        ).fetchall()
+    return {level_columns[exercise_id]: level for exercise_id, level in rows}
+
+
+def previous_weight(levels: dict) -> pd.DataFrame:
+    """
+    Lay out current levels as the "Previous Weight" card.
+
+    Parameters
+    ----------
+    levels : dict
+        As returned by `current_levels`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The columns 'Exercise' (the data tab's column label) and 'Level'.
+
+    Examples
+    --------
+    >>> card = previous_weight(current_levels())
+    """
+    return pd.DataFrame(
+        {
+            "Exercise": [column_labels[column] for column in levels],
+            "Level": list(levels.values()),
+        }
+    )
+
+
+def days_since_last(
+    region: str = None, athlete_id: int = DEFAULT_ATHLETE_ID
+) -> pd.DataFrame:
+    """
+    Read the "Most Recent Exercises" cards straight from EXERCISE_STATE.
+
+    Parameters
+    ----------
+    region : str, optional
+        Only return exercises of this body region ("upper", "lower", "abs" or
+        "walk"). All regions are returned when omitted.
+    athlete_id : int, optional
+        The athlete whose cards are read.
+
+    Returns
+    -------
+    pandas.DataFrame
+        One row per performed exercise, oldest first, with the columns
+        'Exercises' (display name) and 'Days_Since_Last'.
+
+    Examples
+    --------
+    >>> upper_df = days_since_last("upper")
+    """
+    return database.read_sql(
+        """SELECT
+        x.DISPLAY_NAME AS Exercises,
+        CAST(julianday('now', 'localtime') - julianday(s.LAST_DATE) AS INTEGER) AS Days_Since_Last
+        FROM EXERCISE_STATE s
+        JOIN EXERCISES x ON x.ID = s.EXERCISE_ID
+        WHERE s.ATHLETE_ID = :athlete AND s.LAST_DATE IS NOT NULL
+        AND (:region IS NULL OR x.REGION = :region)
+        ORDER BY s.LAST_DATE""",
+        {"athlete": athlete_id, "region": region},
+    )
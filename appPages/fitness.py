@@ -22,531 +22,65 @@ Program designed to be a data collection and instructional tool for
 teachers of students with Visual Impairments
 """
 
-import math
 import os
 import sqlite3
 import sys
 from datetime import datetime
 
-import pandas as pd
 from nicegui import ui, app
 
 module_path = os.path.abspath(os.getcwd())
 if module_path not in sys.path:
     sys.path.append(module_path)
 from appTheming import theme
-from appHelpers.helpers import (
-    dataBasePath,
-)
+from appTheming.widgets import athlete_query, athlete_select, log_table
+from appHelpers import analytics, athletes, cache, changes, charts, database, export, progression, recommendations, records, workouts
+from appHelpers.exercises import column_index, column_labels, exercise_names, metric_labels, region_exercises, region_titles
 
 
 def create() -> None:
     @ui.page("/fitness")
-    def fitness() -> None:
-        with theme.frame("- FITNESS -"):
+    async def fitness(athlete: int = athletes.DEFAULT_ATHLETE_ID) -> None:
+        names = await cache.get(athletes.list_athletes)
+        levels = await cache.get(workouts.current_levels, athlete)
+        # Next-session targets, shown as hints under the inputs
+        window = await cache.get(recommendations.recent_window, athlete)
+        suggested = {column: str(value) for column, value in recommendations.next_session(window).items()}
+        with theme.frame("- FITNESS -", athlete):
+            athlete_select("/fitness", athlete, names)
             with ui.tabs() as tabs:
                 ui.tab("WORKOUT INPUT")
                 ui.tab("WORKOUT DATA")
             with ui.tab_panels(tabs, value="WORKOUT INPUT"):
                 with ui.tab_panel("WORKOUT INPUT"):
-                    u_today_date = (
-                        ui.date()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_frontlineRaiseSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_frontlineRaiseReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_frontlineRaiseWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_shoulderPressReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_shoulderPressSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_shoulderPressWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_elbowOutRowReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_elbowOutRowSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_elbowOutRowWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_bicepCurlReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_bicepCurlSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_bicepCurlWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_closeGripPushupReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_closeGripPushupSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_closeGripPushupWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_rearDeltFlyReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_rearDeltFlySets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_rearDeltFlyWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_sideBendReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_sideBendSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_sideBendWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_lateralRaiseReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_lateralRaiseSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_lateralRaiseWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_stiffLegRDLReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_stiffLegRDLSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_stiffLegRDLWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_hamstringCurlReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_hamstringCurlSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_hamstringCurlWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_hipThrusterReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_hipThrusterSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_hipThrusterWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_frontSquatReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_frontSquatSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_frontSquatWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_sumoSquatReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_sumoSquatSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_sumoSquatWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_cyclistSquatReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_cyclistSquatSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_cyclistSquatWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_calfRaiseReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_calfRaiseSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_calfRaiseWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_longLeverCrunchesReps = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_longLeverCrunchesSets = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_longLeverCrunchesWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_sidelineSculptWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_abdominalsWeight = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_sidelineSculpt = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_abdominals = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_walk = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    u_walkDistance = (
-                        ui.number()
-                        .classes("hidden")
-                        .style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    )
-                    
-                    def save(event):
+                    """Per-client form state: every input writes straight into it"""
+                    form = {"DATE": datetime.now().strftime("%Y-%m-%d"), **{column: None for column in column_index}}
+                    """Unedited weights are saved at the last level logged, everything else at 0"""
+                    defaults = workouts.form_defaults(levels)
+
+                    async def save(event):
                         """
-                        Save workout data to individual exercise variables.
-                        
-                        This function extracts data from input fields representing different exercises,
-                        converts them to integers, and assigns the values to corresponding variables.
-                        If an exercise value is not provided, it defaults to 0. The function also
-                        captures the current date.
-                        
+                        Save the session entered on the form.
+
+                        Every WORKOUTS column is read from the form state with
+                        `workouts.session_values`, so an empty input saves the value its
+                        placeholder shows, then the session is written with
+                        `workouts.insert_workout`.
+
                         Parameters
                         ----------
                         event : EventType
                             The event triggering the save operation.
-                            
+
                         Returns
                         -------
                         None
-                        
+
                         Examples
                         --------
-                        >>> save(some_event)
+                        >>> await save(some_event)
                         """
-                        exercises = [
-                            u_frontlineRaiseSets,
-                            u_frontlineRaiseReps,
-                            u_frontlineRaiseWeight,
-                            u_shoulderPressReps,
-                            u_shoulderPressSets,
-                            u_shoulderPressWeight,
-                            u_elbowOutRowReps,
-                            u_elbowOutRowSets,
-                            u_elbowOutRowWeight,
-                            u_bicepCurlReps,
-                            u_bicepCurlSets,
-                            u_bicepCurlWeight,
-                            u_closeGripPushupReps,
-                            u_closeGripPushupSets,
-                            u_closeGripPushupWeight,
-                            u_rearDeltFlyReps,
-                            u_rearDeltFlySets,
-                            u_rearDeltFlyWeight,
-                            u_sideBendReps,
-                            u_sideBendSets,
-                            u_sideBendWeight,
-                            u_lateralRaiseReps,
-                            u_lateralRaiseSets,
-                            u_lateralRaiseWeight,
-                            u_stiffLegRDLReps,
-                            u_stiffLegRDLSets,
-                            u_stiffLegRDLWeight,
-                            u_hamstringCurlReps,
-                            u_hamstringCurlSets,
-                            u_hipThrusterReps,
-                            u_hipThrusterSets,
-                            u_hipThrusterWeight,
-                            u_frontSquatReps,
-                            u_frontSquatSets,
-                            u_frontSquatWeight,
-                            u_sumoSquatReps,
-                            u_sumoSquatSets,
-                            u_sumoSquatWeight,
-                            u_cyclistSquatReps,
-                            u_cyclistSquatSets,
-                            u_calfRaiseReps,
-                            u_calfRaiseSets,
-                            u_calfRaiseWeight,
-                            u_longLeverCrunchesReps,
-                            u_longLeverCrunchesSets,
-                            u_longLeverCrunchesWeight,
-                            u_sidelineSculpt,
-                            u_sidelineSculptWeight,
-                            u_abdominals,
-                            u_abdominalsWeight,
-                            u_walk,
-                            u_walkDistance,
-                        ]
-                        for exercise in exercises:
-                            """
-                            Ensure exercise values are not None.
-                            
-                            This loop iterates through a list of exercise objects and checks if the
-                            'value' attribute of each exercise is None. If it is, the 'value' attribute
-                            is set to 0. If the 'value' attribute is not None, the loop continues to the
-                            next iteration.
-                            
-                            Parameters
-                            ----------
-                            exercises : list
-                                A list of exercise objects with a 'value' attribute.
-                                
-                            Returns
-                            -------
-                            None
-                            
-                            Examples
-                            --------
-                            >>> exercises = [exercise1, exercise2, exercise3]
-                            >>> for exercise in exercises:
-                            ...     if exercise.value is None:
-                            ...         exercise.value = 0
-                            ...     else:
-                            ...         continue
-                            """
-                            if exercise.value is None:
-                                exercise.value = 0
-                            else:
-                                continue
-                            if not isinstance(exercise.value, int):
-                                exercise.value = int(math.ciel(num))
-                            else:
-                                continue
-                        today_date_str = str(u_today_date.value)
+                        today_date_str = str(form["DATE"])
                         try:
                             today_date = datetime.strptime(today_date_str, "%Y-%m-%d")
                         except ValueError as e:
@@ -556,68 +90,18 @@ def create() -> None:
                                 type="warning",
                                 close_button="OK",
                             )
-                        today_date = today_date.strftime("%Y-%m-%d %H:%M:%S")
-                        frontlineRaiseReps = int(u_frontlineRaiseReps.value)
-                        frontlineRaiseSets = int(u_frontlineRaiseReps.value)
-                        frontlineRaiseWeight = int(u_frontlineRaiseReps.value)
-                        shoulderPressReps = int(u_shoulderPressReps.value)
-                        shoulderPressSets = int(u_shoulderPressSets.value)
-                        shoulderPressWeight = int(u_shoulderPressWeight.value)
-                        elbowOutRowReps = int(u_elbowOutRowReps.value)
-                        elbowOutRowSets = int(u_elbowOutRowSets.value)
-                        elbowOutRowWeight = int(u_elbowOutRowWeight.value)
-                        bicepCurlReps = int(u_bicepCurlReps.value)
-                        bicepCurlSets = int(u_bicepCurlSets.value)
-                        bicepCurlWeight = int(u_bicepCurlWeight.value)
-                        closeGripPushupReps = int(u_closeGripPushupReps.value)
-                        closeGripPushupSets = int(u_frontlineRaiseReps.value)
-                        closeGripPushupWeight = int(u_closeGripPushupWeight.value)
-                        rearDeltFlyReps = int(u_rearDeltFlyReps.value)
-                        rearDeltFlySets = int(u_rearDeltFlySets.value)
-                        rearDeltFlyWeight = int(u_rearDeltFlyWeight.value)
-                        sideBendReps = int(u_sideBendReps.value)
-                        sideBendSets = int(u_sideBendSets.value)
-                        sideBendWeight = int(u_sideBendWeight.value)
-                        lateralRaiseReps = int(u_lateralRaiseReps.value)
-                        lateralRaiseSets = int(u_lateralRaiseSets.value)
-                        lateralRaiseWeight = int(u_lateralRaiseWeight.value)
-                        stiffLegRDLReps = int(u_stiffLegRDLReps.value)
-                        stiffLegRDLSets = int(u_stiffLegRDLSets.value)
-                        stiffLegRDLWeight = int(u_stiffLegRDLWeight.value)
-                        hamstringCurlReps = int(u_hamstringCurlReps.value)
-                        hamstringCurlSets = int(u_hamstringCurlSets.value)
-                        hipThrusterReps = int(u_hipThrusterReps.value)
-                        hipThrusterSets = int(u_hipThrusterSets.value)
-                        hipThrusterWeight = int(u_hipThrusterWeight.value)
-                        frontSquatReps = int(u_frontSquatReps.value)
-                        frontSquatSets = int(u_frontSquatSets.value)
-                        frontSquatWeight = int(u_frontSquatWeight.value)
-                        sumoSquatReps = int(u_sumoSquatReps.value)
-                        sumoSquatSets = int(u_sumoSquatSets.value)
-                        sumoSquatWeight = int(u_sumoSquatWeight.value)
-                        cyclistSquatReps = int(u_cyclistSquatReps.value)
-                        cyclistSquatSets = int(u_cyclistSquatSets.value)
-                        calfRaiseReps = int(u_calfRaiseReps.value)
-                        calfRaiseSets = int(u_calfRaiseSets.value)
-                        calfRaiseWeight = int(u_calfRaiseWeight.value)
-                        longLeverCrunchesReps = int(u_longLeverCrunchesReps.value)
-                        longLeverCrunchesSets = int(u_longLeverCrunchesSets.value)
-                        longLeverCrunchesWeight = int(u_longLeverCrunchesWeight.value)
-                        sidelineSculpt = int(u_sidelineSculpt.value)
-                        sidelineSculptWeight = int(u_sidelineSculptWeight.value)
-                        abdominals = int(u_abdominals.value)
-                        abdominalsWeight = int(u_abdominalsWeight.value)
-                        walk = int(u_walk.value)
-                        walkDistance = int(u_walkDistance.value)
-                        
-                        def data_entry():
+                            return
+                        today_date = today_date.strftime("%Y-%m-%d")
+                        values = workouts.session_values(form, defaults)
+
+                        async def data_entry():
                             """
                             Insert workout data into the WORKOUTS table in the SQLite database.
                             
-                            This function connects to the SQLite database, creates a cursor, and executes
-                            an SQL INSERT statement to add workout data to the WORKOUTS table. The data is
-                            provided as parameters, including the current date and various exercise details.
-                            After execution, the changes are committed, and the connection is closed.
+                            This function stores the session through `workouts.insert_workout`, which
+                            writes one WORKOUT_ENTRIES row per nonzero exercise value. It runs on the shared
+                            writer connection in a database thread, so the page stays responsive while the
+                            transaction is committed.
                             
                             Parameters
                             ----------
@@ -629,189 +113,22 @@ def create() -> None:
                             
                             Examples
                             --------
-                            >>> data_entry()
+                            >>> await data_entry()
                             """
                             try:
-                                conn = sqlite3.connect(dataBasePath)
-                                if conn is not None:
-                                    c = conn.cursor()
-                                    try:
-                                        c.execute(
-                                            """INSERT INTO WORKOUTS (
-                                            DATE,
-                                            FRONTLINE_REPS,
-                                            FRONTLINE_SETS,
-                                            FRONTLINE_WEIGHT,
-                                            SHOULDERZPRESS_REPS,
-                                            SHOULDERZPRESS_SETS,
-                                            SHOULDERZPRESS_WEIGHT,
-                                            ELBOWOUTROW_REPS,
-                                            ELBOWOUTROW_SETS,
-                                            ELBOWOUTROW_WEIGHT,
-                                            SUPINEBICEPCURL_REPS,
-                                            SUPINEBICEPCURL_SETS,
-                                            SUPINEBICEPCURL_WEIGHT,
-                                            CLOSEGRIPPUSHUP_REPS,
-                                            CLOSEGRIPPUSHUP_SETS,
-                                            CLOSEGRIPPUSHUP_STAIR,
-                                            REARDELTFLY_REPS,
-                                            REARDELTFLY_SETS,
-                                            REARDELTFLY_WEIGHT,
-                                            SIDEBEND_REPS,
-                                            SIDEBEND_SETS,
-                                            SIDEBEND_WEIGHT,
-                                            LATERALRAISE_REPS,
-                                            LATERALRAISE_SETS,
-                                            LATERALRAISE_WEIGHT,
-                                            STIFFLEGRDL_REPS,
-                                            STIFFLEGRDL_SETS,
-                                            STIFFLEGRDL_WEIGHT,
-                                            SLIDERHAMSTRINGCURL_REPS,
-                                            SLIDERHAMSTRINGCURL_SETS,
-                                            HIPTHRUSTER_REPS,
-                                            HIPTHRUSTER_SETS,
-                                            HIPTHRUSTER_WEIGHT,
-                                            FORWARDSQUAT_REPS,
-                                            FORWARDSQUAT_SETS,
-                                            FORWARDSQUAT_WEIGHT,
-                                            SUMOSQUAT_REPS,
-                                            SUMOSQUAT_SETS,
-                                            SUMOSQUAT_WEIGHT,
-                                            CYCLISTSQUAT_REPS,
-                                            CYCLISTSQUAT_SETS,
-                                            SINGLELEGCALFRAISE_REPS,
-                                            SINGLELEGCALFRAISE_SETS,
-                                            SINGLELEGCALFRAISE_WEIGHT,
-                                            LONGLEVERCRUNCHES_REPS,
-                                            LONGLEVERCRUNCHES_SETS,
-                                            LONGLEVERCRUNCHES_WEIGHT,
-                                            SIDELINESCULPT,
-                                            SIDELINESCULPT_WEIGHT,
-                                            ABDOMINALS,
-                                            ABDOMINALS_WEIGHT,
-                                            WALK,
-                                            WALK_DISTANCE
-                                            )
-                                            VALUES (
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?,
-                                            ?
-                                            )
-                                            """,
-                                            (
-                                                today_date, 
-                                                frontlineRaiseReps,
-                                                frontlineRaiseSets,
-                                                frontlineRaiseWeight,
-                                                shoulderPressReps,
-                                                shoulderPressSets,
-                                                shoulderPressWeight,
-                                                elbowOutRowReps,
-                                                elbowOutRowSets,
-                                                elbowOutRowWeight,
-                                                bicepCurlReps,
-                                                bicepCurlSets,
-                                                bicepCurlWeight,
-                                                closeGripPushupReps,
-                                                closeGripPushupSets,
-                                                closeGripPushupWeight,
-                                                rearDeltFlyReps,
-                                                rearDeltFlySets,
-                                                rearDeltFlyWeight,
-                                                sideBendReps,
-                                                sideBendSets,
-                                                sideBendWeight,
-                                                lateralRaiseReps,
-                                                lateralRaiseSets,
-                                                lateralRaiseWeight,
-                                                stiffLegRDLReps,
-                                                stiffLegRDLSets,
-                                                stiffLegRDLWeight,
-                                                hamstringCurlReps,
-                                                hamstringCurlSets,
-                                                hipThrusterReps,
-                                                hipThrusterSets,
-                                                hipThrusterWeight,
-                                                frontSquatReps,
-                                                frontSquatSets,
-                                                frontSquatWeight,
-                                                sumoSquatReps,
-                                                sumoSquatSets,
-                                                sumoSquatWeight,
-                                                cyclistSquatReps,
-                                                cyclistSquatSets,
-                                                calfRaiseReps,
-                                                calfRaiseSets,
-                                                calfRaiseWeight,
-                                                longLeverCrunchesReps,
-                                                longLeverCrunchesSets,
-                                                longLeverCrunchesWeight,
-                                                sidelineSculpt,
-                                                sidelineSculptWeight,
-                                                abdominals,
-                                                abdominalsWeight,
-                                                walk,
-                                                walkDistance,
-                                            ),
-                                        )
-                                        conn.commit()
-                                    except ValueError as e:
-                                        ui.notify(
-                                            str(e),  # Converting exception object to string for the error message
-                                            position="center",
-                                            type="negative",
-                                            close_button="OK",
-                                        )
+                                session_id = await database.write(
+                                    workouts.insert_workout,
+                                    today_date,
+                                    values,
+                                    athlete,
+                                )
+                            except ValueError as e:
+                                ui.notify(
+                                    str(e),  # Converting exception object to string for the error message
+                                    position="center",
+                                    type="negative",
+                                    close_button="OK",
+                                )
                             except sqlite3.Error as e:
                                 ui.notify(
                                     f"SQLite error: {e}",
@@ -819,1067 +136,246 @@ def create() -> None:
                                     type="negative",
                                     close_button="OK",
                                 )
-                            conn.close()
-                            ui.notify(
-                                "Saved successfully!",
-                                position="center",
-                                type="positive",
-                                close_button="OK",
-                            )
-                        data_entry()
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.date(
-                            value="f{datenow}",
-                            on_change=lambda e: u_today_date.set_value(e.value),
-                        ).classes("w-1/2")
-                    with ui.row().classes("w-full no-wrap py-4"):
-                        ui.label("UPPER BODY").classes("text-2xl").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Frontline Raise").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_frontlineRaiseReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Frontline Raise Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_frontlineRaiseSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Frontline Raise Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_frontlineRaiseWeight.set_value(
-                                e.value
-                            ),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Frontline Raise Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Arnold Presses").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_shoulderPressReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Shoulder Press Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_shoulderPressSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Shoulder Press Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_shoulderPressWeight.set_value(
-                                e.value
-                            ),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Shoulder Press Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Elbow Out Row").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_elbowOutRowReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Elbow Out Row Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_elbowOutRowSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Elbow Out Row Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_elbowOutRowWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Elbow Out Row Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Supinating Bicep Curl").classes(
-                            "w-1/4 text-base"
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_bicepCurlReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Bicep Curls Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_bicepCurlSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Bicep Curls Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_bicepCurlWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Bicep Curls Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Close Grip Pushup").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_closeGripPushupReps.set_value(
-                                e.value
-                            ),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Close Grip Pushup Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_closeGripPushupSets.set_value(
-                                e.value
-                            ),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Close Grip Pushup Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="STAIR",
-                            value=0,
-                            on_change=lambda e: u_closeGripPushupWeight.set_value(
-                                e.value
-                            ),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Close Grip Pushup Stair"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Seated Rear Delt Fly").classes(
-                            "w-1/4 text-base"
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_rearDeltFlyReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Rear Delt Fly Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_rearDeltFlySets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Rear Delt Fly Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_rearDeltFlyWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Rear Delt Fly Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Standing Side Bend").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_sideBendReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Side Bend Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_sideBendSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Side Bend Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_sideBendWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Side Bend Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Lateral Raise").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_lateralRaiseReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Lateral Raise Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_lateralRaiseSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Lateral Raise Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_lateralRaiseWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Lateral Raise Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap py-4"):
-                        ui.label("LOWER BODY WORK").classes("text-2xl").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Stiff Leg RDL").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_stiffLegRDLReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Stiff Leg RDL Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_stiffLegRDLSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Stiff Leg RDL Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_stiffLegRDLWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Stiff Leg RDL Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Hamstring Curl").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_hamstringCurlReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Hamstring Curl Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_hamstringCurlSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Hamstring Curl Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_hamstringCurlWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Hamstring Curl Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Hip Thruster").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_hipThrusterReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Hip Thruster Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_hipThrusterSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Hip Thruster Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_hipThrusterWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Hip Thruster Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Front Squat").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_frontSquatReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Front Squat Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_frontSquatSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Front Squat Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_frontSquatWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Front Squat Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Sumo Squat").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_sumoSquatReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Forward Lunge Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_sumoSquatSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Forward Lunge Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_sumoSquatWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Forward Lunge Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Cyclist Squat").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_cyclistSquatReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Cyclist Squat Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_cyclistSquatSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Cyclist Squat Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_cyclistSquatWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Cyclist Squat Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Calf Raise").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_calfRaiseReps.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Calf Raise Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_calfRaiseSets.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Calf Raise Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_calfRaiseWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Cald Raise Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Long Lever Crunches").classes(
-                            "w-1/4 text-base"
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="REPS",
-                            value=0,
-                            on_change=lambda e: u_longLeverCrunchesReps.set_value(
-                                e.value
-                            ),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Calf Raise Reps"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="SETS",
-                            value=0,
-                            on_change=lambda e: u_longLeverCrunchesSets.set_value(
-                                e.value
-                            ),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Calf Raise Sets"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="WEIGHT",
-                            value=0,
-                            on_change=lambda e: u_longLeverCrunchesWeight.set_value(
-                                e.value
-                            ),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Calf Raise Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap py-4"):
-                        ui.label("CORE WORK").classes("text-2xl").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Sideline Sculpt").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="DONE",
-                            value=0,
-                            on_change=lambda e: u_sidelineSculpt.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Sideline Sculpt"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="Weight",
-                            value=0,
-                            on_change=lambda e: u_sidelineSculptWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Sideline Sculpt Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Abdominals").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="DONE",
-                            value=0,
-                            on_change=lambda e: u_abdominals.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Abdominals"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="Weight",
-                            value=0,
-                            on_change=lambda e: u_abdominalsWeight.set_value(e.value),
-                        ).classes("w-1/4 text-base").props(
-                            'aria-label="Abdominals Weight"'
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap py-4"):
-                        ui.label("WALKING").classes("text-2xl").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.label("Walking").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="Did I Walk",
-                            value=0,
-                            on_change=lambda e: u_walk.set_value(e.value),
-                        ).classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.label(" ").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.label(" ").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
+                            else:
+                                ui.notify(
+                                    "Saved successfully!",
+                                    position="center",
+                                    type="positive",
+                                    close_button="OK",
+                                )
+                                changes.publish(
+                                    athlete,
+                                    "workout",
+                                    today_date,
+                                    workouts.performed_exercises(values),
+                                )
+                                new_records = await database.run(records.session_records, session_id)
+                                if new_records:
+                                    ui.notify(
+                                        "New personal record! " + "; ".join(new_records),
+                                        position="center",
+                                        type="positive",
+                                        multi_line=True,
+                                        close_button="OK",
+                                    )
+                        await data_entry()
                     with ui.row().classes("w-full no-wrap"):
-                        ui.label("Distance Walked").classes("w-1/4").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.number(
-                            label="Distance",
-                            value=0,
-                            on_change=lambda e: u_walkDistance.set_value(
-                                math.ceil(e.value)
-                            ),
-                        ).classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.label(" ").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                        ui.label(" ").classes("w-1/4 text-base").style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
+                        ui.date(value=form["DATE"]).classes("w-1/2").bind_value_to(form, "DATE")
+                    for region, (heading, _) in region_titles.items():
+                        with ui.row().classes("w-full no-wrap py-4"):
+                            ui.label(heading).classes("text-2xl").style(
+                                'font-family : "Atkinson Hyperlegible"'
+                            )
+                        for exercise in region_exercises[region]:
+                            with ui.row().classes("w-full no-wrap"):
+                                ui.label(exercise.form_label).classes("w-1/4 text-base").style(
+                                    'font-family : "Atkinson Hyperlegible"'
+                                )
+                                for column, metric in zip(exercise.columns, exercise.metrics):
+                                    done = metric == "DONE"
+                                    ui.number(
+                                        label=metric_labels[metric][1],
+                                        value=0 if done else None,
+                                        placeholder=str(defaults[column]) if metric == "WEIGHT" else None,
+                                    ).classes("w-1/4 text-base").props(
+                                        f'aria-label="{exercise.form_label} {metric.title()}"'
+                                        + ("" if done else " stack-label")
+                                        + (f' hint="Suggested: {suggested[column]}"' if column in suggested else "")
+                                    ).style(
+                                        'font-family : "Atkinson Hyperlegible"'
+                                    ).bind_value_to(form, column)
                     with ui.row().classes("w-full no-wrap"):
                         ui.button("SAVE", on_click=save).props('color=secondary')
                         ui.button("EXIT", on_click=app.shutdown).props('color=secondary')
-                        ui.button("HOME", on_click=lambda: ui.open("/")).props('color=secondary')
-            with ui.tab_panels(tabs, value="WORKOUT DATA"):
+                        ui.button("HOME", on_click=lambda: ui.open("/" + athlete_query(athlete))).props('color=secondary')
                 with ui.tab_panel("WORKOUT DATA"):
-                    conn = sqlite3.connect(dataBasePath)
-                    dfSQL = pd.read_sql_query("SELECT * FROM WORKOUTS", conn)
-                    conn.close()
-                    df = dfSQL.drop(columns=["ID"])
-                    df = df.sort_values(by=["DATE"], ascending=False)
-                    df_last8 = df.drop(
-                        columns=[
-                            "FRONTLINE_SETS",
-                            "SHOULDERZPRESS_SETS",
-                            "ELBOWOUTROW_SETS",
-                            "SUPINEBICEPCURL_SETS",
-                            "CLOSEGRIPPUSHUP_SETS",
-                            "REARDELTFLY_SETS",
-                            "SIDEBEND_SETS",
-                            "LATERALRAISE_SETS",
-                            "STIFFLEGRDL_SETS",
-                            "SLIDERHAMSTRINGCURL_SETS",
-                            "HIPTHRUSTER_SETS",
-                            "FORWARDSQUAT_SETS",
-                            "SUMOSQUAT_SETS",
-                            "CYCLISTSQUAT_SETS",
-                            "SINGLELEGCALFRAISE_SETS",
-                            "LONGLEVERCRUNCHES_SETS",
-                            "FRONTLINE_WEIGHT",
-                            "SHOULDERZPRESS_WEIGHT",
-                            "ELBOWOUTROW_WEIGHT",
-                            "SUPINEBICEPCURL_WEIGHT",
-                            "CLOSEGRIPPUSHUP_STAIR",
-                            "REARDELTFLY_WEIGHT",
-                            "SIDEBEND_WEIGHT",
-                            "LATERALRAISE_WEIGHT",
-                            "STIFFLEGRDL_WEIGHT",
-                            "SLIDERHAMSTRINGCURL_WEIGHT",
-                            "HIPTHRUSTER_WEIGHT",
-                            "FORWARDSQUAT_WEIGHT",
-                            "SUMOSQUAT_WEIGHT",
-                            "CYCLISTSQUAT_WEIGHT",
-                            "SINGLELEGCALFRAISE_WEIGHT",
-                            "LONGLEVERCRUNCHES_WEIGHT",
-                            "SIDELINESCULPT_WEIGHT",
-                            "ABDOMINALS_WEIGHT",
-                        ]
-                    )
-                    df_last8 = df_last8.rename(
-                        columns={
-                            "DATE": "Date",
-                            "FRONTLINE_REPS": "Frontline POW Raise",
-                            "SHOULDERZPRESS_REPS": "Arnold Press",
-                            "ELBOWOUTROW_REPS": "Elbow Out Row",
-                            "SUPINEBICEPCURL_REPS": "Supinating Bicep Curl",
-                            "CLOSEGRIPPUSHUP_REPS": "Close Grip Pushup",
-                            "REARDELTFLY_REPS": "Rear Delt Fly",
-                            "SIDEBEND_REPS": "Side Bend",
-                            "LATERALRAISE_REPS": "Lateral Raise",
-                            "STIFFLEGRDL_REPS": "Stiff Legged RDL",
-                            "SLIDERHAMSTRINGCURL_REPS": "Hamstring Curls",
-                            "HIPTHRUSTER_REPS": "Hip Thrusters",
-                            "FORWARDSQUAT_REPS": "Forward Squat",
-                            "SUMOSQUAT_REPS": "Sumo Squat",
-                            "CYCLISTSQUAT_REPS": "Cyclist Squat",
-                            "SINGLELEGCALFRAISE_REPS": "Single Leg Calf Raise",
-                            "LONGLEVERCRUNCHES_REPS": "Long Lever Crunches",
-                            "SIDELINESCULPT": "Sideline Sculpt",
-                            "ABDOMINALS": "Abdominals",
-                            "WALK": "Walk",
-                            "WALK_DISTANCE": "Distance Walked",
-                        }
-                    )
-                    df = df.rename(
-                        columns={
-                            "DATE": "Date",
-                            "FRONTLINE_REPS": "Frontline POW Raise reps",
-                            "FRONTLINE_SETS": "Frontline POW Raise sets",
-                            "FRONTLINE_WEIGHT": "Frontline POW Raise Weight",
-                            "DOWNDOGPUSHUP_REPS": "Downdog reps",
-                            "DOWNDOGPUSHUP_SETS": "Downdog sets",
-                            "SHOULDERZPRESS_REPS": "Arnold press reps",
-                            "SHOULDERZPRESS_SETS": "Arnold press sets",
-                            "SHOULDERZPRESS_WEIGHT": "Arnold press Weight",
-                            "ELBOWOUTROW_REPS": "Elbow Out Row reps",
-                            "ELBOWOUTROW_SETS": "Elbow Out Row sets",
-                            "ELBOWOUTROW_WEIGHT": "Elbow Out Row Weight",
-                            "SUPINEBICEPCURL_REPS": "Supinating Bicep Curl reps",
-                            "SUPINEBICEPCURL_SETS": "Supinating Bicep Curl sets",
-                            "SUPINEBICEPCURL_WEIGHT": "Supinting Bicep Curl Weight",
-                            "CLOSEGRIPPUSHUP_REPS": "Close Grip Pushup reps",
-                            "CLOSEGRIPPUSHUP_SETS": "Close Grip Pshup sets",
-                            "CLOSEGRIPPUSHUP_STAIR": "Close Grip Pushup Stair",
-                            "REARDELTFLY_REPS": "Rear Delt Fly reps",
-                            "REARDELTFLY_SETS": "Rear Delt Fly sets",
-                            "REARDELTFLY_WEIGHT": "Rear Delt Fly Weight",
-                            "SIDEBEND_REPS": "Side Bend reps",
-                            "SIDEBEND_SETS": "Side Bend sets",
-                            "SIDEBEND_WEIGHT": "Side Bend Weight",
-                            "LATERALRAISE_REPS": "Lateral Raise reps",
-                            "LATERALRAISE_SETS": "Lateral Raise sets",
-                            "LATERALRAISE_WEIGHT": "Lateral Raise Weight",
-                            "STIFFLEGRDL_REPS": "Stiff Legged RDL reps",
-                            "STIFFLEGRDL_SETS": "Stiff Legged RDL sets",
-                            "STIFFLEGRDL_WEIGHT": "Stiff Legged RDL Weight",
-                            "SLIDERHAMSTRINGCURL_REPS": "Hamstring Curls reps",
-                            "SLIDERHAMSTRINGCURL_SETS": "Hamstring Curls sets",
-                            "HIPTHRUSTER_REPS": "Hip Thrusters reps",
-                            "HIPTHRUSTER_SETS": "Hip Thrusters sets",
-                            "HIPTHRUSTER_WEIGHT": "Hip Thrusters Weight",
-                            "FORWARDSQUAT_REPS": "Forward Squat reps",
-                            "FORWARDSQUAT_SETS": "Forward Squat sets",
-                            "FORWARDSQUAT_WEIGHT": "Forward Squat Weight",
-                            "SUMOSQUAT_REPS": "Sumo Squat reps",
-                            "SUMOSQUAT_SETS": "Sumo Squat sets",
-                            "SUMOSQUAT_WEIGHT": "Sumo Squat Weight",
-                            "CYCLISTSQUAT_REPS": "Cyclist Squat reps",
-                            "CYCLISTSQUAT_SETS": "Cyclist Squat sets",
-                            "CYCLISTSQUAT_WEIGHT": "Cyclist Squat Weight",
-                            "SINGLELEGCALFRAISE_REPS": "Single Leg Calf Raise reps",
-                            "SINGLELEGCALFRAISE_SETS": "Single Leg Calf Raise sets",
-                            "SINGLELEGCALFRAISE_WEIGHT": "Single Leg Calf Raise Weight",
-                            "LONGLEVERCRUNCHES_REPS": "Long Lever Crunches reps",
-                            "LONGLEVERCRUNCHES_SETS": "Long Lever Crunches sets",
-                            "LONGLEVERCRUNCHES_WEIGHT": "Long Lever Crunches Weight",
-                            "SIDELINESCULPT": "Sideline Scupt",
-                            "ABDOMINALS": "Abdominals",
-                            "SIDELINESCULPT_WEIGHT": "Sideline Scupt Weight",
-                            "ABDOMINALS_WEIGHT": "Abdominals Weight",
-                            "WALK": "Walk",
-                            "WALK_DISTANCE": "Walk Distance",
-                        }
-                    )
-                    lower_df = df_last8.drop(
-                        columns=[
-                            "Frontline POW Raise",
-                            "Arnold Press",
-                            "Elbow Out Row",
-                            "Supinating Bicep Curl",
-                            "Close Grip Pushup",
-                            "Rear Delt Fly",
-                            "Side Bend",
-                            "Lateral Raise",
-                            "Abdominals",
-                            "Sideline Sculpt",
-                            "Walk",
-                            "Distance Walked",
-                        ]
-                    )
-                    upper_df = df_last8.drop(
-                        columns=[
-                            "Stiff Legged RDL",
-                            "Hamstring Curls",
-                            "Hip Thrusters",
-                            "Forward Squat",
-                            "Sumo Squat",
-                            "Cyclist Squat",
-                            "Single Leg Calf Raise",
-                            "Long Lever Crunches",
-                            "Abdominals",
-                            "Sideline Sculpt",
-                            "Walk",
-                            "Distance Walked",
-                        ]
-                    )
-                    abs_df = df_last8.drop(
-                        columns=[
-                            "Stiff Legged RDL",
-                            "Hamstring Curls",
-                            "Hip Thrusters",
-                            "Forward Squat",
-                            "Sumo Squat",
-                            "Cyclist Squat",
-                            "Single Leg Calf Raise",
-                            "Long Lever Crunches",
-                            "Frontline POW Raise",
-                            "Arnold Press",
-                            "Elbow Out Row",
-                            "Supinating Bicep Curl",
-                            "Close Grip Pushup",
-                            "Rear Delt Fly",
-                            "Side Bend",
-                            "Lateral Raise",
-                            "Walk",
-                            "Distance Walked",
-                        ]
-                    )
-                    walk_df = df_last8.drop(
-                        columns=[
-                            "Stiff Legged RDL",
-                            "Hamstring Curls",
-                            "Hip Thrusters",
-                            "Forward Squat",
-                            "Sumo Squat",
-                            "Cyclist Squat",
-                            "Single Leg Calf Raise",
-                            "Long Lever Crunches",
-                            "Frontline POW Raise",
-                            "Arnold Press",
-                            "Elbow Out Row",
-                            "Supinating Bicep Curl",
-                            "Close Grip Pushup",
-                            "Rear Delt Fly",
-                            "Side Bend",
-                            "Lateral Raise",
-                            "Abdominals",
-                            "Sideline Sculpt",
-                            "Distance Walked",
-                        ]
-                    )
-                    
-                    def reshape_and_rename(input_df):
+                    @ui.refreshable
+                    async def workout_data(build: bool = False) -> None:
                         """
-                        Reshape and rename a DataFrame containing exercise data.
-                        
+                        Build the WORKOUT DATA tab; it stays empty until the tab is first opened.
+
                         Parameters
                         ----------
-                        input_df : pandas.DataFrame
-                            Input DataFrame containing exercise data with columns 'Date', exercise names as columns,
-                            and corresponding values representing exercise metrics.
-                            
+                        build : bool, optional
+                            Whether to read the data and build the tab.
+
                         Returns
                         -------
-                        pandas.DataFrame
-                            Reshaped and renamed DataFrame with the following columns:
-                            - 'Exercises': Exercise names.
-                            - 'Most Recent': The most recent date for each exercise.
-                            - 'Days Since Last': Number of days since the last exercise recorded.
-                            
-                        Notes
-                        -----
-                        This function performs the following steps:
-                        1. Melt the input DataFrame to transform it into a long format.
-                        2. Remove rows with 'value' equal to 0.
-                        3. Group by 'Exercises' and find the most recent date for each exercise.
-                        4. Merge the melted DataFrame with the most recent dates.
-                        5. Drop unnecessary columns ('Date', 'value') and sort by the most recent date.
-                        6. Keep only the first occurrence of each exercise, removing duplicates.
-                        7. Calculate the 'Days Since Last' based on the time elapsed since the previous record.
-                        
+                        None
+
                         Examples
                         --------
-                        >>> import pandas as pd
-                        >>> from datetime import datetime, timedelta
-                        >>> # Creating a sample DataFrame
-                        >>> data = {'Date': ['2023-01-01', '2023-01-02', '2023-01-03'],
-                        ...         'Exercise_A': [10, 15, 0],
-                        ...         'Exercise_B': [5, 0, 20]}
-                        >>> df = pd.DataFrame(data)
-                        >>> df['Date'] = pd.to_datetime(df['Date'])
-                        >>> # Applying reshape_and_rename function
-                        >>> result_df = reshape_and_rename(df)
-                        >>> print(result_df)
+                        >>> workout_data.refresh(True)
                         """
-                        melted_df = pd.melt(
-                            input_df,
-                            id_vars=["Date"],
-                            var_name="Exercises",
-                            value_name="value",
-                        )
-                        # Filter out rows with zero values and NaN values
-                        melted_df = melted_df[(melted_df["value"] != 0) & melted_df["value"].notna()]
-                        # Group by "Exercises" and find the most recent date for each
-                        recent_df = (
-                            melted_df.groupby(["Exercises"])
-                            .agg({"Date": "max"})
-                            .reset_index()
-                        )
-                        recent_df.columns = ["Exercises", "Most_Recent"]
-                        # Merge melted_df with recent_df based on "Exercises" and "Weight"
-                        reformed_df = pd.merge(melted_df, recent_df, on=["Exercises"])
-                        # Drop unnecessary columns
-                        reformed_df = reformed_df.drop(["Date", "value"], axis=1)
-                        # Sort by "Most_Recent" column
-                        reformed_df = reformed_df.sort_values(by=["Most_Recent"])
-                        # Drop duplicate rows, keeping only the first occurrence of each exercise
-                        reformed_df = reformed_df.drop_duplicates(subset=["Exercises"], keep="first")
-                        # Calculate "Days Since" based on the most recent date
-                        reformed_df["Days_Since_Last"] = (
-                            datetime.now() - pd.to_datetime(reformed_df["Most_Recent"])
-                        ).dt.days
-                        # Drop the "Most_Recent" column
-                        reformed_df = reformed_df.drop("Most_Recent", axis=1)
-                        return reformed_df
-                    # Filter the columns
-                    df_filtered = df[[col for col in df.columns if col.lower().endswith(('weight', 'distance', 'stair'))]]
-                    # Melt the dataframe
-                    melted_df = df_filtered.melt(var_name='Exercise', value_name='Level')
-                    # Remove NaN and null values
-                    melted_df = melted_df.dropna()
-                    # Remove 0 values
-                    melted_df = melted_df[melted_df['Level'] != 0]
-                    # Get the most recent 'Level' for each 'Exercise'
-                    previous_weight = melted_df.groupby('Exercise').last().reset_index()
-                    print(previous_weight)
-                    """Drop Rows for Easier Data Presentation"""
-                    upper_df = reshape_and_rename(upper_df)
-                    lower_df = reshape_and_rename(lower_df)
-                    abs_df = reshape_and_rename(abs_df)
-                    walk_df = reshape_and_rename(walk_df)
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.button("HOME", on_click=lambda: ui.open("/")).props('color=secondary')
-                        ui.button("EXIT", on_click=app.shutdown).props('color=secondary')
-                    with ui.row():
-                        ui.label("Most Recent Exercises").classes(
-                            "text-3xl text-bold"
-                        ).style('font-family : "JetBrainsMono"')
-                    with ui.row():
-                        with ui.column():
+                        if not build:
+                            return
+                        live.clear()
+                        live["recent"] = {}
+                        """Read the current level of each exercise from EXERCISE_STATE"""
+                        previous_weight = workouts.previous_weight(await cache.get(workouts.current_levels, athlete))
+                        """Estimated 1RM, rolling bests and trend from PROGRESSION_STATE"""
+                        progression_df = await cache.get(progression.read_progression, athlete)
+                        """Personal record history from the PERSONAL_RECORDS index"""
+                        records_df = await cache.get(records.read_records, athlete)
+                        """Read Days Since Last from the EXERCISE_STATE summary table"""
+                        recent_df = {
+                            region: await cache.get(workouts.days_since_last, region, athlete)
+                            for region in region_titles
+                        }
+                        """Weekly tonnage per body region and acute:chronic workload ratio"""
+                        load_df = await cache.get(analytics.training_load, athlete)
+                        """Downsampled time series of one exercise, refetched on zoom"""
+                        chart_series = await cache.get(charts.exercise_series, charts.DEFAULT_EXERCISE, athlete)
+                        with ui.row().classes("w-full no-wrap"):
+                            ui.button("HOME", on_click=lambda: ui.open("/" + athlete_query(athlete))).props('color=secondary')
+                            ui.button("EXIT", on_click=app.shutdown).props('color=secondary')
+                            ui.button(
+                                "DOWNLOAD CSV",
+                                on_click=lambda: ui.download("/export/workouts.csv" + athlete_query(athlete)),
+                            ).props('color=secondary')
+                            ui.button(
+                                "DOWNLOAD JSONL",
+                                on_click=lambda: ui.download("/export/workouts.jsonl" + athlete_query(athlete)),
+                            ).props('color=secondary')
+                            if export.PARQUET_AVAILABLE:
+                                ui.button(
+                                    "DOWNLOAD PARQUET",
+                                    on_click=lambda: ui.download("/export/workouts.parquet" + athlete_query(athlete)),
+                                ).props('color=secondary')
+                        with ui.row():
+                            ui.label("Most Recent Exercises").classes(
+                                "text-3xl text-bold"
+                            ).style('font-family : "JetBrainsMono"')
+                        with ui.row():
+                            for card_regions in [["upper", "abs"], ["lower", "walk"]]:
+                                with ui.column():
+                                    for region in card_regions:
+                                        with ui.card():
+                                            ui.label(region_titles[region][1]).classes(
+                                                "text-xl text-bold"
+                                            ).style(
+                                                'font-family : "Atkinson Hyperlegible"'
+                                            )
+                                            ui.separator().classes("w-full h-1").props("color=positive")
+                                            live["recent"][region] = table_r = ui.table(
+                                                columns=[
+                                                    {"name": col, "label": col, "field": col,
+                                                    "headerClasses": "border-b border-secondary",
+                                                    "align": 'left'}
+                                                    for col in recent_df[region].columns
+                                                ],
+                                                rows=recent_df[region].to_dict("records"),
+                                                row_key="Exercises",
+                                            ).style(
+                                                "font-family: JetBrainsMono; background-color: #f5f5f5"
+                                            ).classes("text-lg font-normal my-table")
+                                            table_r.add_slot('body-cell-Days_Since_Last', '''
+                                                <q-td key="Days_Since_Last" :props="props">
+                                                <q-badge :color="props.value  <= 8 ? 'blue' : props.value <= 14 ? 'green' : props.value <= 21 ? 'orange' :  'red'" text-color="black" outline>
+                                                    {{ props.value }}
+                                                </q-badge>
+                                                </q-td>
+                                                ''')
                             with ui.card():
-                                ui.label("Upper Body Exercises").classes(
+                                ui.label("Previous Weight").classes(
                                     "text-xl text-bold"
                                 ).style(
                                     'font-family : "Atkinson Hyperlegible"'
                                 )
                                 ui.separator().classes("w-full h-1").props("color=positive")
-                                table_c = ui.table(
+                                live["levels"] = ui.table(
                                     columns=[
                                         {"name": col, "label": col, "field": col,
                                         "headerClasses": "border-b border-secondary",
                                         "align": 'left'}
-                                        for col in upper_df.columns
+                                        for col in previous_weight.columns
                                     ],
-                                    rows=upper_df.to_dict("records"),
+                                    rows=previous_weight.to_dict("records"),
+                                    row_key="Exercise",
                                 ).style(
                                     "font-family: JetBrainsMono; background-color: #f5f5f5"
-                                ).classes("text-lg font-normal my-table")
-                                table_c.add_slot('body-cell-Days_Since_Last', '''
-                                    <q-td key="Days_Since_Last" :props="props">
-                                    <q-badge :color="props.value  <= 8 ? 'blue' : props.value <= 14 ? 'green' : props.value <= 21 ? 'orange' :  'red'" text-color="black" outline>
-                                        {{ props.value }}
-                                    </q-badge>
-                                    </q-td>
-                                    ''')
+                                ).classes("text-lg font-normal my-table") 
                             with ui.card():
-                                ui.label("Abdominal Exercises").classes(
+                                ui.label("Progression (estimated 1RM)").classes(
                                     "text-xl text-bold"
                                 ).style(
                                     'font-family : "Atkinson Hyperlegible"'
                                 )
                                 ui.separator().classes("w-full h-1").props("color=positive")
-                                table_a = ui.table(
+                                table_p = ui.table(
                                     columns=[
                                         {"name": col, "label": col, "field": col,
                                         "headerClasses": "border-b border-secondary",
                                         "align": 'left'}
-                                        for col in abs_df.columns
+                                        for col in progression_df.columns
                                     ],
-                                    rows=abs_df.to_dict("records"),
+                                    rows=progression_df.to_dict("records"),
                                 ).style(
                                     "font-family: JetBrainsMono; background-color: #f5f5f5"
                                 ).classes("text-lg font-normal my-table")
-                                table_a.add_slot('body-cell-Days_Since_Last', '''
-                                    <q-td key="Days_Since_Last" :props="props">
-                                    <q-badge :color="props.value  <= 8 ? 'blue' : props.value <= 14 ? 'green' : props.value <= 21 ? 'orange' :  'red'" text-color="black" outline>
+                                table_p.add_slot('body-cell-Status', '''
+                                    <q-td key="Status" :props="props">
+                                    <q-badge :color="props.value == 'progressing' ? 'green' : props.value == 'stalling' ? 'orange' : props.value == 'regressing' ? 'red' : 'grey'" text-color="black" outline>
                                         {{ props.value }}
                                     </q-badge>
                                     </q-td>
                                     ''')
-                        with ui.column():
+                        with ui.row():
+                            ui.label("Training Load").classes(
+                                "text-3xl text-bold"
+                            ).style('font-family : "JetBrainsMono"')
+                        with ui.row():
                             with ui.card():
-                                ui.label("Lower Body Exercises").classes(
+                                ui.label("Weekly Tonnage (sets × reps × weight)").classes(
                                     "text-xl text-bold"
                                 ).style(
                                     'font-family : "Atkinson Hyperlegible"'
                                 )
                                 ui.separator().classes("w-full h-1").props("color=positive")
-                                table_b = ui.table(
-                                    columns=[
-                                        {"name": col, "label": col, "field": col,
-                                        "headerClasses": "border-b border-secondary",
-                                        "align": 'left'}
-                                        for col in lower_df.columns
-                                    ],
-                                    rows=lower_df.to_dict("records"),
-                                ).style(
-                                    "font-family: JetBrainsMono; background-color: #f5f5f5"
-                                ).classes("text-lg font-normal my-table")
-                                table_b.add_slot('body-cell-Days_Since_Last', '''
-                                    <q-td key="Days_Since_Last" :props="props">
-                                    <q-badge :color="props.value  <= 8 ? 'blue' : props.value <= 14 ? 'green' : props.value <= 21 ? 'orange' :  'red'" text-color="black" outline>
-                                    {{ props.value }}
-                                    </q-badge>
-                                    </q-td>
-                                    ''')
-                            with ui.card():
-                                ui.label("Walking").classes("text-xl text-bold").style(
-                                    'font-family : "Atkinson Hyperlegible"'
-                                )
-                                ui.separator().classes("w-full h-1").props("color=positive")
-                                table_w = ui.table(
+                                table_l = ui.table(
                                     columns=[
                                         {"name": col, "label": col, "field": col,
                                         "headerClasses": "border-b border-secondary",
                                         "align": 'left'}
-                                        for col in walk_df.columns
+                                        for col in load_df.columns
                                     ],
-                                    rows=walk_df.to_dict("records"),
+                                    rows=load_df.to_dict("records"),
                                 ).style(
                                     "font-family: JetBrainsMono; background-color: #f5f5f5"
                                 ).classes("text-lg font-normal my-table")
-                                table_w.add_slot('body-cell-Days_Since_Last', '''
-                                    <q-td key="Days_Since_Last" :props="props">
-                                    <q-badge :color="props.value  <= 8 ? 'blue' : props.value <= 14 ? 'green' : props.value <= 21 ? 'orange' :  'red'" text-color="black" outline>
+                                table_l.add_slot('body-cell-ACWR', '''
+                                    <q-td key="ACWR" :props="props">
+                                    <q-badge :color="props.value == null ? 'grey' : props.value < 0.8 ? 'orange' : props.value <= 1.3 ? 'green' : props.value <= 1.5 ? 'orange' : 'red'" text-color="black" outline>
                                         {{ props.value }}
                                     </q-badge>
                                     </q-td>
                                     ''')
-                        with ui.card():
-                            ui.label("Previous Weight").classes(
-                                "text-xl text-bold"
-                            ).style(
-                                'font-family : "Atkinson Hyperlegible"'
-                            )
+                        with ui.row():
+                            ui.label("Progress Over Time").classes(
+                                "text-3xl text-bold"
+                            ).style('font-family : "JetBrainsMono"')
+                        with ui.card().classes("w-full"):
+                            chart_select = ui.select(
+                                exercise_names, value=charts.DEFAULT_EXERCISE, label="Exercise"
+                            ).classes("w-1/4").style('font-family : "Atkinson Hyperlegible"')
                             ui.separator().classes("w-full h-1").props("color=positive")
-                            table_b = ui.table(
-                                columns=[
-                                    {"name": col, "label": col, "field": col,
-                                    "headerClasses": "border-b border-secondary",
-                                    "align": 'left'}
-                                    for col in previous_weight.columns
-                                ],
-                                rows=previous_weight.to_dict("records"),
-                            ).style(
-                                "font-family: JetBrainsMono; background-color: #f5f5f5"
-                            ).classes("text-lg font-normal my-table") 
-                    with ui.row():
-                        ui.label("Cumulative Exercise Log").classes(
-                            "text-3xl text-bold"
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    table = (
+                            chart = ui.plotly(charts.figure(chart_series, revision=1)).classes("w-full")
+
+                            async def show_chart(start=None, end=None):
+                                series = await cache.get(charts.exercise_series, chart_select.value, athlete)
+                                chart.update_figure(charts.figure(series, start, end, revision=chart_select.value))
+
+                            async def zoom_chart(event):
+                                zoom = charts.zoom_range(event.args)
+                                if zoom is not None:
+                                    await show_chart(*zoom)
+
+                            chart_select.on_value_change(lambda: show_chart())
+                            chart.on("plotly_relayout", zoom_chart)
+                        with ui.row():
+                            ui.label("Records").classes(
+                                "text-3xl text-bold"
+                            ).style('font-family : "JetBrainsMono"')
                         ui.table(
                             columns=[
                                 {"name": col,
@@ -1887,10 +383,46 @@ def create() -> None:
                                 "field": col,
                                 "headerClasses": "border-b border-secondary",
                                 "align": 'left'}
-                                for col in df.columns
+                                for col in records_df.columns
                             ],
-                            rows=df.to_dict("records"), pagination={'rowsPerPage': 10}
+                            rows=records_df.to_dict("records"), pagination={'rowsPerPage': 10}
                         ).style("font-family: JetBrainsMono; background-color: #f5f5f5").classes('my-table')
-                    )
+                        with ui.row():
+                            ui.label("Cumulative Exercise Log").classes(
+                                "text-3xl text-bold"
+                            ).style(
+                                'font-family : "Atkinson Hyperlegible"'
+                            )
+                        """One page of sessions at a time, read with LIMIT and OFFSET"""
+                        live["log"] = await log_table(
+                            {column: label for column, label in column_labels.items() if column != "ATHLETE_ID"},
+                            lambda *page: cache.get(workouts.read_workout_page, athlete, *page),
+                        )
+
+                    await workout_data()
+
+            """Build the data tab on first opening, and again only if the data changed"""
+            built = {"version": None}
+
+            def open_tab(event) -> None:
+                if event.value == "WORKOUT DATA" and built["version"] != cache.version():
+                    built["version"] = cache.version()
+                    workout_data.refresh(True)
+
+            tabs.on_value_change(open_tab)
+
+            """Saved sessions patch the open tab's cards and log page in place"""
+            live = {}
 
+            async def patch(change: dict) -> None:
+                if change["tracker"] != "workout" or "log" not in live:
+                    return
+                for region in change["regions"]:
+                    recent_df = await cache.get(workouts.days_since_last, region, athlete)
+                    live["recent"][region].update_rows(recent_df.to_dict("records"))
+                if change["exercises"]:
+                    levels = await cache.get(workouts.current_levels, athlete)
+                    live["levels"].update_rows(workouts.previous_weight(levels).to_dict("records"))
+                live["log"].run_method("requestServerInteraction")
 
+            changes.subscribe(athlete, patch)
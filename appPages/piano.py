@@ -28,7 +28,6 @@ import sqlite3
 import sys
 from datetime import datetime
 
-import pandas as pd
 from nicegui import ui, app
 
 module_path = os.path.abspath(os.getcwd())
@@ -36,42 +35,25 @@ if module_path not in sys.path:
     sys.path.append(module_path)
 
 from appTheming import theme
-from appHelpers.helpers import (
-    dataBasePath,
-)
+from appTheming.widgets import athlete_query, athlete_select, log_table
+from appHelpers import athletes, cache, changes, charts, database, export, practice
 
 
 def create() -> None:
     @ui.page("/piano")
-    def piano() -> None:
-        with theme.frame("- PIANO -"):
+    async def piano(athlete: int = athletes.DEFAULT_ATHLETE_ID) -> None:
+        names = await cache.get(athletes.list_athletes)
+        with theme.frame("- PIANO -", athlete):
+            athlete_select("/piano", athlete, names)
             with ui.tabs() as tabs:
                 ui.tab("PIANO INPUT")
                 ui.tab("PRACTICE DATA")
             with ui.tab_panels(tabs, value="PIANO INPUT"):
                 with ui.tab_panel("PIANO INPUT"):
-                    u_today_date = (
-                        ui.date()
-                        .classes("hidden")
-                        .style('font-family : "Atkinson Hyperlegible"')
-                    )
-                    u_piano = (
-                        ui.number()
-                        .classes("hidden")
-                        .style('font-family : "Atkinson Hyperlegible"')
-                    )
-                    u_lesson = (
-                        ui.input()
-                        .classes("hidden")
-                        .style('font-family : "Atkinson Hyperlegible"')
-                    )
-                    u_recital = (
-                        ui.input()
-                        .classes("hidden")
-                        .style('font-family : "Atkinson Hyperlegible"')
-                    )
-
-                    def save(event):
+                    """Per-client form state: every input writes straight into it"""
+                    form = {"DATE": datetime.now().strftime("%Y-%m-%d"), "PIANO": 0, "LESSON": "", "RECITAL": ""}
+
+                    async def save(event):
                         """
                         Save workout data to individual exercise variables.
 
@@ -91,10 +73,10 @@ def create() -> None:
 
                         Examples
                         --------
-                        >>> save(some_event)
+                        >>> await save(some_event)
                         """
 
-                        today_date_str = str(u_today_date.value)
+                        today_date_str = str(form["DATE"])
                         try:
                             today_date = datetime.strptime(today_date_str, "%Y-%m-%d")
                         except ValueError as e:
@@ -106,18 +88,18 @@ def create() -> None:
                                 multi_line=True,
                                 classes='multi-line-notification',
                             )
-                        piano = int(u_piano.value)
-                        lesson = str(u_lesson.value)
-                        recital = str(u_recital.value)
+                            return
+                        piano = int(form["PIANO"] or 0)
+                        lesson = str(form["LESSON"] or "")
+                        recital = str(form["RECITAL"] or "")
 
-                        def data_entry():
+                        async def data_entry():
                             """
                             Insert workout data into the WORKOUTS table in the SQLite database.
 
-                            This function connects to the SQLite database, creates a cursor, and executes
-                            an SQL INSERT statement to add workout data to the WORKOUTS table. The data is
-                            provided as parameters, including the current date and various exercise details.
-                            After execution, the changes are committed, and the connection is closed.
+                            This function hands the row to `practice.insert_practice`, which runs
+                            on the shared writer connection in a database thread, so the page stays
+                            responsive while the transaction is committed.
 
                             Parameters
                             ----------
@@ -129,43 +111,24 @@ def create() -> None:
 
                             Examples
                             --------
-                            >>> data_entry()
+                            >>> await data_entry()
                             """
                             try:
-                                conn = sqlite3.connect(dataBasePath)
-                                if conn is not None:
-                                    c = conn.cursor()
-                                    c.execute(
-                                        """INSERT INTO PIANO (
-                                        DATE,
-                                        PIANO,
-                                        LESSON,
-                                        RECITAL
-                                        )
-                                        VALUES (
-                                        ?,
-                                        ?,
-                                        ?,
-                                        ?
-                                        )
-                                        """,
-                                        (
-                                            today_date,
-                                            piano,
-                                            lesson,
-                                            recital,
-                                        ),
-                                    )
-                                    conn.commit()
-                                else:
-                                    print("Error! cannot create the database connection.")
-                                    conn.close()
+                                await database.write(
+                                    practice.insert_practice,
+                                    today_date,
+                                    piano,
+                                    lesson,
+                                    recital,
+                                    athlete,
+                                )
                                 ui.notify(
                                     "Saved successfully!",
                                     position="center",
                                     type="positive",
                                     close_button="OK",
                                 )
+                                changes.publish(athlete, "piano", today_date.strftime("%Y-%m-%d"))
                             except sqlite3.Error as e:
                                 ui.notify(
                                     f"SQLite error: {e}",
@@ -173,13 +136,10 @@ def create() -> None:
                                     type="negative",
                                     close_button="OK",
                                 )
-                        data_entry()
+                        await data_entry()
 
                     with ui.row().classes("w-full no-wrap"):
-                        ui.date(
-                            value="f{datenow}",
-                            on_change=lambda e: u_today_date.set_value(e.value),
-                        ).classes("w-1/2")
+                        ui.date(value=form["DATE"]).classes("w-1/2").bind_value_to(form, "DATE")
                     with ui.row().classes("w-full no-wrap py-4"):
                         ui.label("PIANO PRACTICE").classes("text-2xl").style(
                             'font-family : "Atkinson Hyperlegible"'
@@ -190,183 +150,146 @@ def create() -> None:
                         )
                         ui.number(
                             label="Practice",
-                            value=0,
-                            on_change=lambda e: u_piano.set_value(e.value),
+                            value=form["PIANO"],
                         ).classes("w-1/4 text-base").props(
                             'aria-label=Practice'
-                        ).style('font-family : "Atkinson Hyperlegible"')
+                        ).style('font-family : "Atkinson Hyperlegible"').bind_value_to(form, "PIANO")
                         ui.input(
                             label="LESSON SONG",
-                            value="",
-                            on_change=lambda e: u_lesson.set_value(e.value),
+                            value=form["LESSON"],
                         ).classes("w-1/4 text-base").props(
                             'aria-label="Lesson"'
-                        ).style('font-family : "Atkinson Hyperlegible"')
+                        ).style('font-family : "Atkinson Hyperlegible"').bind_value_to(form, "LESSON")
                         ui.input(
                             label="RECITAL SONG",
-                            value="",
-                            on_change=lambda e: u_recital.set_value(e.value),
+                            value=form["RECITAL"],
                         ).classes("w-1/4 text-base").props(
                             'aria-label="Recital"'
-                        ).style('font-family : "Atkinson Hyperlegible"')
+                        ).style('font-family : "Atkinson Hyperlegible"').bind_value_to(form, "RECITAL")
                     with ui.row().classes("w-full no-wrap"):
                         ui.button("SAVE", on_click=save).props('color=secondary')
                         ui.button("EXIT", on_click=app.shutdown).props('color=secondary')
-                        ui.button("HOME", on_click=lambda: ui.open("/")).props('color=secondary')
+                        ui.button("HOME", on_click=lambda: ui.open("/" + athlete_query(athlete))).props('color=secondary')
 
-            with ui.tab_panels(tabs, value="PRACTICE DATA"):
                 with ui.tab_panel("PRACTICE DATA"):
-                    conn = sqlite3.connect(dataBasePath)
-                    dfSQL = pd.read_sql_query("SELECT * FROM PIANO", conn)
-                    conn.close()
-                    df = dfSQL.drop(columns=["ID"])
-                    df = df.sort_values(by=["DATE"], ascending=False)
-                    df_last8 = df.drop(
-                        columns=[
-                            "LESSON",
-                            "RECITAL"
-                        ]
-                    )
-                    df_last8 = df_last8.rename(
-                        columns={
-                            "DATE": "Date",
-                            "PIANO": "Practiced"
-                        }
-                    )
-                    df = df.rename(
-                        columns={
-                            "DATE": "Date",
-                            "PIANO": "Practiced",
-                            "LESSON": "Lesson",
-                            "RECITAL": "Recital"
-                        }
-                    )
-                    df = df.drop(
-                        columns=[
-                            "Practiced"
-                        ]
-                    )
-                    def reshape_and_rename(input_df):
+                    @ui.refreshable
+                    async def practice_data(build: bool = False) -> None:
                         """
-                        Reshape and rename a DataFrame containing exercise data.
+                        Build the PRACTICE DATA tab; it stays empty until the tab is first opened.
 
                         Parameters
                         ----------
-                        input_df : pandas.DataFrame
-                            Input DataFrame containing exercise data with columns 'Date', exercise names as columns,
-                            and corresponding values representing exercise metrics.
+                        build : bool, optional
+                            Whether to read the data and build the tab.
 
                         Returns
                         -------
-                        pandas.DataFrame
-                            Reshaped and renamed DataFrame with the following columns:
-                            - 'Exercises': Exercise names.
-                            - 'Most Recent': The most recent date for each exercise.
-                            - 'Days Since Last': Number of days since the last exercise recorded.
-
-                        Notes
-                        -----
-                        This function performs the following steps:
-                        1. Melt the input DataFrame to transform it into a long format.
-                        2. Remove rows with 'value' equal to 0.
-                        3. Group by 'Exercises' and find the most recent date for each exercise.
-                        4. Merge the melted DataFrame with the most recent dates.
-                        5. Drop unnecessary columns ('Date', 'value') and sort by the most recent date.
-                        6. Keep only the first occurrence of each exercise, removing duplicates.
-                        7. Calculate the 'Days Since Last' based on the time elapsed since the previous record.
+                        None
 
                         Examples
                         --------
-                        >>> import pandas as pd
-                        >>> from datetime import datetime, timedelta
-                        >>> # Creating a sample DataFrame
-                        >>> data = {'Date': ['2023-01-01', '2023-01-02', '2023-01-03'],
-                        ...         'Exercise_A': [10, 15, 0],
-                        ...         'Exercise_B': [5, 0, 20]}
-                        >>> df = pd.DataFrame(data)
-                        >>> df['Date'] = pd.to_datetime(df['Date'])
-                        >>> # Applying reshape_and_rename function
-                        >>> result_df = reshape_and_rename(df)
-                        >>> print(result_df)
+                        >>> practice_data.refresh(True)
                         """
+                        if not build:
+                            return
+                        live.clear()
+                        """Read Days Since Last from the PRACTICE_STATE summary row"""
+                        piano_df = await cache.get(practice.days_since_practice, athlete)
+                        """Downsampled practice counts, refetched on zoom"""
+                        practice_series = await cache.get(charts.practice_series, athlete)
+                        with ui.row().classes("w-full no-wrap"):
+                            ui.button("HOME", on_click=lambda: ui.open("/" + athlete_query(athlete))).props('color=secondary')
+                            ui.button("EXIT", on_click=app.shutdown).props('color=secondary')
+                            ui.button(
+                                "DOWNLOAD CSV",
+                                on_click=lambda: ui.download("/export/piano.csv" + athlete_query(athlete)),
+                            ).props('color=secondary')
+                            ui.button(
+                                "DOWNLOAD JSONL",
+                                on_click=lambda: ui.download("/export/piano.jsonl" + athlete_query(athlete)),
+                            ).props('color=secondary')
+                            if export.PARQUET_AVAILABLE:
+                                ui.button(
+                                    "DOWNLOAD PARQUET",
+                                    on_click=lambda: ui.download("/export/piano.parquet" + athlete_query(athlete)),
+                                ).props('color=secondary')
+                        with ui.row():
+                            ui.label("Piano Practice").classes(
+                                "text-3xl text-bold"
+                            ).style('font-family : "JetBrainsMono"')
+                        with ui.row():
+                            with ui.card():
+                                ui.label("Time Since Last Practice").classes(
+                                    "text-xl text-bold"
+                                ).style(
+                                    'font-family : "Atkinson Hyperlegible"'
+                                )
+                                ui.separator().classes("w-full h-1").props("color=positive")
+                                live["recent"] = table = ui.table(
+                                    columns=[
+                                        {"name": col, "label": col, "field": col,
+                                         "headerClasses": "border-b border-secondary",
+                                         "align": 'left'}
+                                        for col in piano_df.columns
+                                    ],
+                                    rows=piano_df.to_dict("records"),
+                                ).style(
+                                    "font-family: JetBrainsMono; background-color: #f5f5f5"
+                                ).classes("text-lg font-normal my-table")
+                                table.add_slot('body-cell-Days_Since_Last', '''
+                    <q-td key="Days_Since_Last" :props="props">
+                    <q-badge :color="props.value  <= 2 ? 'blue' : props.value <= 3? 'green' : props.value <= 4? 'orange' :  'red'" text-color="black" outline>
+                        {{ props.value }}
+                    </q-badge>
+                    </q-td>
+                    ''')
+                        with ui.row():
+                            ui.label("Practice Over Time").classes(
+                                "text-3xl text-bold"
+                            ).style('font-family : "JetBrainsMono"')
+                        with ui.card().classes("w-full"):
+                            chart = ui.plotly(charts.figure(practice_series, revision="PIANO")).classes("w-full")
 
-                        melted_df = pd.melt(
-                            input_df,
-                            id_vars=["Date"],
-                            var_name="Exercises",
-                            value_name="value",
-                        )
-                        melted_df = melted_df[melted_df["value"] != 0 & melted_df["value"].notna()]
-                        recent_df = (
-                            melted_df.groupby("Exercises")
-                            .agg({"Date": "max"})
-                            .reset_index()
-                        )
-                        recent_df.columns = ["Exercises", "Most_Recent"]
-                        reformed_df = pd.merge(melted_df, recent_df, on="Exercises")
-                        reformed_df = reformed_df.drop("Date", axis=1)
-                        reformed_df = reformed_df.drop("value", axis=1)
-                        reformed_df = reformed_df.sort_values(by=["Most_Recent"])
-                        reformed_df = reformed_df.drop_duplicates(
-                            subset=["Exercises"], keep="first"
-                        )
-                        reformed_df["Days_Since_Last"] = (
-                                datetime.now()
-                                - pd.to_datetime(reformed_df["Most_Recent"])
-                        ).dt.days
-                        reformed_df = reformed_df.drop("Most_Recent", axis=1)
-                        return reformed_df
-
-                    """Drop Rows for Easier Data Presentation"""
-                    piano_df = reshape_and_rename(df_last8)
-                    with ui.row().classes("w-full no-wrap"):
-                        ui.button("HOME", on_click=lambda: ui.open("/")).props('color=secondary')
-                        ui.button("EXIT", on_click=app.shutdown).props('color=secondary')
-                    with ui.row():
-                        ui.label("Piano Practice").classes(
-                            "text-3xl text-bold"
-                        ).style('font-family : "JetBrainsMono"')
-                    with ui.row():
-                        with ui.card():
-                            ui.label("Time Since Last Practice").classes(
-                                "text-xl text-bold"
+                            async def zoom_chart(event):
+                                zoom = charts.zoom_range(event.args)
+                                if zoom is not None:
+                                    series = await cache.get(charts.practice_series, athlete)
+                                    chart.update_figure(charts.figure(series, *zoom, revision="PIANO"))
+
+                            chart.on("plotly_relayout", zoom_chart)
+                        with ui.row():
+                            ui.label("Cumulative Practice Log").classes(
+                                "text-3xl text-bold"
                             ).style(
                                 'font-family : "Atkinson Hyperlegible"'
                             )
-                            ui.separator().classes("w-full h-1").props("color=positive")
-                            table = ui.table(
-                                columns=[
-                                    {"name": col, "label": col, "field": col,
-                                     "headerClasses": "border-b border-secondary",
-                                     "align": 'left'}
-                                    for col in piano_df.columns
-                                ],
-                                rows=piano_df.to_dict("records"),
-                            ).style(
-                                "font-family: JetBrainsMono; background-color: #f5f5f5"
-                            ).classes("text-lg font-normal my-table")
-                            table.add_slot('body-cell-Days_Since_Last', '''
-                <q-td key="Days_Since_Last" :props="props">
-                <q-badge :color="props.value  <= 2 ? 'blue' : props.value <= 3? 'green' : props.value <= 4? 'orange' :  'red'" text-color="black" outline>
-                    {{ props.value }}
-                </q-badge>
-                </q-td>
-                ''')
-                    with ui.row():
-                        ui.label("Cumulative Practice Log").classes(
-                            "text-3xl text-bold"
-                        ).style(
-                            'font-family : "Atkinson Hyperlegible"'
-                        )
-                    with ui.row():
-                        ui.table(
-                            columns=[
-                                {"name": col,
-                                 "label": col,
-                                 "field": col,
-                                 "headerClasses": "border-b border-secondary",
-                                 "align": 'left'}
-                                for col in df.columns
-                            ],
-                            rows=df.to_dict("records"),
-                        ).style('font-family: JetBrainsMono; background-color: #f5f5f5').classes('my-table')
+                        with ui.row():
+                            """One page of practices at a time, read with LIMIT and OFFSET"""
+                            live["log"] = await log_table(
+                                {column: practice.column_labels[column] for column in ["DATE", "LESSON", "RECITAL"]},
+                                lambda *page: cache.get(practice.read_practice_page, athlete, *page),
+                            )
+
+                    await practice_data()
+
+            """Build the data tab on first opening, and again only if the data changed"""
+            built = {"version": None}
+
+            def open_tab(event) -> None:
+                if event.value == "PRACTICE DATA" and built["version"] != cache.version():
+                    built["version"] = cache.version()
+                    practice_data.refresh(True)
+
+            tabs.on_value_change(open_tab)
+
+            """Saved practices patch the open tab's card and log page in place"""
+            live = {}
+
+            async def patch(change: dict) -> None:
+                if change["tracker"] != "piano" or "log" not in live:
+                    return
+                piano_df = await cache.get(practice.days_since_practice, athlete)
+                live["recent"].update_rows(piano_df.to_dict("records"))
+                live["log"].run_method("requestServerInteraction")
+
+            changes.subscribe(athlete, patch)
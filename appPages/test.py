@@ -22,118 +22,16 @@ Program designed to be a data collection and instructional tool for
 teachers of students with Visual Impairments
 """
 
-import datetime
-import sqlite3
-
-import pandas as pd
 from nicegui import ui, app
 
-from appHelpers.helpers import dataBasePath
+from appHelpers import athletes, cache, practice, workouts
 from appPages import fitness
 from appTheming import theme
+from appTheming.widgets import athlete_query, athlete_select
 
 
-def piano() -> None:
-    conn = sqlite3.connect(dataBasePath)
-    dfSQL = pd.read_sql_query("SELECT * FROM PIANO", conn)
-    conn.close()
-    df = dfSQL.drop(columns=["ID"])
-    df = df.sort_values(by=["DATE"])
-    df_last8 = df.drop(
-        columns=[
-            "LESSON",
-            "RECITAL"
-        ]
-    )
-    df_last8 = df_last8.rename(
-        columns={
-            "DATE": "Date",
-            "PIANO": "Practiced"
-        }
-    )
-    df = df.rename(
-        columns={
-            "DATE": "Date",
-            "PIANO": "Practiced",
-            "LESSON": "Lesson",
-            "RECITAL": "Recital"
-        }
-    )
-
-    def reshape_and_rename(input_df):
-        """
-        Reshape and rename a DataFrame containing exercise data.
-
-        Parameters
-        ----------
-        input_df : pandas.DataFrame
-            Input DataFrame containing exercise data with columns 'Date', exercise names as columns,
-            and corresponding values representing exercise metrics.
-
-        Returns
-        -------
-        pandas.DataFrame
-            Reshaped and renamed DataFrame with the following columns:
-            - 'Exercises': Exercise names.
-            - 'Most Recent': The most recent date for each exercise.
-            - 'Days Since Last': Number of days since the last exercise recorded.
-
-        Notes
-        -----
-        This function performs the following steps:
-        1. Melt the input DataFrame to transform it into a long format.
-        2. Remove rows with 'value' equal to 0.
-        3. Group by 'Exercises' and find the most recent date for each exercise.
-        4. Merge the melted DataFrame with the most recent dates.
-        5. Drop unnecessary columns ('Date', 'value') and sort by the most recent date.
-        6. Keep only the first occurrence of each exercise, removing duplicates.
-        7. Calculate the 'Days Since Last' based on the time elapsed since the previous record.
-
-        Examples
-        --------
-        >>> import pandas as pd
-        >>> from datetime import datetime, timedelta
-        >>> # Creating a sample DataFrame
-        >>> data = {'Date': ['2023-01-01', '2023-01-02', '2023-01-03'],
-        ...         'Exercise_A': [10, 15, 0],
-        ...         'Exercise_B': [5, 0, 20]}
-        >>> df = pd.DataFrame(data)
-        >>> df['Date'] = pd.to_datetime(df['Date'])
-        >>> # Applying reshape_and_rename function
-        >>> result_df = reshape_and_rename(df)
-        >>> print(result_df)
-        """
-
-        melted_df = pd.melt(
-            input_df,
-            id_vars=["Date"],
-            var_name="Exercises",
-            value_name="value",
-        )
-        melted_df = melted_df[melted_df["value"] != 0]
-        melted_df = melted_df[melted_df["value"].notna()]
-        recent_df = (
-            melted_df.groupby("Exercises")
-            .agg({"Date": "max"})
-            .reset_index()
-        )
-        recent_df.columns = ["Exercises", "Most_Recent"]
-        reformed_df = pd.merge(melted_df, recent_df, on="Exercises")
-        reformed_df = reformed_df.drop("Date", axis=1)
-        reformed_df = reformed_df.drop("value", axis=1)
-        reformed_df = reformed_df.sort_values(by=["Most_Recent"])
-        reformed_df = reformed_df.drop_duplicates(
-            subset=["Exercises"], keep="first"
-        )
-        reformed_df["Days_Since_Last"] = (
-                datetime.datetime.now()
-                - pd.to_datetime(reformed_df["Most_Recent"])
-        ).dt.days
-        reformed_df = reformed_df.drop("Most_Recent", axis=1)
-        return reformed_df
-
-    """Drop Rows for Easier Data Presentation"""
-    piano_df = reshape_and_rename(df_last8)
+async def piano(athlete: int = athletes.DEFAULT_ATHLETE_ID) -> None:
+    piano_df = await cache.get(practice.days_since_practice, athlete)
 
     with ui.row():
         ui.label("Piano Practice").classes(
@@ -166,291 +64,13 @@ def piano() -> None:
                 ''')
 
 
-def fitness() -> None:
-    conn = sqlite3.connect(dataBasePath)
-    dfSQL = pd.read_sql_query("SELECT * FROM WORKOUTS", conn)
-    conn.close()
-    df = dfSQL.drop(columns=["ID"])
-    df = df.sort_values(by=["DATE"])
-    df_last8 = df.drop(
-        columns=[
-            "FRONTLINE_SETS",
-            "FRONTLINE_WEIGHT",
-            "SHOULDERZPRESS_SETS",
-            "SHOULDERZPRESS_WEIGHT",
-            "ELBOWOUTROW_SETS",
-            "ELBOWOUTROW_WEIGHT",
-            "SUPINEBICEPCURL_SETS",
-            "SUPINEBICEPCURL_WEIGHT",
-            "CLOSEGRIPPUSHUP_SETS",
-            "CLOSEGRIPPUSHUP_STAIR",
-            "REARDELTFLY_SETS",
-            "REARDELTFLY_WEIGHT",
-            "SIDEBEND_SETS",
-            "SIDEBEND_WEIGHT",
-            "LATERALRAISE_SETS",
-            "LATERALRAISE_WEIGHT",
-            "STIFFLEGRDL_SETS",
-            "STIFFLEGRDL_WEIGHT",
-            "SLIDERHAMSTRINGCURL_SETS",
-            "SLIDERHAMSTRINGCURL_WEIGHT",
-            "HIPTHRUSTER_SETS",
-            "HIPTHRUSTER_WEIGHT",
-            "FORWARDSQUAT_SETS",
-            "FORWARDSQUAT_WEIGHT",
-            "SUMOSQUAT_SETS",
-            "SUMOSQUAT_WEIGHT",
-            "CYCLISTSQUAT_SETS",
-            "CYCLISTSQUAT_WEIGHT",
-            "SINGLELEGCALFRAISE_SETS",
-            "SINGLELEGCALFRAISE_WEIGHT",
-            "LONGLEVERCRUNCHES_SETS",
-            "ABDOMINALS_WEIGHT",
-            "SIDELINESCULPT_WEIGHT",
-            "LONGLEVERCRUNCHES_WEIGHT",
-        ]
-    )
-    df_last8 = df_last8.rename(
-        columns={
-            "DATE": "Date",
-            "FRONTLINE_REPS": "Frontline POW Raise",
-            "SHOULDERZPRESS_REPS": "Arnold Press",
-            "ELBOWOUTROW_REPS": "Elbow Out Row",
-            "SUPINEBICEPCURL_REPS": "Supinating Bicep Curl",
-            "CLOSEGRIPPUSHUP_REPS": "Close Grip Pushup",
-            "REARDELTFLY_REPS": "Rear Delt Fly",
-            "SIDEBEND_REPS": "Side Bend",
-            "LATERALRAISE_REPS": "Lateral Raise",
-            "STIFFLEGRDL_REPS": "Stiff Legged RDL",
-            "SLIDERHAMSTRINGCURL_REPS": "Hamstring Curls",
-            "HIPTHRUSTER_REPS": "Hip Thrusters",
-            "FORWARDSQUAT_REPS": "Forward Squat",
-            "SUMOSQUAT_REPS": "Sumo Squat",
-            "CYCLISTSQUAT_REPS": "Cyclist Squat",
-            "SINGLELEGCALFRAISE_REPS": "Single Leg Calf Raise",
-            "LONGLEVERCRUNCHES_REPS": "Long Lever Crunches",
-            "SIDELINESCULPT": "Sideline Sculpt",
-            "ABDOMINALS": "Abdominals",
-            "WALK": "Walk",
-            "WALK_DISTANCE": "Distance Walked",
-        }
-    )
-    df = df.rename(
-        columns={
-            "DATE": "Date",
-            "FRONTLINE_REPS": "Frontline reps",
-            "FRONTLINE_SETS": "Frontline sets",
-            "FRONTLINE_WEIGHT": "Frontline Weight",
-            "DOWNDOGPUSHUP_REPS": "Downdog reps",
-            "DOWNDOGPUSHUP_SETS": "Downdog sets",
-            "SHOULDERZPRESS_REPS": "Shoulder press reps",
-            "SHOULDERZPRESS_SETS": "Shoulder press sets",
-            "SHOULDERZPRESS_WEIGHT": "Shoulder press Weight",
-            "ELBOWOUTROW_REPS": "Elbow Out Row reps",
-            "ELBOWOUTROW_SETS": "Elbow Out Row sets",
-            "ELBOWOUTROW_WEIGHT": "Elbow Out Row Weight",
-            "SUPINEBICEPCURL_REPS": "Bicep Curl reps",
-            "SUPINEBICEPCURL_SETS": "Bicep Curl sets",
-            "SUPINEBICEPCURL_WEIGHT": "Bicep Curl Weight",
-            "CLOSEGRIPPUSHUP_REPS": "Close Grip Pushup reps",
-            "CLOSEGRIPPUSHUP_SETS": "Close Grip Pshup sets",
-            "CLOSEGRIPPUSHUP_STAIR": "Close Grip Pushup Stair",
-            "REARDELTFLY_REPS": "Rear Delt Fly reps",
-            "REARDELTFLY_SETS": "Rear Delt Fly sets",
-            "REARDELTFLY_WEIGHT": "Rear Delt Fly Weight",
-            "SIDEBEND_REPS": "Side Bend reps",
-            "SIDEBEND_SETS": "Side Bend sets",
-            "SIDEBEND_WEIGHT": "Side Bend Weight",
-            "LATERALRAISE_REPS": "Lateral Raise reps",
-            "LATERALRAISE_SETS": "Lateral Raise sets",
-            "LATERALRAISE_WEIGHT": "Lateral Raise Weight",
-            "STIFFLEGRDL_REPS": "Stiff Leg RDL reps",
-            "STIFFLEGRDL_SETS": "Stiff Leg RDL sets",
-            "STIFFLEGRDL_WEIGHT": "Stiff Leg RDL Weight",
-            "SLIDERHAMSTRINGCURL_REPS": "Slider Hamstring Curls reps",
-            "SLIDERHAMSTRINGCURL_SETS": "Slider Hamstring Curls sets",
-            "SLIDERHAMSTRINGCURL_WEIGHT" : "Slider Hamstring Curls Weight",
-            "HIPTHRUSTER_REPS": "Hip Thruster reps",
-            "HIPTHRUSTER_SETS": "Hip thruster sets",
-            "HIPTHRUSTER_WEIGHT": "Hip thruster Weight",
-            "FORWARDSQUAT_REPS": "Front Squat reps",
-            "FORWARDSQUAT_SETS": "Front Squat sets",
-            "FORWARDSQUAT_WEIGHT": "Front Squat Weight",
-            "SUMOSQUAT_REPS": "Sumo Squat reps",
-            "SUMOSQUAT_SETS": "Sumo Squat sets",
-            "SUMOSQUAT_WEIGHT": "Sumo Squat Weight",
-            "CYCLISTSQUAT_REPS": "Cyclist Squat reps",
-            "CYCLISTSQUAT_SETS": "Cyclist Squat sets",
-            "CYCLISTSQUAT_WEIGHT": "Cyclist Squat Weight",
-            "SINGLELEGCALFRAISE_REPS": "Single-Leg Calf Raise reps",
-            "SINGLELEGCALFRAISE_SETS": "Single-Leg Calf Raise sets",
-            "LONGLEVERCRUNCHES_REPS": "Long Lever Crunches reps",
-            "LONGLEVERCRUNCHES_SETS": "Long Lever Crunches sets",
-            "SIDELINESCULPT": "Sideline Scupt",
-            "SIDELINESCULPT_WEIGHT": "Sideline Scupt Weight",
-            "ABDOMINALS": "Abdominals",
-            "ABDOMINALS_WEIGHT": "Abdominals Weight",
-            "WALK": "Walk",
-            "WALK_DISTANCE": "Distance Walked",
-        }
-    )
-    lower_df = df_last8.drop(
-        columns=[
-            "Frontline POW Raise",
-            "Arnold Press",
-            "Elbow Out Row",
-            "Supinating Bicep Curl",
-            "Close Grip Pushup",
-            "Rear Delt Fly",
-            "Side Bend",
-            "Lateral Raise",
-            "Abdominals",
-            "Sideline Sculpt",
-            "Walk",
-            "Distance Walked",
-        ]
-    )
-    upper_df = df_last8.drop(
-        columns=[
-            "Stiff Legged RDL",
-            "Hamstring Curls",
-            "Hip Thrusters",
-            "Forward Squat",
-            "Sumo Squat",
-            "Cyclist Squat",
-            "Single Leg Calf Raise",
-            "Long Lever Crunches",
-            "Abdominals",
-            "Sideline Sculpt",
-            "Walk",
-            "Distance Walked",
-        ]
-    )
-    abs_df = df_last8.drop(
-        columns=[
-            "Stiff Legged RDL",
-            "Hamstring Curls",
-            "Hip Thrusters",
-            "Forward Squat",
-            "Sumo Squat",
-            "Cyclist Squat",
-            "Single Leg Calf Raise",
-            "Long Lever Crunches",
-            "Frontline POW Raise",
-            "Arnold Press",
-            "Elbow Out Row",
-            "Supinating Bicep Curl",
-            "Close Grip Pushup",
-            "Rear Delt Fly",
-            "Side Bend",
-            "Lateral Raise",
-            "Walk",
-            "Distance Walked",
-        ]
-    )
-    walk_df = df_last8.drop(
-        columns=[
-            "Stiff Legged RDL",
-            "Hamstring Curls",
-            "Hip Thrusters",
-            "Forward Squat",
-            "Sumo Squat",
-            "Cyclist Squat",
-            "Single Leg Calf Raise",
-            "Long Lever Crunches",
-            "Frontline POW Raise",
-            "Arnold Press",
-            "Elbow Out Row",
-            "Supinating Bicep Curl",
-            "Close Grip Pushup",
-            "Rear Delt Fly",
-            "Side Bend",
-            "Lateral Raise",
-            "Abdominals",
-            "Sideline Sculpt",
-            "Distance Walked",
-        ]
-    )
-
-    def reshape_and_rename(input_df):
-        """
-        Reshape and rename a DataFrame containing exercise data.
-
-        Parameters
-        ----------
-        input_df : pandas.DataFrame
-            Input DataFrame containing exercise data with columns 'Date', exercise names as columns,
-            and corresponding values representing exercise metrics.
-
-        Returns
-        -------
-        pandas.DataFrame
-            Reshaped and renamed DataFrame with the following columns:
-            - 'Exercises': Exercise names.
-            - 'Most Recent': The most recent date for each exercise.
-            - 'Days Since Last': Number of days since the last exercise recorded.
-
-        Notes
-        -----
-        This function performs the following steps:
-        1. Melt the input DataFrame to transform it into a long format.
-        2. Remove rows with 'value' equal to 0.
-        3. Group by 'Exercises' and find the most recent date for each exercise.
-        4. Merge the melted DataFrame with the most recent dates.
-        5. Drop unnecessary columns ('Date', 'value') and sort by the most recent date.
-        6. Keep only the first occurrence of each exercise, removing duplicates.
-        7. Calculate the 'Days Since Last' based on the time elapsed since the previous record.
-
-        Examples
-        --------
-        >>> import pandas as pd
-        >>> from datetime import datetime, timedelta
-        >>> # Creating a sample DataFrame
-        >>> data = {'Date': ['2023-01-01', '2023-01-02', '2023-01-03'],
-        ...         'Exercise_A': [10, 15, 0],
-        ...         'Exercise_B': [5, 0, 20]}
-        >>> df = pd.DataFrame(data)
-        >>> df['Date'] = pd.to_datetime(df['Date'])
-        >>> # Applying reshape_and_rename function
-        >>> result_df = reshape_and_rename(df)
-        >>> print(result_df)
-        """
-
-        melted_df = pd.melt(
-            input_df,
-            id_vars=["Date"],
-            var_name="Exercises",
-            value_name="value",
-        )
-        melted_df = melted_df[melted_df["value"] != 0]
-        melted_df = melted_df[melted_df["value"].notna()]
-        recent_df = (
-            melted_df.groupby("Exercises")
-            .agg({"Date": "max"})
-            .reset_index()
-        )
-        recent_df.columns = ["Exercises", "Most_Recent"]
-        reformed_df = pd.merge(melted_df, recent_df, on="Exercises")
-        reformed_df = reformed_df.drop("Date", axis=1)
-        reformed_df = reformed_df.drop("value", axis=1)
-        reformed_df = reformed_df.sort_values(by=["Most_Recent"])
-        reformed_df = reformed_df.drop_duplicates(
-            subset=["Exercises"], keep="first"
-        )
-        reformed_df["Days_Since_Last"] = (
-                datetime.datetime.now()
-                - pd.to_datetime(reformed_df["Most_Recent"])
-        ).dt.days
-        reformed_df = reformed_df.drop("Most_Recent", axis=1)
-        return reformed_df
-
-    """Drop Rows for Easier Data Presentation"""
-    upper_df = reshape_and_rename(upper_df)
-    lower_df = reshape_and_rename(lower_df)
-    abs_df = reshape_and_rename(abs_df)
-    walk_df = reshape_and_rename(walk_df)
+async def fitness(athlete: int = athletes.DEFAULT_ATHLETE_ID) -> None:
+    upper_df = await cache.get(workouts.days_since_last, "upper", athlete)
+    lower_df = await cache.get(workouts.days_since_last, "lower", athlete)
+    abs_df = await cache.get(workouts.days_since_last, "abs", athlete)
+    walk_df = await cache.get(workouts.days_since_last, "walk", athlete)
     with ui.row().classes("w-full no-wrap"):
-        ui.button("HOME", on_click=lambda: ui.open("/")).props('color=secondary')
+        ui.button("HOME", on_click=lambda: ui.open("/" + athlete_query(athlete))).props('color=secondary')
         ui.button("EXIT", on_click=app.shutdown).props('color=secondary')
     with ui.row():
         ui.label("Most Recent Exercises").classes(
@@ -554,8 +174,10 @@ def fitness() -> None:
                     ''')
 
 
-def content() -> None:
-    with theme.frame("- DASHBOARD -"):
-        fitness()
+async def content(athlete: int = athletes.DEFAULT_ATHLETE_ID) -> None:
+    names = await cache.get(athletes.list_athletes)
+    with theme.frame("- DASHBOARD -", athlete):
+        athlete_select("/", athlete, names)
+        await fitness(athlete)
         ui.separator().classes("w-full h-2").props("color=accent")
-        piano()
+        await piano(athlete)
@@ -23,8 +23,10 @@ teachers of students with Visual Impairments
 """
 from nicegui import ui
 
+from appTheming.widgets import athlete_query
 
-def menu() -> None:
+
+def menu(athlete_id: int = None) -> None:
     """
     Create and display the application menu.
 
@@ -34,6 +36,11 @@ def menu() -> None:
     progress, tactile skills (abacus and braille), technology skills (keyboarding, screen reader,
     braille note touch, iOS VoiceOver), digital literacy, and instructional materials.
 
+    Parameters
+    ----------
+    athlete_id : int, optional
+        The selected athlete, kept in the links to the other pages.
+
     Returns
     -------
     None
@@ -46,14 +53,14 @@ def menu() -> None:
             "absolute-right self-center scale=150"
     ).style('font-style:normal, font-family: "Atkinson Hyperlegible"'):
         with ui.menu().classes("w-[250px]") as menu:
-            ui.menu_item("HOME", lambda: ui.open("/")).classes(
+            ui.menu_item("HOME", lambda: ui.open("/" + athlete_query(athlete_id))).classes(
                 replace="text-black"
             ).style('font-family: "Atkinson Hyperlegible"')
             ui.separator()
-            ui.menu_item("FITNESS", lambda: ui.open("/fitness")).classes(
+            ui.menu_item("FITNESS", lambda: ui.open("/fitness" + athlete_query(athlete_id))).classes(
                 replace="text-black"
             ).style('font-family: "Atkinson Hyperlegible"')
             ui.separator()
-            ui.menu_item("PIANO", lambda: ui.open("/piano")).classes(
+            ui.menu_item("PIANO", lambda: ui.open("/piano" + athlete_query(athlete_id))).classes(
                 replace="text-black"
             ).style('font-family: "Atkinson Hyperlegible"')
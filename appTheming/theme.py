@@ -55,7 +55,7 @@ def github() -> ui.html:
 
 
 @contextmanager
-def frame(navtitle: str) -> None:
+def frame(navtitle: str, athlete_id: int = None) -> None:
     """
     Custom page frame to share the same styling and behavior across all pages.
 
@@ -67,6 +67,8 @@ def frame(navtitle: str) -> None:
     ----------
     navtitle : str
         The title to be displayed in the navigation bar.
+    athlete_id : int, optional
+        The athlete selected on the page, kept by the navigation menu.
 
     Yields
     ------
@@ -241,7 +243,7 @@ def frame(navtitle: str) -> None:
         ui.label(navtitle).classes(
             "absolute-center no-wrap text-3xl text-white font-bold self-center"
         ).classes().style('font-family: "Atkinson Hyperlegible"')
-        menu()
+        menu(athlete_id)
     with ui.column().classes(""):
         yield
 
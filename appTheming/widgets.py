@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+from nicegui import ui
+
+from appHelpers import database
+
+
+def athlete_query(athlete_id: int = None) -> str:
+    """
+    Build the query string that keeps the selected athlete across pages.
+
+    Parameters
+    ----------
+    athlete_id : int, optional
+        The selected athlete; no query string when omitted.
+
+    Returns
+    -------
+    str
+        "?athlete=<id>" or an empty string.
+
+    Examples
+    --------
+    >>> athlete_query(4)
+    '?athlete=4'
+    """
+    return "" if athlete_id is None else f"?athlete={athlete_id:d}"
+
+
+def athlete_select(path: str, athlete_id: int, names: dict) -> ui.select:
+    """
+    Show the athlete selector; picking an athlete reopens `path` for that athlete.
+
+    Parameters
+    ----------
+    path : str
+        The page to reopen, e.g. "/fitness".
+    athlete_id : int
+        The athlete currently shown.
+    names : dict
+        Athlete IDs mapped to names, as returned by `athletes.list_athletes`.
+
+    Returns
+    -------
+    ui.select
+        The selector element.
+
+    Examples
+    --------
+    >>> athlete_select("/piano", 1, {1: "Default", 2: "AvaWilson"})
+    """
+
+    def open_athlete(event) -> None:
+        if event.value is not None and event.value != athlete_id:
+            ui.open(path + athlete_query(event.value))
+
+    return (
+        ui.select(
+            names,
+            value=athlete_id if athlete_id in names else None,
+            label="Athlete",
+            with_input=True,
+            on_change=open_athlete,
+        )
+        .classes("w-64 text-lg")
+        .style('font-family : "Atkinson Hyperlegible"')
+    )
+
+
+async def log_table(columns: dict, read_page) -> ui.table:
+    """
+    Show a log as a table that is paged, sorted and filtered on the server.
+
+    Only the visible page is sent to the browser. Quasar's @request event
+    (a page, sort or filter change) reads the next page from `read_page` and
+    replaces the rows, so the payload and the memory held per client stay
+    the same however long the log grows. The filter box matches dates by
+    prefix, e.g. "2023-05", and only sends once typing pauses. The first page
+    is `database.FIRST_PAGE`, the request the cache is warmed with.
+
+    Parameters
+    ----------
+    columns : dict
+        Column names, as returned by `read_page`, mapped to their labels, in
+        display order. They must include the sort column of
+        `database.FIRST_PAGE`; the rows must also have an ID.
+    read_page : callable
+        Awaited with the page, rows per page, sort column, descending and
+        date filter; returns the rows (pandas.DataFrame) and the total
+        number of rows matching the filter.
+
+    Returns
+    -------
+    ui.table
+        The table element.
+
+    Examples
+    --------
+    >>> await log_table(
+    ...     {"DATE": "Date", "LESSON": "Lesson"},
+    ...     lambda *page: cache.get(practice.read_practice_page, 1, *page),
+    ... )
+    """
+    page, rows_per_page, sort_by, descending, _ = database.FIRST_PAGE
+    rows, total = await read_page(*database.FIRST_PAGE)
+    date_filter = ui.input(
+        label="Filter by date", placeholder="e.g. 2023-05"
+    ).classes("w-64 text-base").props("clearable stack-label debounce=400").style('font-family : "Atkinson Hyperlegible"')
+    table = (
+        ui.table(
+            columns=[
+                {"name": column,
+                "label": label,
+                "field": column,
+                "sortable": True,
+                "headerClasses": "border-b border-secondary",
+                "align": 'left'}
+                for column, label in columns.items()
+            ],
+            rows=rows[["ID", *columns]].to_dict("records"),
+            row_key="ID",
+            pagination={
+                "page": page,
+                "rowsPerPage": rows_per_page,
+                "sortBy": sort_by,
+                "descending": descending,
+                "rowsNumber": total,
+            },
+        )
+        .props(":rows-per-page-options=[10,25,50,100]")
+        .style("font-family: JetBrainsMono; background-color: #f5f5f5")
+        .classes('my-table')
+    )
+    date_filter.bind_value_to(table, "filter")
+
+    async def request(event) -> None:
+        pagination = event.args["pagination"]
+        sort_column = pagination.get("sortBy") or sort_by
+        newest_first = pagination.get("descending", False) if pagination.get("sortBy") else descending
+        rows, total = await read_page(
+            pagination["page"], pagination["rowsPerPage"], sort_column, newest_first, event.args.get("filter") or ""
+        )
+        table.rows = rows[["ID", *columns]].to_dict("records")
+        table.pagination = {**pagination, "rowsNumber": total}
+
+    table.on("request", request, ["pagination", "filter"])
+    return table
@@ -0,0 +1,867 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Micro benchmarks for the data layer of the Habit and Fitness Tracker.
+
+Every benchmark runs against a throw-away database in a temporary directory,
+never against the workout log in the user's Documents folder.
+
+    python benchmark.py connections --iterations 500
+    python benchmark.py eventloop --clients 25
+    python benchmark.py groupcommit --clients 25
+    python benchmark.py daterange --sessions 20000
+    python benchmark.py athletes --athletes 2000
+    python benchmark.py lastperformed --rows 1000 100000 1000000
+    python benchmark.py cache --sessions 2000
+    python benchmark.py tonnage --athletes 50 --years 5
+    python benchmark.py progression --years 5
+    python benchmark.py streaks --years 5
+    python benchmark.py charts --years 20
+    python benchmark.py calendar --years 5 20
+    python benchmark.py recommendations --years 1 20
+    python benchmark.py pages --years 1 20
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+module_path = os.path.abspath(os.path.dirname(__file__))
+if module_path not in sys.path:
+    sys.path.append(module_path)
+from appHelpers import activity, analytics, athletes, cache, charts, database, practice, progression, recommendations, streaks, workouts
+from appHelpers.exercises import exercises, workout_columns as exercise_columns
+from appHelpers.sqlgenerate import implement_tables
+
+
+def timed(label: str, func, iterations: int) -> float:
+    """
+    Run `func` repeatedly and print the mean time per call.
+
+    Parameters
+    ----------
+    label : str
+        The name printed next to the timing.
+    func : callable
+        The zero-argument function being measured.
+    iterations : int
+        How many times to call `func`.
+
+    Returns
+    -------
+    float
+        Mean seconds per call.
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = (time.perf_counter() - start) / iterations
+    print(f"{label:<40} {elapsed * 1e6:>10.1f} us/call")
+    return elapsed
+
+
+def bench_connections(args) -> None:
+    """
+    Compare per-call `sqlite3.connect` against the shared connection manager.
+
+    Each iteration is one "page view" (a SELECT on PIANO) and one "SAVE" (an
+    INSERT into PIANO), exactly as the pages issue them.
+    """
+    db_file = Path(args.workdir).joinpath("bench.db")
+    database.configure(db_file)
+    implement_tables()
+    insert = "INSERT INTO PIANO (DATE, PIANO, LESSON, RECITAL) VALUES (?, ?, ?, ?)"
+    row = ("2023-01-05", 1, "Minuet", "")
+
+    def per_call_read():
+        conn = sqlite3.connect(db_file)
+        conn.execute("SELECT * FROM PIANO ORDER BY ID DESC LIMIT 50").fetchall()
+        conn.close()
+
+    def per_call_write():
+        conn = sqlite3.connect(db_file)
+        conn.execute(insert, row)
+        conn.commit()
+        conn.close()
+
+    def pooled_read():
+        with database.reader() as conn:
+            conn.execute("SELECT * FROM PIANO ORDER BY ID DESC LIMIT 50").fetchall()
+
+    def pooled_write():
+        with database.writer() as conn:
+            conn.execute(insert, row)
+
+    before_read = timed("page view, connect per call", per_call_read, args.iterations)
+    after_read = timed("page view, pooled reader", pooled_read, args.iterations)
+    before_write = timed("save, connect per call", per_call_write, args.iterations)
+    after_write = timed("save, shared writer", pooled_write, args.iterations)
+    print(f"read speedup  {before_read / after_read:5.1f}x")
+    print(f"write speedup {before_write / after_write:5.1f}x")
+    database.close_all()
+
+
+def bench_eventloop(args) -> None:
+    """
+    Measure event-loop stalls while many clients load pages during saves.
+
+    A ticker task records how late each 5 ms tick fires, which is the delay
+    every connected browser would see. The same mix of page reads and saves is
+    run once with blocking calls on the loop and once through the awaitable
+    `database.query` / `database.write` API.
+    """
+    db_file = Path(args.workdir).joinpath("bench.db")
+    database.configure(db_file)
+    implement_tables()
+    with database.writer() as conn:
+        conn.executemany(
+            "INSERT INTO PIANO (DATE, PIANO, LESSON, RECITAL) VALUES (?, ?, ?, ?)",
+            [(f"2023-01-{1 + i % 28:02d}", 1, "Minuet", "") for i in range(5000)],
+        )
+    page_sql = "SELECT * FROM PIANO ORDER BY DATE DESC"
+    row = ("2023-01-05", 1, "Minuet", "")
+
+    def insert(conn, *values):
+        conn.execute(
+            "INSERT INTO PIANO (DATE, PIANO, LESSON, RECITAL) VALUES (?, ?, ?, ?)",
+            values,
+        )
+
+    async def blocking_client():
+        for _ in range(args.requests):
+            database.read_sql(page_sql)
+            with database.writer() as conn:
+                insert(conn, *row)
+            await asyncio.sleep(0)
+
+    async def async_client():
+        for _ in range(args.requests):
+            await database.query(page_sql)
+            await database.write(insert, *row)
+
+    async def measure(client):
+        lags = []
+        done = asyncio.Event()
+
+        async def ticker():
+            while not done.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(0.005)
+                lags.append(time.perf_counter() - start - 0.005)
+
+        tick = asyncio.create_task(ticker())
+        await asyncio.gather(*(client() for _ in range(args.clients)))
+        done.set()
+        await tick
+        lags.sort()
+        return lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+
+    before = asyncio.run(measure(blocking_client))
+    after = asyncio.run(measure(async_client))
+    print(f"{args.clients} clients, blocking calls  p99 loop lag {before * 1e3:8.1f} ms")
+    print(f"{args.clients} clients, awaitable API   p99 loop lag {after * 1e3:8.1f} ms")
+    database.close_all()
+
+
+def bench_groupcommit(args) -> None:
+    """
+    Compare one transaction per save against the group-committing writer thread.
+
+    `--clients` threads each save `--requests` practice rows, first with a
+    commit per row and then through `database.submit`. `--synchronous FULL`
+    makes every commit fsync, which is closer to a synced Documents folder.
+    """
+    db_file = Path(args.workdir).joinpath("bench.db")
+    database.configure(db_file)
+    implement_tables()
+    database.get_writer().execute(f"PRAGMA synchronous={args.synchronous}")
+    row = ("2023-01-05", 1, "Minuet", "")
+    total = args.clients * args.requests
+
+    def insert(conn, *values):
+        conn.execute(
+            "INSERT INTO PIANO (DATE, PIANO, LESSON, RECITAL) VALUES (?, ?, ?, ?)",
+            values,
+        )
+
+    def per_save_client():
+        for _ in range(args.requests):
+            with database.writer() as conn:
+                insert(conn, *row)
+
+    def queued_client():
+        for _ in range(args.requests):
+            database.submit(insert, *row).result()
+
+    for label, client in [
+        ("commit per save", per_save_client),
+        ("writer thread, group commit", queued_client),
+    ]:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as pool:
+            for future in [pool.submit(client) for _ in range(args.clients)]:
+                future.result()
+        elapsed = time.perf_counter() - start
+        print(f"{label:<40} {total / elapsed:>10.0f} saves/s")
+    stats = database.write_stats()
+    print(
+        f"{stats['batches']} batches, mean {stats['writes'] / stats['batches']:.1f}"
+        f" and max {stats['max_batch']} saves per commit"
+    )
+    database.close_all()
+
+
+def bench_daterange(args) -> None:
+    """
+    Compare filtering the last 90 days in pandas against a SQL date range.
+
+    The log holds `--sessions` workouts, one a day, ending today.
+    """
+    db_file = Path(args.workdir).joinpath("bench.db")
+    database.configure(db_file)
+    implement_tables()
+    today = datetime.date.today()
+    with database.writer() as conn:
+        for day in range(args.sessions):
+            workouts.insert_workout(
+                conn,
+                today - datetime.timedelta(days=day),
+                {"FRONTLINE_REPS": 12, "FRONTLINE_SETS": 3, "FRONTLINE_WEIGHT": 15, "WALK": 1},
+            )
+    start = today - datetime.timedelta(days=89)
+
+    def pandas_filter():
+        df = database.read_sql("SELECT * FROM WORKOUTS")
+        df = df[pd.to_datetime(df["DATE"]) >= pd.Timestamp(start)]
+        return df.sort_values(by=["DATE"], ascending=False)
+
+    def sql_range():
+        return workouts.read_workouts(start=start)
+
+    assert len(pandas_filter()) == len(sql_range()) == 90
+    before = timed("last 90 days, load all + pandas", pandas_filter, args.iterations)
+    after = timed("last 90 days, SQL date range", sql_range, args.iterations)
+    print(f"speedup {before / after:5.1f}x")
+    database.close_all()
+
+
+def _fill_roster(count: int, sessions: int) -> None:
+    """
+    Log `sessions` workouts and practices, every other day, for each of `count` athletes.
+    """
+    today = datetime.date.today()
+    dates = [
+        (today - datetime.timedelta(days=2 * day)).isoformat() for day in range(sessions)
+    ]
+    with database.writer() as conn:
+        conn.executemany(
+            "INSERT INTO ATHLETES (NAME) VALUES (?)",
+            [(f"Athlete{i:05d}",) for i in range(count - 1)],
+        )
+        athlete_ids = [row[0] for row in conn.execute("SELECT ID FROM ATHLETES")][:count]
+    for athlete_id in athlete_ids:
+        with database.writer() as conn:
+            start = conn.execute("SELECT COALESCE(MAX(ID), 0) FROM WORKOUT_SESSIONS").fetchone()[0]
+            conn.executemany(
+                "INSERT INTO WORKOUT_SESSIONS (ID, ATHLETE_ID, DATE) VALUES (?, ?, ?)",
+                [(start + 1 + i, athlete_id, date) for i, date in enumerate(dates)],
+            )
+            conn.executemany(
+                workouts.sql_insert_entry,
+                [
+                    (start + 1 + i, athlete_id, date, exercise_id, metric, 10 + i % 5)
+                    for i, date in enumerate(dates)
+                    for exercise_id, metric in [(1, "REPS"), (1, "SETS"), (1, "WEIGHT"), (19, "DONE")]
+                ],
+            )
+            conn.executemany(
+                "INSERT INTO PIANO (ATHLETE_ID, DATE, PIANO, LESSON, RECITAL) VALUES (?, ?, 1, '', '')",
+                [(athlete_id, date) for date in dates],
+            )
+
+
+def bench_athletes(args) -> None:
+    """
+    Show that per-athlete page queries stay flat as the roster grows.
+
+    Rosters of a tenth of `--athletes` and of `--athletes` each log
+    `--sessions` workouts and practices per athlete, every other day. The
+    queries behind /fitness and /piano are timed for random athletes, and the
+    practice log is also read with the athlete index disabled for comparison.
+    """
+    start = datetime.date.today() - datetime.timedelta(days=89)
+    results = []
+    for count in [max(args.athletes // 10, 1), args.athletes]:
+        database.configure(Path(args.workdir).joinpath(f"athletes-{count}.db"))
+        implement_tables()
+        fill_start = time.perf_counter()
+        _fill_roster(count, args.sessions)
+        print(
+            f"{count:,} athletes, {count * args.sessions:,} sessions"
+            f" logged in {time.perf_counter() - fill_start:.1f} s"
+        )
+        rng = random.Random(count)
+        ids = [rng.randint(1, count) for _ in range(args.iterations)]
+        picks = iter(ids * 3)
+        assert len(workouts.read_workouts(start, None, ids[0])) == 45
+        workout_time = timed(
+            "  workouts, last 90 days",
+            lambda: workouts.read_workouts(start, None, next(picks)),
+            args.iterations,
+        )
+        cards_time = timed(
+            "  most recent exercise cards",
+            lambda: workouts.days_since_last(None, next(picks)),
+            args.iterations,
+        )
+        practice_time = timed(
+            "  practice log",
+            lambda: practice.read_practice(None, None, next(picks)),
+            args.iterations,
+        )
+        results.append((count, workout_time, cards_time, practice_time))
+        scan_picks = iter(ids)
+        scan_time = timed(
+            "  practice log, athlete index disabled",
+            lambda: database.read_sql(
+                "SELECT * FROM PIANO WHERE +ATHLETE_ID = ? ORDER BY DATE DESC, ID DESC",
+                (next(scan_picks),),
+            ),
+            args.iterations,
+        )
+        database.close_all()
+    (small, *before), (large, *after) = results
+    print(
+        f"{large / small:.0f}x the athletes:"
+        + "".join(f" {b * 1e3:.2f} -> {a * 1e3:.2f} ms" for b, a in zip(before, after))
+    )
+    print(f"athlete index speedup on the practice log {scan_time / practice_time:5.1f}x")
+
+
+def _reshape_and_rename(input_df: pd.DataFrame, now) -> pd.DataFrame:
+    """
+    The card builder the pages used to carry, kept as the reference result.
+    """
+    melted_df = pd.melt(input_df, id_vars=["Date"], var_name="Exercises", value_name="value")
+    melted_df = melted_df[(melted_df["value"] != 0) & melted_df["value"].notna()]
+    recent_df = melted_df.groupby(["Exercises"]).agg({"Date": "max"}).reset_index()
+    recent_df.columns = ["Exercises", "Most_Recent"]
+    reformed_df = pd.merge(melted_df, recent_df, on=["Exercises"])
+    reformed_df = reformed_df.drop(["Date", "value"], axis=1)
+    reformed_df = reformed_df.sort_values(by=["Most_Recent"])
+    reformed_df = reformed_df.drop_duplicates(subset=["Exercises"], keep="first")
+    reformed_df["Days_Since_Last"] = (now - pd.to_datetime(reformed_df["Most_Recent"])).dt.days
+    return reformed_df.drop("Most_Recent", axis=1)
+
+
+def _seeded_log(rows: int, now) -> pd.DataFrame:
+    """
+    Build a wide log of `rows` sessions, newest first, with one column per exercise display name.
+
+    There is one session a day (several a day past 100 years) and every
+    exercise is logged on about a third of them. The last one is only logged
+    in the ten oldest sessions and "Lateral Raise" never is.
+    """
+    rng = np.random.default_rng(rows)
+    names = [display_name for _, display_name, _ in exercises]
+    log = pd.DataFrame(
+        rng.choice([0, 0, 5, 10], size=(rows, len(names)), p=[0.4, 0.27, 0.2, 0.13]),
+        columns=names,
+    )
+    log.iloc[: max(rows - 10, 0), -1] = 0
+    log["Lateral Raise"] = 0
+    days = np.arange(rows) * min(rows, 36500) // rows
+    log.insert(0, "Date", (now.normalize() - pd.to_timedelta(days, unit="D")).strftime("%Y-%m-%d"))
+    return log
+
+
+def _store_log(log: pd.DataFrame, athlete_id: int = athletes.DEFAULT_ATHLETE_ID) -> None:
+    """
+    Write a `_seeded_log` frame as sessions and entries through the save triggers.
+
+    Each column is stored as the REPS of its exercise, or its DONE count for
+    exercises without reps, which is what marks an exercise as performed.
+    """
+    performed = {
+        exercise_id: metric
+        for exercise_id, metric in workouts.column_index.values()
+        if metric in ("REPS", "DONE")
+    }
+    exercise_ids = [workouts.exercise_ids[key] for key, _, _ in exercises]
+    values = log.drop(columns="Date").to_numpy()
+    dates = log["Date"].to_numpy()
+    with database.writer() as conn:
+        start = conn.execute("SELECT COALESCE(MAX(ID), 0) FROM WORKOUT_SESSIONS").fetchone()[0]
+        conn.executemany(
+            "INSERT INTO WORKOUT_SESSIONS (ID, ATHLETE_ID, DATE) VALUES (?, ?, ?)",
+            ((start + 1 + i, athlete_id, date) for i, date in enumerate(dates)),
+        )
+        rows, columns = np.nonzero(values)
+        conn.executemany(
+            workouts.sql_insert_entry,
+            (
+                (start + 1 + int(row), athlete_id, dates[row], exercise_ids[column],
+                 performed[exercise_ids[column]], int(values[row, column]))
+                for row, column in zip(rows, columns)
+            ),
+        )
+
+
+def bench_lastperformed(args) -> None:
+    """
+    Compare the melt and merge card builder against the EXERCISE_STATE cards.
+
+    Each size is a `_seeded_log` of `--rows` sessions. The legacy builder runs
+    on the wide log already in memory; `workouts.days_since_last` reads the
+    same log after it is saved through the EXERCISE_STATE triggers. Both must
+    return the same card before they are timed.
+    """
+    now = pd.Timestamp.now()
+    for rows in args.rows:
+        database.configure(Path(args.workdir).joinpath(f"lastperformed-{rows}.db"))
+        implement_tables()
+        log = _seeded_log(rows, now)
+        fill_start = time.perf_counter()
+        _store_log(log)
+        print(f"{rows:>9,} rows logged in {time.perf_counter() - fill_start:.1f} s")
+        legacy = _reshape_and_rename(log, now)
+        card = workouts.days_since_last()
+        key = ["Days_Since_Last", "Exercises"]
+        assert legacy.sort_values(key).reset_index(drop=True).equals(
+            card.sort_values(key).reset_index(drop=True)
+        ), f"cards differ at {rows} rows"
+        iterations = max(1, min(args.iterations, 10_000_000 // (rows * len(exercises))))
+        before = timed(f"{rows:>9,} rows, melt + merge", lambda: _reshape_and_rename(log, now), iterations)
+        after = timed(f"{rows:>9,} rows, EXERCISE_STATE", workouts.days_since_last, args.iterations)
+        print(f"{rows:>9,} rows, speedup {before / after:5.1f}x")
+        database.close_all()
+
+
+def bench_cache(args) -> None:
+    """
+    Compare uncached and cached page loads of the dashboard and the data tabs.
+
+    The default athlete logs `--sessions` workouts and practices. A page load
+    makes every read that /, /fitness and /piano make, and a save in between
+    shows the cache picking up the change.
+    """
+    database.configure(Path(args.workdir).joinpath("bench.db"))
+    implement_tables()
+    _fill_roster(1, args.sessions)
+    athlete = athletes.DEFAULT_ATHLETE_ID
+    reads = (
+        [(athletes.list_athletes, ())]
+        + [(workouts.days_since_last, (region, athlete)) for region in ["upper", "lower", "abs", "walk"]]
+        + [
+            (practice.days_since_practice, (athlete,)),
+            (workouts.current_levels, (athlete,)),
+            (workouts.read_workouts, (None, None, athlete)),
+            (practice.read_practice, (None, None, athlete)),
+        ]
+    )
+
+    def uncached():
+        for func, call_args in reads:
+            func(*call_args)
+
+    def cached():
+        for func, call_args in reads:
+            cache.cached(func, *call_args)
+
+    cache.warm(reads)
+    before = timed("page load, uncached", uncached, args.iterations)
+    after = timed("page load, cached", cached, args.iterations)
+    print(f"speedup {before / after:5.1f}x")
+    sessions = len(cache.cached(workouts.read_workouts, None, None, athlete))
+    database.submit(workouts.insert_workout, datetime.date.today(), {"WALK": 1}).result()
+    assert len(cache.cached(workouts.read_workouts, None, None, athlete)) == sessions + 1
+    print(cache.stats())
+    database.close_all()
+
+
+def _synthetic_loads(athletes_count: int, years: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a `workouts.read_loads` frame: four sessions a week for every athlete, each logging every weighted exercise.
+    """
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp.today().normalize()
+    days = np.flatnonzero(np.arange(years * 365) % 7 < 4)
+    weighted = np.array([i + 1 for i, (_, _, region) in enumerate(exercises) if region != "walk"])
+    athlete_ids = np.repeat(np.arange(1, athletes_count + 1), len(days) * len(weighted))
+    day = np.tile(np.repeat(days, len(weighted)), athletes_count)
+    size = len(athlete_ids)
+    return pd.DataFrame(
+        {
+            "ATHLETE_ID": athlete_ids,
+            "DATE": (today - pd.to_timedelta(day[::-1], unit="D")).strftime("%Y-%m-%d"),
+            "EXERCISE_ID": np.tile(weighted, size // len(weighted)),
+            "SETS": rng.integers(1, 5, size),
+            "REPS": rng.integers(5, 15, size),
+            "WEIGHT": rng.integers(0, 40, size),
+        }
+    )
+
+
+def _store_loads(history: pd.DataFrame) -> None:
+    """
+    Write a `_synthetic_loads` frame for one athlete as sessions and entries.
+    """
+    logged = set(workouts.column_index.values())
+    with database.writer() as conn:
+        sessions = {date: i + 1 for i, date in enumerate(history["DATE"].unique())}
+        conn.executemany(
+            "INSERT INTO WORKOUT_SESSIONS (ID, ATHLETE_ID, DATE) VALUES (?, 1, ?)",
+            [(session, date) for date, session in sessions.items()],
+        )
+        conn.executemany(
+            workouts.sql_insert_entry,
+            [
+                (sessions[row.DATE], 1, row.DATE, row.EXERCISE_ID, metric, getattr(row, metric))
+                for row in history.itertuples()
+                for metric in ["SETS", "REPS", "WEIGHT"]
+                if (row.EXERCISE_ID, metric) in logged
+            ],
+        )
+
+
+def bench_tonnage(args) -> None:
+    """
+    Time volume, tonnage and workload ratio over a multi-year, multi-athlete log.
+
+    The roster-wide numbers run on an in-memory `workouts.read_loads` frame so
+    only the analytics are measured; the Training Load card is then timed end
+    to end, database read included, for one athlete with the same history.
+    Tonnage totals are checked against a plain groupby first.
+    """
+    loads = _synthetic_loads(args.athletes, args.years)
+    print(f"{len(loads):,} exercise rows, {args.athletes} athletes, {args.years} years")
+    weekly = analytics.tonnage(loads, "week", "region")
+    reference = (
+        loads.assign(VOLUME=analytics.volume(loads)).groupby("ATHLETE_ID")["VOLUME"].sum()
+    )
+    assert np.allclose(weekly.sum(axis=1).groupby("ATHLETE_ID").sum(), reference)
+    timed("volume", lambda: analytics.volume(loads), args.iterations)
+    timed("weekly tonnage by region", lambda: analytics.tonnage(loads, "week", "region"), args.iterations)
+    timed("monthly tonnage by exercise", lambda: analytics.tonnage(loads, "month", "exercise"), args.iterations)
+    timed("acute:chronic workload ratio", lambda: analytics.workload_ratio(loads), args.iterations)
+
+    database.configure(Path(args.workdir).joinpath("bench.db"))
+    implement_tables()
+    _store_loads(_synthetic_loads(1, args.years))
+    timed(
+        "Training Load card, one athlete",
+        lambda: analytics.training_load(athletes.DEFAULT_ATHLETE_ID),
+        args.iterations,
+    )
+    database.close_all()
+
+
+def bench_progression(args) -> None:
+    """
+    Compare the incremental PROGRESSION_STATE update on save against a full rebuild.
+
+    One athlete logs every weighted exercise four days a week for `--years`;
+    the save is a whole session, so every exercise's window is refreshed. The
+    two paths must leave the same state behind before they are timed.
+    """
+    database.configure(Path(args.workdir).joinpath("bench.db"))
+    implement_tables()
+    _store_loads(_synthetic_loads(1, args.years))
+    session = {column: 10 for column, _, metric in exercise_columns if metric in ("SETS", "REPS", "WEIGHT")}
+    with database.writer() as conn:
+        conn.execute("SAVEPOINT bench")
+        workouts.insert_workout(conn, datetime.date.today(), session)
+        saved = pd.read_sql("SELECT * FROM PROGRESSION_STATE ORDER BY EXERCISE_ID", conn)
+        progression.rebuild_progression_state(conn)
+        rebuilt = pd.read_sql("SELECT * FROM PROGRESSION_STATE ORDER BY EXERCISE_ID", conn)
+        conn.execute("ROLLBACK TO bench")
+        conn.execute("RELEASE bench")
+    pd.testing.assert_frame_equal(saved, rebuilt)
+    exercises_logged = progression.weighted_exercises
+
+    def incremental():
+        with database.writer() as conn:
+            progression.update_progression_state(conn, athletes.DEFAULT_ATHLETE_ID, exercises_logged)
+
+    def rebuild():
+        with database.writer() as conn:
+            progression.rebuild_progression_state(conn, athletes.DEFAULT_ATHLETE_ID)
+
+    before = timed("full rebuild", rebuild, args.iterations)
+    after = timed("incremental update", incremental, args.iterations)
+    print(f"speedup {before / after:5.1f}x")
+    database.close_all()
+
+
+def bench_streaks(args) -> None:
+    """
+    Compare recording one day of activity against the bulk streak recompute.
+
+    One athlete logs every exercise four days a week and practices piano on
+    most days for `--years`. A saved workout and practice must leave the same
+    STREAK_STATE behind as a rebuild before the paths and the dashboard read
+    are timed; each incremental call is rolled back so it always adds a day.
+    """
+    database.configure(Path(args.workdir).joinpath("bench.db"))
+    implement_tables()
+    history = _synthetic_loads(1, args.years)
+    _store_loads(history)
+    rng = random.Random(0)
+    with database.writer() as conn:
+        conn.executemany(
+            "INSERT INTO PIANO (ATHLETE_ID, DATE, PIANO, LESSON, RECITAL) VALUES (1, ?, ?, '', '')",
+            [(date, int(rng.random() < 0.8)) for date in history["DATE"].unique()],
+        )
+        streaks.rebuild_streaks(conn)
+    today = datetime.date.today()
+    session = {column: 10 for column, _, _ in exercise_columns}
+    with database.writer() as conn:
+        conn.execute("SAVEPOINT bench")
+        workouts.insert_workout(conn, today, session)
+        practice.insert_practice(conn, today, 1, "", "")
+        saved = pd.read_sql("SELECT * FROM STREAK_STATE ORDER BY KIND, NAME", conn)
+        streaks.rebuild_streaks(conn)
+        rebuilt = pd.read_sql("SELECT * FROM STREAK_STATE ORDER BY KIND, NAME", conn)
+        conn.execute("ROLLBACK TO bench")
+        conn.execute("RELEASE bench")
+    pd.testing.assert_frame_equal(saved, rebuilt)
+    print(f"{database.read_sql('SELECT COUNT(*) AS N FROM ACTIVITY_DAYS')['N'][0]:,} activity days")
+    subjects = list(streaks.subject_labels)
+
+    def incremental():
+        with database.writer() as conn:
+            conn.execute("SAVEPOINT bench")
+            streaks.record_activity(conn, athletes.DEFAULT_ATHLETE_ID, today.isoformat(), subjects)
+            conn.execute("ROLLBACK TO bench")
+            conn.execute("RELEASE bench")
+
+    def rebuild():
+        with database.writer() as conn:
+            streaks.rebuild_streaks(conn, athletes.DEFAULT_ATHLETE_ID)
+
+    before = timed("full rebuild", rebuild, args.iterations)
+    after = timed("incremental update", incremental, args.iterations)
+    print(f"speedup {before / after:5.1f}x")
+    timed("dashboard read", lambda: streaks.read_streaks(athletes.DEFAULT_ATHLETE_ID), args.iterations)
+    database.close_all()
+
+
+def bench_charts(args) -> None:
+    """
+    Measure the chart payload with and without downsampling, and a zoom refetch.
+
+    One athlete logs an exercise every day for `--years`. The figure for the
+    whole series is built with every point and with `charts.MAX_POINTS`, and
+    the JSON sent over the websocket is compared; a zoom to the last 90 days
+    is then timed from the cached series, as the page does it.
+    """
+    database.configure(Path(args.workdir).joinpath("bench.db"))
+    implement_tables()
+    rng = random.Random(0)
+    today = datetime.date.today()
+    days = 365 * args.years
+    with database.writer() as conn:
+        for i in range(days):
+            workouts.insert_workout(
+                conn,
+                today - datetime.timedelta(days=days - i),
+                {"FRONTLINE_REPS": rng.randint(5, 20), "FRONTLINE_WEIGHT": rng.randint(5, 30)},
+            )
+    series = charts.exercise_series(1)
+    full = charts.figure(series, max_points=len(series))
+    sampled = charts.figure(series)
+    print(f"{len(series):,} days logged")
+    print(f"all points     {len(json.dumps(full)):>10,} bytes")
+    print(f"downsampled    {len(json.dumps(sampled)):>10,} bytes")
+    start = (today - datetime.timedelta(days=90)).isoformat()
+    timed("read series", lambda: charts.exercise_series(1), args.iterations)
+    timed("figure, all points", lambda: charts.figure(series, max_points=len(series)), args.iterations)
+    timed("figure, downsampled", lambda: charts.figure(series), args.iterations)
+    timed("zoom to 90 days", lambda: charts.figure(series, start, today.isoformat()), args.iterations)
+    database.close_all()
+
+
+def bench_calendar(args) -> None:
+    """
+    Time the dashboard calendar from ACTIVITY_YEARS against totalling the logs.
+
+    For each history length one athlete logs every exercise four days a week
+    and piano on most days. The stored day arrays must match a fresh rebuild;
+    then reading three years of arrays and building the heatmap is compared
+    with the GROUP BY over WORKOUT_ENTRIES the arrays replace.
+    """
+    for years in args.years:
+        database.configure(Path(args.workdir).joinpath(f"calendar{years}.db"))
+        implement_tables()
+        history = _synthetic_loads(1, years)
+        _store_loads(history)
+        rng = random.Random(0)
+        with database.writer() as conn:
+            conn.executemany(
+                "INSERT INTO PIANO (ATHLETE_ID, DATE, PIANO, LESSON, RECITAL) VALUES (1, ?, ?, '', '')",
+                [(date, int(rng.random() < 0.8)) for date in history["DATE"].unique()],
+            )
+            activity.rebuild_activity_years(conn)
+        rows = database.read_sql("SELECT COUNT(*) AS N FROM WORKOUT_ENTRIES")["N"][0]
+        print(f"{years} years, {rows:,} entries")
+        params = {"athlete": athletes.DEFAULT_ATHLETE_ID, "walk": activity.exercise_ids["WALK"]}
+        scan = activity.sql_day_amounts.format(where="ATHLETE_ID = :athlete")
+        timed("  total the log", lambda: database.read_sql(scan, params), args.iterations)
+        timed(
+            "  day arrays + heatmap",
+            lambda: charts.calendar_figure(activity.read_calendar("workout")),
+            args.iterations,
+        )
+        database.close_all()
+
+
+def bench_recommendations(args) -> None:
+    """
+    Time the next-session suggestions of /fitness for short and long histories.
+
+    The recent window is a fixed number of index seeks, so its read should
+    not grow with the log; the suggestions for every exercise are one batch.
+    """
+    for years in args.years:
+        database.configure(Path(args.workdir).joinpath(f"recommendations{years}.db"))
+        implement_tables()
+        _store_loads(_synthetic_loads(1, years))
+        rows = database.read_sql("SELECT COUNT(*) AS N FROM WORKOUT_ENTRIES")["N"][0]
+        print(f"{years} years, {rows:,} entries")
+        window = recommendations.recent_window()
+        timed("  read the recent window", recommendations.recent_window, args.iterations)
+        for rule in recommendations.progression_rules:
+            timed(f"  suggest, {rule}", lambda: recommendations.next_session(window, rule), args.iterations)
+        database.close_all()
+
+
+def bench_pages(args) -> None:
+    """
+    Compare the Cumulative Exercise Log payload of one page with the whole log.
+
+    For each history length the rows the table used to receive (every
+    session) are serialized next to the first page and a deep page, sorted
+    by date and by an exercise column, as the @request handler reads them.
+    """
+    for years in args.years:
+        database.configure(Path(args.workdir).joinpath(f"pages{years}.db"))
+        implement_tables()
+        _store_loads(_synthetic_loads(1, years))
+        full = workouts.read_workouts()
+        print(f"{years} years, {len(full):,} sessions")
+        first, total = workouts.read_workout_page()
+        assert total == len(full) and first["ID"].tolist() == full["ID"][:10].tolist()
+        print(f"  whole log    {len(full.to_json(orient='records')):>12,} bytes")
+        print(f"  one page     {len(first.to_json(orient='records')):>12,} bytes")
+        timed("  read the whole log", workouts.read_workouts, args.iterations)
+        timed("  first page", workouts.read_workout_page, args.iterations)
+        last = total // 10
+        timed("  last page", lambda: workouts.read_workout_page(1, last), args.iterations)
+        timed(
+            "  first page by weight",
+            lambda: workouts.read_workout_page(1, 1, 10, "FRONTLINE_WEIGHT"),
+            args.iterations,
+        )
+        database.close_all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+    connections = sub.add_parser("connections", help=bench_connections.__doc__.split("\n")[1].strip())
+    connections.add_argument("--iterations", type=int, default=500)
+    connections.set_defaults(func=bench_connections)
+    eventloop = sub.add_parser("eventloop", help=bench_eventloop.__doc__.split("\n")[1].strip())
+    eventloop.add_argument("--clients", type=int, default=25)
+    eventloop.add_argument("--requests", type=int, default=20)
+    eventloop.set_defaults(func=bench_eventloop)
+    groupcommit = sub.add_parser("groupcommit", help=bench_groupcommit.__doc__.split("\n")[1].strip())
+    groupcommit.add_argument("--clients", type=int, default=25)
+    groupcommit.add_argument("--requests", type=int, default=40)
+    groupcommit.add_argument("--synchronous", choices=["NORMAL", "FULL"], default="FULL")
+    groupcommit.set_defaults(func=bench_groupcommit)
+    daterange = sub.add_parser("daterange", help=bench_daterange.__doc__.split("\n")[1].strip())
+    daterange.add_argument("--sessions", type=int, default=20000)
+    daterange.add_argument("--iterations", type=int, default=10)
+    daterange.set_defaults(func=bench_daterange)
+    roster = sub.add_parser("athletes", help=bench_athletes.__doc__.split("\n")[1].strip())
+    roster.add_argument("--athletes", type=int, default=2000)
+    roster.add_argument("--sessions", type=int, default=365)
+    roster.add_argument("--iterations", type=int, default=50)
+    roster.set_defaults(func=bench_athletes)
+    lastperformed = sub.add_parser(
+        "lastperformed", help=bench_lastperformed.__doc__.split("\n")[1].strip()
+    )
+    lastperformed.add_argument("--rows", type=int, nargs="+", default=[1000, 100000, 1000000])
+    lastperformed.add_argument("--iterations", type=int, default=20)
+    lastperformed.set_defaults(func=bench_lastperformed)
+    cached = sub.add_parser("cache", help=bench_cache.__doc__.split("\n")[1].strip())
+    cached.add_argument("--sessions", type=int, default=2000)
+    cached.add_argument("--iterations", type=int, default=50)
+    cached.set_defaults(func=bench_cache)
+    load = sub.add_parser("tonnage", help=bench_tonnage.__doc__.split("\n")[1].strip())
+    load.add_argument("--athletes", type=int, default=50)
+    load.add_argument("--years", type=int, default=5)
+    load.add_argument("--iterations", type=int, default=5)
+    load.set_defaults(func=bench_tonnage)
+    progress = sub.add_parser("progression", help=bench_progression.__doc__.split("\n")[1].strip())
+    progress.add_argument("--years", type=int, default=5)
+    progress.add_argument("--iterations", type=int, default=20)
+    progress.set_defaults(func=bench_progression)
+    streak = sub.add_parser("streaks", help=bench_streaks.__doc__.split("\n")[1].strip())
+    streak.add_argument("--years", type=int, default=5)
+    streak.add_argument("--iterations", type=int, default=20)
+    streak.set_defaults(func=bench_streaks)
+    chart = sub.add_parser("charts", help=bench_charts.__doc__.split("\n")[1].strip())
+    chart.add_argument("--years", type=int, default=20)
+    chart.add_argument("--iterations", type=int, default=20)
+    chart.set_defaults(func=bench_charts)
+    heatmap = sub.add_parser("calendar", help=bench_calendar.__doc__.split("\n")[1].strip())
+    heatmap.add_argument("--years", type=int, nargs="+", default=[5, 20])
+    heatmap.add_argument("--iterations", type=int, default=20)
+    heatmap.set_defaults(func=bench_calendar)
+    suggest = sub.add_parser("recommendations", help=bench_recommendations.__doc__.split("\n")[1].strip())
+    suggest.add_argument("--years", type=int, nargs="+", default=[1, 20])
+    suggest.add_argument("--iterations", type=int, default=50)
+    suggest.set_defaults(func=bench_recommendations)
+    paged = sub.add_parser("pages", help=bench_pages.__doc__.split("\n")[1].strip())
+    paged.add_argument("--years", type=int, nargs="+", default=[1, 20])
+    paged.add_argument("--iterations", type=int, default=20)
+    paged.set_defaults(func=bench_pages)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as workdir:
+        args.workdir = workdir
+        args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Streaming export of the workout and piano logs.
+
+Rows are read in `fetchmany` batches and written as they arrive, with the same
+column names the data tabs show, so memory use does not grow with the length
+of the log. The running app serves the same files at /export/workouts.csv,
+/export/piano.jsonl, and so on.
+
+    python exporter.py workouts workouts.csv
+    python exporter.py piano practice.parquet
+    python exporter.py workouts ava.csv --athlete AvaWilson
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# appHelpers.helpers changes the working directory on import, so relative
+# paths given on the command line are resolved against this one.
+invocation_dir = os.getcwd()
+module_path = os.path.abspath(os.path.dirname(__file__))
+if module_path not in sys.path:
+    sys.path.append(module_path)
+from appHelpers import database, export
+from appHelpers.helpers import dataBasePath
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("table", choices=sorted(export.tables))
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=sorted(export.media_types))
+    parser.add_argument("--batch-size", type=int, default=export.EXPORT_BATCH_SIZE)
+    parser.add_argument("--athlete", help="only export this athlete's log")
+    parser.add_argument("--database", type=Path, default=Path(dataBasePath))
+    args = parser.parse_args()
+    path = Path(invocation_dir).joinpath(args.path)
+    file_format = args.format or export.file_formats.get(path.suffix.lower(), "csv")
+    database.configure(Path(invocation_dir).joinpath(args.database))
+    start = time.perf_counter()
+    try:
+        athlete_id = None
+        if args.athlete is not None:
+            with database.reader() as conn:
+                row = conn.execute(
+                    "SELECT ID FROM ATHLETES WHERE NAME = ?", (args.athlete,)
+                ).fetchone()
+            if row is None:
+                parser.error(f"unknown athlete {args.athlete!r}")
+            athlete_id = row[0]
+        parts = export.stream(args.table, file_format, args.batch_size, athlete_id)
+        # Pull the first part before creating the file, so a missing pyarrow
+        # does not leave an empty file behind.
+        first = next(parts)
+        with open(path, "wb") as f:
+            f.write(first)
+            for part in parts:
+                f.write(part)
+    finally:
+        database.close_all()
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {path} ({path.stat().st_size:,} bytes) in {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Bulk import of historical workout and piano logs.
+
+Input files are read in chunks and each chunk is written with `executemany`
+in a single transaction. Workout files use the columns of the WORKOUTS table
+(DATE, FRONTLINE_REPS, ..., WALK); piano files use DATE, PIANO, LESSON and
+RECITAL. The human-readable names written by the exports ("Frontline POW
+Raise reps", "Practiced", ...) are accepted too. Column names are matched
+case-insensitively and unknown columns are ignored.
+
+    python importer.py workouts history.csv
+    python importer.py piano practice.jsonl --drop-indexes
+    python importer.py workouts ava.csv --athlete AvaWilson
+
+Rows are logged for the default athlete unless --athlete names another one,
+which is added to the roster if it is not there yet.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# appHelpers.helpers changes the working directory on import, so relative
+# paths given on the command line are resolved against this one.
+invocation_dir = os.getcwd()
+module_path = os.path.abspath(os.path.dirname(__file__))
+if module_path not in sys.path:
+    sys.path.append(module_path)
+from appHelpers import activity, athletes, database, export, migrations, practice, progression, records, streaks, workouts
+from appHelpers.exercises import column_index, column_labels
+from appHelpers.helpers import dataBasePath, iso_date_fmt
+
+CHUNK_SIZE = 50000
+
+
+def _column_key(name) -> str:
+    return str(name).strip().upper().replace(" ", "_")
+
+
+# The table column behind each export label, keyed like the input columns.
+label_columns = {
+    _column_key(label): column
+    for labels in (column_labels, practice.column_labels)
+    for column, label in labels.items()
+}
+
+
+def read_chunks(path: Path, file_format: str, chunk_size: int):
+    """
+    Stream a CSV, JSON Lines or Parquet file as DataFrames of `chunk_size` rows.
+
+    Parameters
+    ----------
+    path : Path
+        The input file.
+    file_format : str
+        "csv", "jsonl" or "parquet".
+    chunk_size : int
+        The number of rows per chunk.
+
+    Yields
+    ------
+    pandas.DataFrame
+        The next chunk, with upper-case column names and export labels
+        replaced by the columns they name.
+
+    Raises
+    ------
+    ImportError
+        If a Parquet file is given and pyarrow is not installed.
+    """
+    if file_format == "csv":
+        chunks = pd.read_csv(path, chunksize=chunk_size)
+    elif file_format == "jsonl":
+        chunks = pd.read_json(path, lines=True, chunksize=chunk_size)
+    else:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Reading Parquet files requires pyarrow") from e
+        chunks = (
+            batch.to_pandas()
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size)
+        )
+    for chunk in chunks:
+        chunk.columns = [
+            label_columns.get(_column_key(column), _column_key(column)) for column in chunk.columns
+        ]
+        yield chunk
+
+
+def _dates(chunk: pd.DataFrame) -> pd.Series:
+    if "DATE" not in chunk.columns:
+        raise ValueError("The input file has no DATE column")
+    return pd.to_datetime(chunk["DATE"]).dt.strftime(iso_date_fmt)
+
+
+def load_workouts(conn, chunk: pd.DataFrame, athlete_id: int) -> int:
+    """
+    Insert one chunk of wide workout rows as sessions and entries.
+
+    Session IDs are assigned up front so the entries of the whole chunk can be
+    built as arrays and written with two `executemany` calls. Rows are written
+    in date order, which keeps session IDs chronological and makes the index
+    inserts mostly appends.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    chunk : pandas.DataFrame
+        Rows with a DATE column and any of the WORKOUTS exercise columns.
+    athlete_id : int
+        The athlete the sessions belong to.
+
+    Returns
+    -------
+    int
+        The number of sessions inserted.
+
+    Raises
+    ------
+    ValueError
+        If the chunk has none of the WORKOUTS exercise columns.
+    """
+    columns = [column for column in chunk.columns if column in column_index]
+    if not columns:
+        raise ValueError("The input file has no workout columns")
+    chunk = chunk.assign(DATE=_dates(chunk)).sort_values("DATE", kind="stable")
+    dates = chunk["DATE"].to_numpy(dtype=object)
+    start = conn.execute(
+        """SELECT MAX(
+            COALESCE((SELECT MAX(ID) FROM WORKOUT_SESSIONS), 0),
+            COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'WORKOUT_SESSIONS'), 0)
+        )"""
+    ).fetchone()[0]
+    session_ids = np.arange(start + 1, start + 1 + len(chunk))
+    conn.executemany(
+        "INSERT INTO WORKOUT_SESSIONS (ID, ATHLETE_ID, DATE) VALUES (?, ?, ?)",
+        zip(session_ids.tolist(), itertools.repeat(athlete_id), dates.tolist()),
+    )
+    values = (
+        chunk[columns]
+        .apply(pd.to_numeric, errors="coerce")
+        .fillna(0)
+        .to_numpy(dtype=np.int64)
+    )
+    rows, cols = np.nonzero(values)
+    exercise_ids = np.array([column_index[column][0] for column in columns])
+    metrics = np.array([column_index[column][1] for column in columns], dtype=object)
+    conn.executemany(
+        workouts.sql_insert_entry,
+        zip(
+            session_ids[rows].tolist(),
+            itertools.repeat(athlete_id),
+            dates[rows].tolist(),
+            exercise_ids[cols].tolist(),
+            metrics[cols].tolist(),
+            values[rows, cols].tolist(),
+        ),
+    )
+    return len(chunk)
+
+
+def load_piano(conn, chunk: pd.DataFrame, athlete_id: int) -> int:
+    """
+    Insert one chunk of practice rows into the PIANO table.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    chunk : pandas.DataFrame
+        Rows with a DATE column and any of PIANO, LESSON and RECITAL.
+    athlete_id : int
+        The athlete the sessions belong to.
+
+    Returns
+    -------
+    int
+        The number of rows inserted.
+
+    Raises
+    ------
+    ValueError
+        If the chunk has none of PIANO, LESSON and RECITAL.
+    """
+    if not {"PIANO", "LESSON", "RECITAL"} & set(chunk.columns):
+        raise ValueError("The input file has no PIANO, LESSON or RECITAL column")
+    piano = (
+        pd.to_numeric(chunk["PIANO"], errors="coerce").fillna(0).astype(np.int64)
+        if "PIANO" in chunk.columns
+        else pd.Series(0, index=chunk.index)
+    )
+    lesson = chunk["LESSON"].fillna("").astype(str) if "LESSON" in chunk.columns else ""
+    recital = chunk["RECITAL"].fillna("").astype(str) if "RECITAL" in chunk.columns else ""
+    frame = pd.DataFrame(
+        {
+            "ATHLETE_ID": athlete_id,
+            "DATE": _dates(chunk),
+            "PIANO": piano,
+            "LESSON": lesson,
+            "RECITAL": recital,
+        }
+    )
+    conn.executemany(
+        "INSERT INTO PIANO (ATHLETE_ID, DATE, PIANO, LESSON, RECITAL) VALUES (?, ?, ?, ?, ?)",
+        frame.itertuples(index=False, name=None),
+    )
+    return len(frame)
+
+
+def rebuild_workout_summaries(conn, athlete_id: int) -> None:
+    """
+    Rebuild the workout summaries, records, streaks and calendar of one athlete after a load.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    athlete_id : int
+        The athlete whose rows were loaded.
+
+    Returns
+    -------
+    None
+    """
+    workouts.rebuild_exercise_state(conn, athlete_id)
+    progression.rebuild_progression_state(conn, athlete_id)
+    records.rebuild_records(conn, athlete_id)
+    streaks.rebuild_streaks(conn, athlete_id)
+    activity.rebuild_activity_years(conn, athlete_id)
+
+
+def rebuild_piano_summaries(conn, athlete_id: int) -> None:
+    """
+    Rebuild PRACTICE_STATE, the streaks and the calendar of one athlete after a load.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The writer connection; the caller owns the transaction.
+    athlete_id : int
+        The athlete whose rows were loaded.
+
+    Returns
+    -------
+    None
+    """
+    practice.rebuild_practice_state(conn, athlete_id)
+    streaks.rebuild_streaks(conn, athlete_id)
+    activity.rebuild_activity_years(conn, athlete_id)
+
+
+# (tables loaded, row loader, rebuild of the summaries the loader bypasses)
+targets = {
+    "workouts": (
+        ["WORKOUT_SESSIONS", "WORKOUT_ENTRIES"],
+        load_workouts,
+        rebuild_workout_summaries,
+    ),
+    "piano": (["PIANO"], load_piano, rebuild_piano_summaries),
+}
+
+
+def _schema_objects(conn, object_type: str, tables: list) -> list:
+    return conn.execute(
+        f"""SELECT name, sql FROM sqlite_master
+        WHERE type = ? AND sql IS NOT NULL
+        AND tbl_name IN ({", ".join("?" * len(tables))})""",
+        (object_type, *tables),
+    ).fetchall()
+
+
+def import_file(
+    target: str,
+    path: Path,
+    file_format: str = None,
+    chunk_size: int = CHUNK_SIZE,
+    drop_indexes: bool = False,
+    athlete: str = None,
+) -> int:
+    """
+    Load a historical log file into the database.
+
+    The summary-table triggers are dropped and recreated inside the
+    transaction of each chunk, and the athlete's summaries are rebuilt once
+    at the end instead of being updated row by row. A load that is killed
+    part way therefore never leaves the triggers missing, and saves made by
+    the running app between chunks still update their summaries. With
+    `drop_indexes` the secondary indexes of the target tables are dropped
+    for the whole load and rebuilt after the last chunk, also when the load
+    fails; chunks that were already committed stay loaded.
+
+    Parameters
+    ----------
+    target : str
+        "workouts" or "piano".
+    path : Path
+        The input file.
+    file_format : str, optional
+        "csv", "jsonl" or "parquet"; taken from the file suffix when omitted.
+    chunk_size : int, optional
+        The number of rows read and committed per transaction.
+    drop_indexes : bool, optional
+        Whether to drop and rebuild the secondary indexes around the load.
+    athlete : str, optional
+        The name of the athlete the rows belong to; the default athlete when
+        omitted. Only this athlete's summaries are rebuilt.
+
+    Returns
+    -------
+    int
+        The number of rows loaded.
+
+    Examples
+    --------
+    >>> import_file("piano", Path("practice.csv"))
+    """
+    tables, load, rebuild = targets[target]
+    file_format = file_format or export.file_formats.get(path.suffix.lower(), "csv")
+    with database.writer() as conn:
+        if athlete is None:
+            athlete_id = athletes.DEFAULT_ATHLETE_ID
+        else:
+            athlete_id = athletes.add_athlete(conn, athlete)
+        triggers = _schema_objects(conn, "trigger", tables)
+        indexes = _schema_objects(conn, "index", tables) if drop_indexes else []
+        for name, _ in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+    total = 0
+    start = time.perf_counter()
+    try:
+        for chunk in read_chunks(path, file_format, chunk_size):
+            with database.writer() as conn:
+                conn.execute("BEGIN")
+                for name, _ in triggers:
+                    conn.execute(f'DROP TRIGGER "{name}"')
+                total += load(conn, chunk, athlete_id)
+                for _, sql in triggers:
+                    conn.execute(sql)
+            elapsed = time.perf_counter() - start
+            print(f"{total:>12,} rows  {total / elapsed:>12,.0f} rows/s")
+    finally:
+        with database.writer() as conn:
+            for _, sql in indexes:
+                conn.execute(sql)
+            rebuild(conn, athlete_id)
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {total:,} {target} rows in {elapsed:.1f} s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("target", choices=sorted(targets))
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["csv", "jsonl", "parquet"])
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--drop-indexes", action="store_true")
+    parser.add_argument("--athlete", help="the athlete the rows belong to")
+    parser.add_argument("--database", type=Path, default=Path(dataBasePath))
+    args = parser.parse_args()
+    path = Path(invocation_dir).joinpath(args.path)
+    database.configure(Path(invocation_dir).joinpath(args.database))
+    migrations.migrate()
+    try:
+        import_file(
+            args.target, path, args.format, args.chunk_size, args.drop_indexes, args.athlete
+        )
+    finally:
+        database.close_all()
+
+
+if __name__ == "__main__":
+    main()
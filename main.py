@@ -27,13 +27,15 @@ import sys
 import traceback
 from pathlib import Path
 
-from nicegui import ui
+from nicegui import app, ui
 from screeninfo import get_monitors
 
 module_path = os.path.abspath(os.getcwd())
 if module_path not in sys.path:
     sys.path.append(module_path)
 from appTheming import theme
+from appHelpers import activity, analytics, athletes, cache, charts, database, export, practice, progression, recommendations, records, streaks, workouts
+from appHelpers.exercises import region_titles
 from appHelpers.helpers import (
     dataBasePath,
     set_start_dir,
@@ -45,6 +47,29 @@ from appHelpers.sqlgenerate import create_connection, implement_tables
 set_start_dir()
 create_connection(dataBasePath)
 implement_tables()
+app.on_shutdown(database.close_all)
+# The dashboard and data tabs of the default athlete, as the pages request them
+cache.warm(
+    [(athletes.list_athletes, ())]
+    + [
+        (workouts.days_since_last, (region, athletes.DEFAULT_ATHLETE_ID))
+        for region in region_titles
+    ]
+    + [
+        (practice.days_since_practice, (athletes.DEFAULT_ATHLETE_ID,)),
+        (workouts.current_levels, (athletes.DEFAULT_ATHLETE_ID,)),
+        (recommendations.recent_window, (athletes.DEFAULT_ATHLETE_ID,)),
+        (workouts.read_workout_page, (athletes.DEFAULT_ATHLETE_ID, *database.FIRST_PAGE)),
+        (analytics.training_load, (athletes.DEFAULT_ATHLETE_ID,)),
+        (progression.read_progression, (athletes.DEFAULT_ATHLETE_ID,)),
+        (records.read_records, (athletes.DEFAULT_ATHLETE_ID,)),
+        (practice.read_practice_page, (athletes.DEFAULT_ATHLETE_ID, *database.FIRST_PAGE)),
+        (streaks.read_streaks, (athletes.DEFAULT_ATHLETE_ID,)),
+        (charts.exercise_series, (charts.DEFAULT_EXERCISE, athletes.DEFAULT_ATHLETE_ID)),
+        (charts.practice_series, (athletes.DEFAULT_ATHLETE_ID,)),
+        (activity.read_calendar, (activity.DEFAULT_TRACKER, athletes.DEFAULT_ATHLETE_ID)),
+    ]
+)
 
 from appPages import piano
 from appPages import fitness
@@ -94,7 +119,7 @@ def warningmessage(exception_type, exception_value, exception_traceback) -> None
 
 
 @ui.page("/")
-def index_page() -> None:
+async def index_page(athlete: int = athletes.DEFAULT_ATHLETE_ID) -> None:
     """
     Opens the homepage for the app.
 
@@ -103,20 +128,26 @@ def index_page() -> None:
     CVI (Cortical Visual Impairment), iOS, screen reader, instructional materials,
     digital literacy, and keyboarding.
 
+    Parameters
+    ----------
+    athlete : int, optional
+        The athlete shown, taken from the ?athlete= query parameter.
+
     Returns
     -------
     None
 
     Examples
     --------
-    >>> index_page()
+    >>> await index_page()
     """
-    with theme.frame("QUICK VIEW"):
-        homepage.content()
+    with theme.frame("QUICK VIEW", athlete):
+        await homepage.content(athlete)
 
 
 fitness.create()
 piano.create()
+export.create()
 
 MONITOR = ""
 
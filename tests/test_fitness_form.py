@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+from appHelpers import workouts
+from appHelpers.exercises import column_index
+
+
+def test_empty_weight_saves_the_level_shown(db):
+    with db.writer() as conn:
+        workouts.insert_workout(conn, "2023-01-02", {"FRONTLINE_REPS": 12, "FRONTLINE_SETS": 3, "FRONTLINE_WEIGHT": 15})
+    defaults = workouts.form_defaults(workouts.current_levels())
+    # The WEIGHT input is left empty and shows str(defaults[column]) as its placeholder
+    shown = int(str(defaults["FRONTLINE_WEIGHT"]))
+    form = {column: None for column in column_index}
+    form.update({"FRONTLINE_REPS": 10, "FRONTLINE_SETS": 3})
+    with db.writer() as conn:
+        session_id = workouts.insert_workout(conn, "2023-01-04", workouts.session_values(form, defaults))
+        saved = conn.execute(
+            "SELECT VALUE FROM WORKOUT_ENTRIES WHERE SESSION_ID = ? AND EXERCISE_ID = ? AND METRIC = 'WEIGHT'",
+            (session_id, column_index["FRONTLINE_WEIGHT"][0]),
+        ).fetchone()
+    assert shown == 15
+    assert saved == (shown,)
+
+
+def test_empty_inputs_save_zero():
+    defaults = workouts.form_defaults({})
+    values = workouts.session_values({"FRONTLINE_REPS": 11.2}, defaults)
+    assert values["FRONTLINE_REPS"] == 12
+    assert not any(value for column, value in values.items() if column != "FRONTLINE_REPS")
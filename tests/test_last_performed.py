@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import pandas as pd
+import pytest
+
+from appHelpers import workouts
+from benchmark import _reshape_and_rename, _seeded_log, _store_log
+
+
+@pytest.mark.parametrize("rows", [1, 30, 1000])
+def test_cards_match_melt_and_merge(db, rows):
+    now = pd.Timestamp.now()
+    log = _seeded_log(rows, now)
+    _store_log(log)
+    key = ["Days_Since_Last", "Exercises"]
+    legacy = _reshape_and_rename(log, now).sort_values(key).reset_index(drop=True)
+    card = workouts.days_since_last().sort_values(key).reset_index(drop=True)
+    pd.testing.assert_frame_equal(card, legacy, check_dtype=False)
+
+
+def test_back_dated_save_keeps_the_latest_date(db):
+    now = pd.Timestamp.now()
+    log = _seeded_log(30, now)
+    _store_log(log)
+    with db.writer() as conn:
+        workouts.insert_workout(conn, (now - pd.Timedelta(days=400)).strftime("%Y-%m-%d"), {"WALK": 1})
+    key = ["Days_Since_Last", "Exercises"]
+    legacy = _reshape_and_rename(log, now).sort_values(key).reset_index(drop=True)
+    card = workouts.days_since_last().sort_values(key).reset_index(drop=True)
+    pd.testing.assert_frame_equal(card, legacy, check_dtype=False)
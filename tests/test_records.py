@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+ Copyright 2023  Michael Ryan Hunsaker, M.Ed., Ph.D.
+
+ Licensed under the Apache License, Version 2.0 (the "License");
+ you may not use this file except in compliance with the License.
+ You may obtain a copy of the License at
+
+      https://www.apache.org/licenses/LICENSE-2.0
+
+ Unless required by applicable law or agreed to in writing, software
+ distributed under the License is distributed on an "AS IS" BASIS,
+ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ See the License for the specific language governing permissions and
+ limitations under the License.
+"""
+
+# coding=utf-8
+"""
+Program designed to be a data collection and instructional tool for
+teachers of students with Visual Impairments
+"""
+
+import random
+
+import pandas as pd
+
+from appHelpers import records, workouts
+
+
+def read_records(conn) -> pd.DataFrame:
+    return pd.read_sql(
+        f"SELECT {', '.join(records.record_columns)} FROM PERSONAL_RECORDS", conn
+    ).sort_values(records.record_columns).reset_index(drop=True)
+
+
+def test_out_of_order_saves_match_a_rebuild(db):
+    rng = random.Random(0)
+    days = [f"2023-{month:02d}-{day:02d}" for month in range(1, 4) for day in range(1, 29)]
+    rng.shuffle(days)
+    with db.writer() as conn:
+        for day in days:
+            workouts.insert_workout(
+                conn,
+                day,
+                {
+                    "FRONTLINE_REPS": rng.randint(5, 15),
+                    "FRONTLINE_SETS": 3,
+                    "FRONTLINE_WEIGHT": rng.choice([10, 15, 20]),
+                    "WALK_DISTANCE": rng.randint(1, 6),
+                    "WALK": 1,
+                },
+            )
+        saved = read_records(conn)
+        records.rebuild_records(conn)
+        rebuilt = read_records(conn)
+    assert len(saved) > 0
+    pd.testing.assert_frame_equal(saved, rebuilt)
+
+
+def test_back_dated_best_replaces_later_records(db):
+    with db.writer() as conn:
+        workouts.insert_workout(conn, "2023-01-10", {"WALK_DISTANCE": 3, "WALK": 1})
+        workouts.insert_workout(conn, "2023-01-20", {"WALK_DISTANCE": 4, "WALK": 1})
+        workouts.insert_workout(conn, "2023-01-05", {"WALK_DISTANCE": 5, "WALK": 1})
+        walks = pd.read_sql("SELECT VALUE, PREVIOUS, DATE FROM PERSONAL_RECORDS ORDER BY DATE", conn)
+    assert walks.to_dict("list") == {"VALUE": [5], "PREVIOUS": [None], "DATE": ["2023-01-05"]}